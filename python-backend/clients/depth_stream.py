@@ -0,0 +1,166 @@
+"""
+In-memory order books fed by Binance partial-depth WebSocket streams.
+
+Each subscribed symbol gets a background task reading the ``<symbol>@depth20@100ms``
+stream; every message replaces that symbol's top-20 bids/asks. Readers take the
+latest snapshot synchronously and fall back to REST when it is missing or stale.
+The tasks are bound to the event loop that started them and are restarted if a
+different loop subscribes (e.g. the web API runs each request under its own
+``asyncio.run``).
+
+Streams are bounded: a stream whose snapshot has not been read for
+``idle_timeout_s`` stops by itself, and subscribing beyond ``max_symbols``
+stops the least recently read stream first.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from binance import BinanceSocketManager
+
+logger = logging.getLogger(__name__)
+
+# A snapshot older than this is treated as stale (the stream pushes every 100 ms)
+DEPTH_SNAPSHOT_MAX_AGE_S = 2.0
+# A stream nobody has read for this long is stopped
+DEPTH_STREAM_IDLE_TIMEOUT_S = 300.0
+# Upper bound on concurrently streamed symbols
+DEPTH_STREAM_MAX_SYMBOLS = 20
+_RECONNECT_BASE_DELAY_S = 1.0
+_RECONNECT_MAX_DELAY_S = 30.0
+
+
+class DepthStreamer:
+    """Keeps the latest top-20 order book of each subscribed symbol in memory."""
+
+    def __init__(self, client, max_age_s: float = DEPTH_SNAPSHOT_MAX_AGE_S,
+                 idle_timeout_s: float = DEPTH_STREAM_IDLE_TIMEOUT_S,
+                 max_symbols: int = DEPTH_STREAM_MAX_SYMBOLS):
+        """
+        Args:
+            client: python-binance AsyncClient used to open the streams
+            max_age_s: Age in seconds after which a snapshot is no longer served
+            idle_timeout_s: Seconds without a subscribe/snapshot call after which a stream stops
+            max_symbols: Maximum number of symbols streamed at the same time
+        """
+        self._socket_manager = BinanceSocketManager(client)
+        self._max_age_s = max_age_s
+        self._idle_timeout_s = idle_timeout_s
+        self._max_symbols = max(1, max_symbols)
+        # symbol -> (bids (N, 2), asks (N, 2), monotonic receive time)
+        self._books: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # symbol -> monotonic time of the last subscribe/snapshot call
+        self._last_used: Dict[str, float] = {}
+
+    def subscribe(self, symbol: str) -> None:
+        """
+        Starts streaming a symbol on the running event loop, if it is not streamed yet.
+
+        Must be called from within a running event loop.
+
+        Args:
+            symbol: Symbol to stream (e.g., 'BTCUSDT')
+        """
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(symbol)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self._last_used[symbol] = time.monotonic()
+            return
+        if task is not None:
+            self._stop(symbol)
+
+        # Make room by stopping the least recently read streams
+        while len(self._tasks) >= self._max_symbols:
+            self._stop(min(self._tasks, key=lambda s: self._last_used.get(s, 0.0)))
+
+        self._last_used[symbol] = time.monotonic()
+        self._tasks[symbol] = loop.create_task(self._run(symbol), name=f"depth-stream-{symbol}")
+
+    def snapshot(self, symbol: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns the latest (bids, asks) arrays of a symbol, or None if missing or stale.
+
+        Args:
+            symbol: Symbol to read
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: [price, quantity] rows per side, best level first
+        """
+        if symbol in self._tasks:
+            self._last_used[symbol] = time.monotonic()
+        book = self._books.get(symbol)
+        if book is None or time.monotonic() - book[2] > self._max_age_s:
+            return None
+        return book[0], book[1]
+
+    async def close(self) -> None:
+        """Stops all streams of the running event loop and drops their snapshots."""
+        loop = asyncio.get_running_loop()
+        symbols = [symbol for symbol, task in self._tasks.items() if task.get_loop() is loop]
+        tasks = [self._tasks[symbol] for symbol in symbols]
+        for symbol in symbols:
+            self._stop(symbol)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _stop(self, symbol: str) -> None:
+        """Cancels a symbol's stream on whichever loop runs it and forgets its state."""
+        task = self._tasks.pop(symbol, None)
+        self._books.pop(symbol, None)
+        self._last_used.pop(symbol, None)
+        if task is None or task.done():
+            return
+        task_loop = task.get_loop()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if task_loop is running_loop:
+            task.cancel()
+        elif not task_loop.is_closed():
+            # Tasks of another loop must be cancelled from that loop's thread
+            task_loop.call_soon_threadsafe(task.cancel)
+
+    def _is_idle(self, symbol: str) -> bool:
+        """True if the symbol's snapshot has not been requested within the idle timeout."""
+        return time.monotonic() - self._last_used.get(symbol, 0.0) > self._idle_timeout_s
+
+    async def _run(self, symbol: str) -> None:
+        """Reads the depth stream of a symbol, reconnecting with backoff until idle or cancelled."""
+        delay = _RECONNECT_BASE_DELAY_S
+        try:
+            while not self._is_idle(symbol):
+                try:
+                    socket = self._socket_manager.depth_socket(
+                        symbol, depth=BinanceSocketManager.WEBSOCKET_DEPTH_20, interval=100
+                    )
+                    async with socket as stream:
+                        logger.info(f"{symbol} derinlik akışı başlatıldı.")
+                        while True:
+                            if self._is_idle(symbol):
+                                logger.info(f"{symbol} derinlik akışı kullanılmadığı için durduruldu.")
+                                return
+                            message = await stream.recv()
+                            if not message or message.get('e') == 'error':
+                                raise ConnectionError(message.get('m') if message else "boş mesaj")
+                            self._books[symbol] = (
+                                np.asarray(message['bids'], dtype=np.float64).reshape(-1, 2),
+                                np.asarray(message['asks'], dtype=np.float64).reshape(-1, 2),
+                                time.monotonic()
+                            )
+                            delay = _RECONNECT_BASE_DELAY_S
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._books.pop(symbol, None)
+                    logger.warning(f"{symbol} derinlik akışı kesildi, {delay:.0f}s sonra yeniden bağlanılacak: {e}")
+                    await asyncio.sleep(delay)
+                    delay = min(_RECONNECT_MAX_DELAY_S, delay * 2)
+        finally:
+            # Drop the entry unless a newer task already replaced this one
+            if self._tasks.get(symbol) is asyncio.current_task():
+                self._tasks.pop(symbol, None)
+                self._books.pop(symbol, None)
+                self._last_used.pop(symbol, None)
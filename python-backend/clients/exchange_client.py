@@ -1,22 +1,52 @@
 import asyncio
+import json
+import os
+import time
 from binance.async_client import AsyncClient
 from binance.exceptions import BinanceAPIException, BinanceRequestException
 import config
 from config import logger
 from core_logic.constants import KLINE_HISTORY_PERIOD, KLINE_INTERVAL
+from core_logic.retry import with_retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Sembol doğrulamada alternatif çift olarak denenecek karşı para birimleri (öncelik sırasıyla)
+_QUOTE_CURRENCIES = ("USDT", "BTC", "ETH", "BUSD", "USD", "USDC")
+# Karşı para ekini ayıklama sırası (en uzun önce; "USDT" "USD"den önce eşleşmeli)
+_STRIP_ORDER = ("USDT", "BUSD", "USDC", "BTC", "ETH", "USD")
+
+# Sembol listesinin disk önbelleği (yeniden başlatmalarda get_exchange_info çağrısını önler)
+SYMBOL_CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "binance_symbols.json")
+SYMBOL_CACHE_DISK_TTL = 86400  # 24 saat
+
+# Kısa aralıklar daha sık yeni mum ürettiği için daha kısa süre önbellekte tutulur
+_KLINE_CACHE_TTL_BY_INTERVAL = {"1m": 15, "3m": 30, "5m": 30}
+_KLINE_CACHE_MAX_ENTRIES = 256
 
 class BinanceClient:
-    def __init__(self):
-        if not config.EXCHANGE_API_KEY or not config.EXCHANGE_API_SECRET:
-            logger.error("BinanceClient başlatılamadı: Borsa API anahtarı veya gizli anahtar eksik.")
-            raise ValueError("Binance API anahtarı ve gizli anahtar config.py üzerinden ayarlanmalı (.env dosyasını kontrol edin).")
+    def __init__(self, refresh_symbols=False):
+        # Anahtarlar uygulama başlangıcında config.require(...) ile doğrulanır
+        assert config.EXCHANGE_API_KEY and config.EXCHANGE_API_SECRET, "Binance API anahtarı ve gizli anahtar config.py üzerinden ayarlanmalı (.env dosyasını kontrol edin)."
         self.client = AsyncClient(config.EXCHANGE_API_KEY, config.EXCHANGE_API_SECRET)
         logger.info("Binance AsyncClient başarıyla başlatıldı (python-binance).")
         self.default_kline_interval = config.DEFAULT_KLINE_INTERVAL
         self.default_kline_limit = config.DEFAULT_KLINE_LIMIT
         self.default_kline_history_period = KLINE_HISTORY_PERIOD
-        self._all_symbols_cache = None
+        self._all_symbols_cache = None  # set; işlem gören tüm semboller
         self._last_cache_time = 0
+        self._symbol_cache_ttl = 1800  # 30 dakika
+        # (sembol, aralık, limit) -> (alınma zamanı, klines); eşzamanlı aynı istekler tek çağrıda birleştirilir
+        self._kline_cache = {}
+        self._kline_inflight = {}
+        # Eşzamanlı tüm analizlerin paylaştığı istek sınırı (Binance ağırlık bütçesi, -1003 hatalarını önler)
+        self._http_semaphore = None
+        self._http_semaphore_loop = None
+        if not refresh_symbols:
+            self._load_symbol_cache_from_disk()
 
     async def get_server_time(self):
         try:
@@ -36,7 +66,7 @@ class BinanceClient:
     async def get_all_tickers(self):
         """Tüm semboller için 24 saatlik ticker verilerini alır."""
         try:
-            tickers = await self.client.get_ticker()
+            tickers = await with_retry(lambda: self.client.get_ticker())
             logger.info(f"Toplam {len(tickers)} adet 24hr ticker bilgisi (AsyncClient.get_ticker) alındı.")
             if tickers and len(tickers) > 0:
                 logger.debug("DEBUG (AsyncClient.get_ticker): İlk 3 ticker:")
@@ -44,9 +74,8 @@ class BinanceClient:
                     logger.debug(f"  {i+1}. {ticker_item}")
                 
                 # Update symbols cache while we have the data
-                self._all_symbols_cache = [ticker['symbol'] for ticker in tickers]
-                import time
-                self._last_cache_time = time.time()
+                self._all_symbols_cache = {ticker['symbol'] for ticker in tickers}
+                self._last_cache_time = time.monotonic()
             return tickers
         except BinanceAPIException as e_api:
             logger.error(f"Binance API Exception (get_all_tickers): {e_api}")
@@ -59,8 +88,54 @@ class BinanceClient:
             return None
 
     async def get_klines(self, symbol, interval, limit=500):
+        key = (symbol, interval, limit)
+        cached = self._kline_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _KLINE_CACHE_TTL_BY_INTERVAL.get(interval, config.KLINE_CACHE_TTL):
+            logger.debug(f"{symbol} için {interval} K-line verisi önbellekten döndürüldü.")
+            return cached[1]
+
+        # Aynı istek zaten yoldaysa onun sonucunu bekle
+        inflight = self._kline_inflight.get(key)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._kline_inflight[key] = future
+        klines = None
+        try:
+            klines = await self._fetch_klines(symbol, interval, limit)
+            if klines:
+                self._store_klines(key, klines)
+            return klines
+        finally:
+            self._kline_inflight.pop(key, None)
+            if not future.done():
+                future.set_result(klines)
+
+    def _store_klines(self, key, klines):
+        if len(self._kline_cache) >= _KLINE_CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            max_ttl = max(config.KLINE_CACHE_TTL, *_KLINE_CACHE_TTL_BY_INTERVAL.values())
+            self._kline_cache = {k: v for k, v in self._kline_cache.items() if now - v[0] < max_ttl}
+        self._kline_cache[key] = (time.monotonic(), klines)
+
+    def latest_cached_close_time(self, symbol):
+        """
+        Önbellekteki K-line verilerinden sembolün en son mum kapanış zamanını döndürür.
+
+        Args:
+            symbol: Sembol (örn. 'BTCUSDT')
+
+        Returns:
+            int: Milisaniye cinsinden kapanış zamanı, önbellekte veri yoksa None
+        """
+        close_times = [klines[-1][6] for (sym, _, _), (_, klines) in self._kline_cache.items()
+                       if sym == symbol and klines]
+        return max(close_times) if close_times else None
+
+    async def _fetch_klines(self, symbol, interval, limit):
         try:
-            klines = await self.client.get_klines(symbol=symbol, interval=interval, limit=limit)
+            klines = await with_retry(lambda: self.client.get_klines(symbol=symbol, interval=interval, limit=limit))
             logger.info(f"{symbol} için {limit} adet {interval} K-line verisi (AsyncClient.get_klines) alındı.")
             return klines
         except BinanceAPIException as e_api:
@@ -73,6 +148,81 @@ class BinanceClient:
             logger.error(f"{symbol} için K-line verileri alınırken genel hata ({interval}, {limit}): {e_main}")
             return None
 
+    async def get_klines_batch(self, requests):
+        """
+        Birden fazla K-line isteğini eşzamanlı olarak yürütür.
+
+        Args:
+            requests: (symbol, interval, limit) demetlerinden oluşan liste
+
+        Returns:
+            list: İsteklerle aynı sırada sonuçlar (K-line listesi, None veya yakalanan istisna)
+        """
+        sem = self._get_http_semaphore()
+
+        async def one(symbol, interval, limit):
+            async with sem:
+                return await self.get_klines(symbol, interval, limit)
+
+        return await asyncio.gather(*[one(*r) for r in requests], return_exceptions=True)
+
+    def _get_http_semaphore(self):
+        """İstemci genelindeki istek semaforunu döndürür; olay döngüsü değişmişse yeniden oluşturur."""
+        loop = asyncio.get_running_loop()
+        if self._http_semaphore is None or self._http_semaphore_loop is not loop:
+            self._http_semaphore = asyncio.Semaphore(config.BINANCE_HTTP_CONCURRENCY or 10)
+            self._http_semaphore_loop = loop
+        return self._http_semaphore
+
+    async def _ensure_symbol_cache(self):
+        """Sembol önbelleği boşsa veya süresi dolmuşsa exchange info üzerinden yeniler."""
+        current_time = time.monotonic()
+        if self._all_symbols_cache and (current_time - self._last_cache_time) <= self._symbol_cache_ttl:
+            return
+        exchange_info = await with_retry(lambda: self.client.get_exchange_info())
+        if exchange_info and 'symbols' in exchange_info:
+            self._all_symbols_cache = {symbol_info['symbol'] for symbol_info in exchange_info['symbols']}
+            self._last_cache_time = current_time
+            logger.info(f"Sembol önbelleği güncellendi: {len(self._all_symbols_cache)} sembol.")
+            self._save_symbol_cache_to_disk()
+
+    def _load_symbol_cache_from_disk(self):
+        """Diskteki sembol önbelleğini, süresi dolmamışsa belleğe yükler."""
+        try:
+            with open(SYMBOL_CACHE_FILE, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+            if time.time() - data.get('fetched_at', 0) < SYMBOL_CACHE_DISK_TTL and data.get('symbols'):
+                self._all_symbols_cache = set(data['symbols'])
+                self._last_cache_time = time.monotonic()
+                logger.info(f"Sembol önbelleği diskten yüklendi: {len(self._all_symbols_cache)} sembol.")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Sembol önbelleği diskten okunamadı: {e}")
+
+    def _save_symbol_cache_to_disk(self):
+        """Sembol önbelleğini geçici dosya + os.replace ile atomik olarak diske yazar."""
+        try:
+            payload = {"symbols": sorted(self._all_symbols_cache), "fetched_at": time.time()}
+            os.makedirs(os.path.dirname(SYMBOL_CACHE_FILE), exist_ok=True)
+            tmp_path = f"{SYMBOL_CACHE_FILE}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(payload) if orjson else json.dumps(payload).encode('utf-8'))
+            os.replace(tmp_path, SYMBOL_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"Sembol önbelleği diske yazılamadı: {e}")
+
+    async def get_symbol_set(self):
+        """
+        Binance'de listelenen sembollerin önbellekteki kümesini döndürür (gerekirse exchange info ile yeniler).
+
+        Returns:
+            set: Sembol kümesi; exchange info alınamadıysa boş küme
+        """
+        await self._ensure_symbol_cache()
+        return self._all_symbols_cache or set()
+
     async def validate_symbol(self, symbol):
         """
         Verilen sembolün Binance'de mevcut olup olmadığını doğrular.
@@ -85,44 +235,28 @@ class BinanceClient:
             str: Geçerli sembol varsa (alternatif form olabilir) sembol, yoksa None
         """
         try:
+            await self._ensure_symbol_cache()
+            all_symbols = self._all_symbols_cache
+            if not all_symbols:
+                return False, None
+
             # Önce direk kontrol et
-            ticker = await self.client.get_ticker(symbol=symbol)
-            if ticker:
+            if symbol in all_symbols:
                 return True, symbol
             
-            # Direk ticker alınamadıysa, alternatif formları dene
+            # Direk eşleşme yoksa, alternatif formları dene
             # Örneğin BTC -> BTCUSDT, BTCBTC, BTCETH vb.
-            base_symbol = symbol.replace("USDT", "").replace("BTC", "").replace("ETH", "").replace("BUSD", "")
+            # Sembol yalnızca karşı paradan ibaretse (örn. "BTC") kendisi baz kabul edilir
+            base_symbol = next((symbol[:-len(q)] for q in _STRIP_ORDER
+                                if symbol.endswith(q) and len(symbol) > len(q) + 1), symbol)
             
             # Eğer baş sembolü çok kısaysa veya boşsa doğrulamaya gerek yok
             if len(base_symbol) < 2:
                 return False, None
-                
-            # Cache'den tüm sembolleri al (performans için)
-            all_symbols = self._all_symbols_cache
-            
-            # Cache boşsa veya 30 dakikadan eskiyse güncelle
-            if not all_symbols:
-                import time
-                current_time = time.time()
-                
-                if not self._last_cache_time or (current_time - self._last_cache_time) > 1800:  # 30 dakika
-                    exchange_info = await self.client.get_exchange_info()
-                    if exchange_info and 'symbols' in exchange_info:
-                        all_symbols = [symbol_info['symbol'] for symbol_info in exchange_info['symbols']]
-                        self._all_symbols_cache = all_symbols
-                        self._last_cache_time = current_time
-            
-            # Sembolleri kontrol et
-            if all_symbols:
-                # Alternatif para birimleri listesi
-                quote_currencies = ["USDT", "BTC", "ETH", "BUSD", "USD", "USDC"]
-                
-                # Başka semboller veya alternatif formlar var mı kontrol et
-                for quote in quote_currencies:
-                    alt_symbol = f"{base_symbol}{quote}"
-                    if alt_symbol in all_symbols:
-                        return True, alt_symbol
+
+            alt_symbol = next((c for c in (base_symbol + q for q in _QUOTE_CURRENCIES) if c in all_symbols), None)
+            if alt_symbol:
+                return True, alt_symbol
             
             # Hiçbir alternatif form bulunamadı
             return False, None
@@ -146,8 +280,9 @@ class BinanceClient:
 
 async def main_test():
     try:
+        config.require("EXCHANGE_API_KEY", "EXCHANGE_API_SECRET")
         binance_client = BinanceClient()
-    except ValueError as e:
+    except RuntimeError as e:
         logger.error(f"Test istemcisi oluşturulurken hata: {e}")
         return
 
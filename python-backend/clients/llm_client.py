@@ -1,6 +1,7 @@
 import google.generativeai as genai
 # Adjust import path for config
 import config 
+import asyncio
 import logging
 
 # Logger oluştur
@@ -8,40 +9,37 @@ logger = logging.getLogger(__name__)
 
 class GeminiClient:
     def __init__(self, model_name=config.LLM_MODEL):
-        if not config.LLM_API_KEY:
-            logger.error("GeminiClient başlatılamadı: LLM API anahtarı eksik.")
-            raise ValueError("Gemini API anahtarı (LLM_API_KEY) config.py üzerinden ayarlanmalı (.env dosyasını kontrol edin).")
+        # Anahtar uygulama başlangıcında config.require(...) ile doğrulanır
+        assert config.LLM_API_KEY, "Gemini API anahtarı (LLM_API_KEY) config.py üzerinden ayarlanmalı (.env dosyasını kontrol edin)."
         genai.configure(api_key=config.LLM_API_KEY)
         self.model = genai.GenerativeModel(model_name)
+        # Eşzamanlı LLM isteklerini sınırla (kota patlamalarını önler); 0 veya negatif değer kilitlenmeye yol açmasın
+        self._semaphore = asyncio.Semaphore(max(1, config.LLM_CONCURRENCY))
         logger.info(f"Gemini istemcisi '{model_name}' modeli ile başarıyla başlatıldı.")
 
+    async def agenerate_text(self, prompt):
+        """generate_text'in event loop'u bloklamayan sürümü; çağrı bir iş parçacığında yürütülür."""
+        async with self._semaphore:
+            return await asyncio.to_thread(self.generate_text, prompt)
+
     def generate_text(self, prompt):
         try:
             response = self.model.generate_content(prompt)
-            # Yanıtın yapısı Gemini API versiyonuna göre değişebilir.
-            # Genellikle response.text veya response.parts[0].text gibi erişilir.
-            if hasattr(response, 'text') and response.text:
-                return response.text
-            elif hasattr(response, 'parts') and response.parts and hasattr(response.parts[0], 'text'):
-                return response.parts[0].text
-            else:
-                logger.warning(f"LLM yanıt formatı beklenenden farklı. Yanıt objesi: {response}")
-                # Güvenli bir şekilde metin içeriğini bulmaya çalışalım
-                try:
-                    if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
-                        full_text = "".join(part.text for part in response.candidates[0].content.parts if hasattr(part, 'text'))
-                        if full_text:
-                            logger.info("LLM yanıtı parçalardan başarıyla birleştirildi.")
-                            return full_text
-                except Exception as ex_parse:
-                    logger.error(f"LLM yanıtını ayrıştırırken ek hata: {ex_parse}")
-                
-                logger.error("LLM'den metin içeriği alınamadı. Yanıt yapısı uygun değil.")
+            # Metni doğrudan aday parçalarından oku; response.text özelliği
+            # bazı SDK sürümlerinde (ör. engellenmiş yanıtlarda) istisna fırlatır.
+            cands = getattr(response, "candidates", None)
+            if cands and cands[0].content:
+                text = "".join(p.text for p in cands[0].content.parts if getattr(p, "text", None))
+                if text:
+                    return text
+            logger.warning(f"LLM yanıt formatı beklenenden farklı. Yanıt objesi: {response}")
+            try:
+                return response.text or "LLM'den metin içeriği alınamadı."
+            except (AttributeError, ValueError):
                 return "LLM'den metin içeriği alınamadı."
             
         except Exception as e:
-            logger.error(f"Gemini API'den metin üretirken hata: {e}")
-            logger.exception("Gemini API metin üretimi sırasında bir istisna oluştu:")
+            logger.exception(f"Gemini API'den metin üretirken hata: {e}")
             return None
 
 # Test amaçlı - Bu kısım modül yapısı değişince çalışmayabilir.
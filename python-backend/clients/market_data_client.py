@@ -1,50 +1,42 @@
 # Adjust import path for config
-import config 
-from coinmarketcapapi import CoinMarketCapAPI, CoinMarketCapAPIError
+import config
+import aiohttp
 import logging # logging eklendi
 import traceback # exception loglama için
+from core_logic.http import get_shared_session
+from core_logic.retry import with_retry
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    import json
+    json_loads = json.loads
 
 # Logger oluştur
 logger = logging.getLogger(__name__)
 
+CMC_LISTINGS_URL = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/listings/latest"
+_EMPTY = {}  # Eksik 'quote' alanları için paylaşılan boş sözlük (salt okunur)
+
 class CoinMarketCapClient:
-    def __init__(self):
-        if not config.COINMARKETCAP_API_KEY:
-            logger.error("CoinMarketCapClient başlatılamadı: API anahtarı eksik.")
-            raise ValueError("CoinMarketCap API anahtarı config.py üzerinden ayarlanmalı (.env dosyasını kontrol edin).")
-        try:
-            self.cmc = CoinMarketCapAPI(config.COINMARKETCAP_API_KEY)
-            # Test the connection / API key validity by fetching key info
-            key_info_response = self.cmc.key_info()
-            
-            credits_left_message = "Kredi bilgisi alınamadı."
-            if key_info_response and key_info_response.data:
-                usage_data = key_info_response.data.get('usage')
-                if usage_data:
-                    current_day_usage = usage_data.get('current_day')
-                    if current_day_usage:
-                        credits_left = current_day_usage.get('credits_left')
-                        if credits_left is not None:
-                            credits_left_message = f"Kalan günlük kredi: {credits_left}"
-            
-            logger.info(f"CoinMarketCap istemcisi başarıyla başlatıldı. {credits_left_message}")
+    def __init__(self, session=None):
+        # Anahtar uygulama başlangıcında config.require(...) ile doğrulanır
+        assert config.COINMARKETCAP_API_KEY, "CoinMarketCap API anahtarı config.py üzerinden ayarlanmalı (.env dosyasını kontrol edin)."
+        self.api_key = config.COINMARKETCAP_API_KEY
+        self._headers = {"X-CMC_PRO_API_KEY": self.api_key, "Accept": "application/json"}
+        # Verilmezse uygulama genelindeki paylaşılan oturum kullanılır
+        self._session = session
+        logger.info("CoinMarketCap istemcisi başarıyla başlatıldı.")
 
-        except CoinMarketCapAPIError as e:
-            error_message = "Bilinmeyen CMC API Hatası"
-            if e.rep and hasattr(e.rep, 'status') and isinstance(e.rep.status, dict) and 'error_message' in e.rep.status:
-                error_message = e.rep.status['error_message']
-            else:
-                error_message = str(e)
-            logger.error(f"CoinMarketCap API Hatası (Başlatma): {error_message}")
-            logger.debug(f"CoinMarketCap API Error details (init): {e.rep}")
-            self.cmc = None # Indicate client is not usable
-        except Exception as e:
-            logger.error(f"CoinMarketCap istemcisi başlatılırken beklenmedik hata: {e}")
-            logger.exception("CoinMarketCap istemcisi başlatılırken bir istisna oluştu:")
-            self.cmc = None
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the injected session, or the application-wide shared session."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+        return get_shared_session()
 
-    def get_listings_by_market_cap(self, limit=50, convert_to='USD', sort_by='market_cap'):
-        """ 
+    async def get_listings_by_market_cap(self, limit=50, convert_to='USD', sort_by='market_cap'):
+        """
         CoinMarketCap'ten piyasa değerine göre sıralanmış coin listesini alır.
         Returns: List of dicts, e.g., [
             {'symbol': 'BTC', 'market_cap': 1.2e12, 'price': 60000.0, 'percent_change_24h': 1.5},
@@ -52,36 +44,42 @@ class CoinMarketCapClient:
         ]
         veya hata durumunda None.
         """
-        if not self.cmc:
-            logger.warning("CoinMarketCap istemcisi düzgün başlatılamadığı için veri alınamıyor.")
-            return None
-        
+        params = {
+            "limit": limit,
+            "convert": convert_to,
+            "sort": sort_by,
+            "sort_dir": "desc" # En yüksek market cap en başta
+        }
         try:
             logger.info(f"CoinMarketCap API'den piyasa değerine göre ilk {limit} coin isteniyor ({convert_to} cinsinden)...")
-            listings = self.cmc.cryptocurrency_listings_latest(
-                limit=limit, 
-                convert=convert_to, 
-                sort=sort_by,
-                sort_dir='desc' # En yüksek market cap en başta
-            )
-            
-            processed_listings = []
-            if listings and listings.data:
-                for coin in listings.data:
-                    symbol = coin.get('symbol')
-                    quote_data = coin.get('quote', {}).get(convert_to, {})
-                    
-                    market_cap = quote_data.get('market_cap')
-                    price = quote_data.get('price')
-                    percent_change_24h = quote_data.get('percent_change_24h')
+            session = await self._get_session()
+
+            async def _request():
+                async with session.get(CMC_LISTINGS_URL, params=params, headers=self._headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                    if response.status == 429 or response.status >= 500:
+                        response.raise_for_status()
+                    return response.status, json_loads(await response.read())
+
+            status, listings = await with_retry(_request)
 
-                    if symbol and market_cap is not None and price is not None:
-                        processed_listings.append({
-                            'symbol': symbol,
-                            'market_cap': market_cap,
-                            'price': price,
-                            'percent_change_24h': percent_change_24h # Bu None olabilir, listelemede kontrol edilecek
-                        })
+            if status != 200:
+                error_msg = (listings or {}).get('status', {}).get('error_message') or "Bilinmeyen CMC API Hatası"
+                logger.error(f"CoinMarketCap API Hatası (get_listings_by_market_cap): {error_msg}")
+                logger.debug(f"CoinMarketCap API Error details (get_listings): {listings}")
+                return None
+
+            if listings and listings.get('data'):
+                convert_key = convert_to
+                # percent_change_24h None olabilir, listelemede kontrol edilecek
+                processed_listings = [
+                    {'symbol': sym, 'market_cap': mc, 'price': price, 'percent_change_24h': q.get('percent_change_24h')}
+                    for coin in listings['data']
+                    for sym in (coin.get('symbol'),)
+                    for q in (coin.get('quote', _EMPTY).get(convert_key, _EMPTY),)
+                    for mc in (q.get('market_cap'),)
+                    for price in (q.get('price'),)
+                    if sym and mc is not None and price is not None
+                ]
                 logger.info(f"CoinMarketCap'ten {len(processed_listings)} adet coin başarıyla işlendi.")
                 return processed_listings
             else:
@@ -89,14 +87,8 @@ class CoinMarketCapClient:
                 logger.debug(f"CMC listings_latest raw response: {listings}")
                 return None
 
-        except CoinMarketCapAPIError as e:
-            error_msg = "Bilinmeyen CMC API Hatası"
-            if e.rep and hasattr(e.rep, 'status') and isinstance(e.rep.status, dict) and 'error_message' in e.rep.status:
-                 error_msg = e.rep.status['error_message']
-            else:
-                error_msg = str(e) # Fallback to string representation of the error
-            logger.error(f"CoinMarketCap API Hatası (get_listings_by_market_cap): {error_msg}")
-            logger.debug(f"CoinMarketCap API Error details (get_listings): {e.rep}")
+        except aiohttp.ClientError as e:
+            logger.error(f"CoinMarketCap API Hatası (get_listings_by_market_cap): {e}")
             return None
         except Exception as e:
             logger.error(f"CoinMarketCap listelerini alırken beklenmedik hata: {e}")
@@ -109,4 +101,4 @@ class CoinMarketCapClient:
 #         cmc_client = CoinMarketCapClient()
 #         # ... (test kodları)
 #     except Exception as e:
-#         logger.error(f"Test sırasında hata: {e}") 
\ No newline at end of file
+#         logger.error(f"Test sırasında hata: {e}")
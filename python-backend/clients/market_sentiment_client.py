@@ -1,87 +1,161 @@
 import aiohttp
+import asyncio
 import logging
-from typing import Dict, Optional
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import jinja2
+
+from core_logic.http import get_shared_session
+from core_logic.retry import with_retry
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    import json
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Duyarlılık bölümü şablonu modül yüklenirken bir kez derlenir
+_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "market_sentiment.j2")
+with open(_TEMPLATE_PATH, encoding="utf-8") as _f:
+    _TEMPLATE = jinja2.Environment(
+        autoescape=False, undefined=jinja2.StrictUndefined,
+        trim_blocks=True, keep_trailing_newline=True
+    ).from_string(_f.read())
+
+FEAR_GREED_CACHE_TTL = 600  # Endeks günde birkaç kez güncellenir
+MARKET_TREND_CACHE_TTL = 120
+
 class MarketSentimentClient:
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.fear_greed_url = "https://api.alternative.me/fng/"
         self.market_trend_url = "https://api.coingecko.com/api/v3/global"
-        
+        # Verilmezse uygulama genelindeki paylaşılan oturum kullanılır
+        self._session = session
+        # (değer, son geçerlilik zamanı) - time.monotonic() bazlı
+        self._fng_cache: Optional[Tuple[Dict, float]] = None
+        self._trend_cache: Optional[Tuple[Dict, float]] = None
+        # asyncio.Lock tek bir event loop'a bağlıdır; web API her isteği kendi loop'unda çalıştırır
+        self._locks: Dict[Tuple[str, asyncio.AbstractEventLoop], asyncio.Lock] = {}
+
+    def _get_loop_lock(self, name: str) -> asyncio.Lock:
+        """Returns the named cache lock for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get((name, loop))
+        if lock is None:
+            # Kapanmış loop'lara ait kilitleri bırak
+            for key in [k for k in list(self._locks) if k[1].is_closed()]:
+                self._locks.pop(key, None)
+            lock = self._locks[(name, loop)] = asyncio.Lock()
+        return lock
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the injected session, or the application-wide shared session."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+        return get_shared_session()
+
+    async def _get_json(self, url: str) -> Tuple[int, Optional[Any]]:
+        """GET isteği yapar; 429/5xx yanıtlarında geri çekilmeli olarak yeniden dener."""
+        session = await self._get_session()
+
+        async def _request():
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 429 or response.status >= 500:
+                    response.raise_for_status()
+                if response.status != 200:
+                    return response.status, None
+                return response.status, json_loads(await response.read())
+
+        return await with_retry(_request)
+
     async def get_fear_greed_index(self) -> Optional[Dict]:
-        """Fetches the current Fear & Greed Index."""
+        """Fetches the current Fear & Greed Index (cached for FEAR_GREED_CACHE_TTL seconds)."""
+        if self._fng_cache and time.monotonic() < self._fng_cache[1]:
+            return self._fng_cache[0]
+        async with self._get_loop_lock('fng'):
+            # Kilidi beklerken başka bir coroutine önbelleği doldurmuş olabilir
+            if self._fng_cache and time.monotonic() < self._fng_cache[1]:
+                return self._fng_cache[0]
+            result = await self._fetch_fear_greed_index()
+            if result is not None:
+                self._fng_cache = (result, time.monotonic() + FEAR_GREED_CACHE_TTL)
+            return result
+
+    async def _fetch_fear_greed_index(self) -> Optional[Dict]:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.fear_greed_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data and 'data' in data and len(data['data']) > 0:
-                            latest = data['data'][0]
-                            return {
-                                'value': int(latest['value']),
-                                'value_classification': latest['value_classification'],
-                                'timestamp': latest['timestamp'],
-                                'time_until_update': latest['time_until_update']
-                            }
-                    logger.warning(f"Fear & Greed Index alınamadı. Status: {response.status}")
-                    return None
+            status, data = await self._get_json(self.fear_greed_url)
+            if status == 200 and data and 'data' in data and len(data['data']) > 0:
+                latest = data['data'][0]
+                return {
+                    'value': int(latest['value']),
+                    'value_classification': latest['value_classification'],
+                    'timestamp': latest['timestamp'],
+                    'time_until_update': latest['time_until_update']
+                }
+            logger.warning(f"Fear & Greed Index alınamadı. Status: {status}")
+            return None
         except Exception as e:
             logger.error(f"Fear & Greed Index alınırken hata: {e}")
             return None
 
     async def get_market_trend(self) -> Optional[Dict]:
-        """Fetches the current market trend data from CoinGecko."""
+        """Fetches the current market trend data from CoinGecko (cached for MARKET_TREND_CACHE_TTL seconds)."""
+        if self._trend_cache and time.monotonic() < self._trend_cache[1]:
+            return self._trend_cache[0]
+        async with self._get_loop_lock('trend'):
+            if self._trend_cache and time.monotonic() < self._trend_cache[1]:
+                return self._trend_cache[0]
+            result = await self._fetch_market_trend()
+            if result is not None:
+                self._trend_cache = (result, time.monotonic() + MARKET_TREND_CACHE_TTL)
+            return result
+
+    async def _fetch_market_trend(self) -> Optional[Dict]:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.market_trend_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data and 'data' in data:
-                            market_data = data['data']
-                            return {
-                                'total_market_cap': market_data['total_market_cap']['usd'],
-                                'total_volume': market_data['total_volume']['usd'],
-                                'market_cap_change_percentage_24h': market_data['market_cap_change_percentage_24h_usd'],
-                                'market_cap_dominance': {
-                                    'btc': market_data['market_cap_percentage']['btc'],
-                                    'eth': market_data['market_cap_percentage']['eth']
-                                },
-                                'active_cryptocurrencies': market_data['active_cryptocurrencies'],
-                                'upcoming_icos': market_data['upcoming_icos'],
-                                'ongoing_icos': market_data['ongoing_icos'],
-                                'ended_icos': market_data['ended_icos']
-                            }
-                    logger.warning(f"Market trend verisi alınamadı. Status: {response.status}")
-                    return None
+            status, data = await self._get_json(self.market_trend_url)
+            if status == 200 and data and 'data' in data:
+                market_data = data['data']
+                return {
+                    'total_market_cap': market_data['total_market_cap']['usd'],
+                    'total_volume': market_data['total_volume']['usd'],
+                    'market_cap_change_percentage_24h': market_data['market_cap_change_percentage_24h_usd'],
+                    'market_cap_dominance': {
+                        'btc': market_data['market_cap_percentage']['btc'],
+                        'eth': market_data['market_cap_percentage']['eth']
+                    },
+                    'active_cryptocurrencies': market_data['active_cryptocurrencies'],
+                    'upcoming_icos': market_data['upcoming_icos'],
+                    'ongoing_icos': market_data['ongoing_icos'],
+                    'ended_icos': market_data['ended_icos']
+                }
+            logger.warning(f"Market trend verisi alınamadı. Status: {status}")
+            return None
         except Exception as e:
             logger.error(f"Market trend verisi alınırken hata: {e}")
             return None
 
+    async def get_all_sentiment(self) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Fetches Fear & Greed and market trend data concurrently.
+
+        Returns:
+            (fear_greed_data, market_trend_data); a failed fetch is returned as None.
+        """
+        fng, trend = await asyncio.gather(
+            self.get_fear_greed_index(), self.get_market_trend(), return_exceptions=True
+        )
+        if isinstance(fng, BaseException):
+            logger.error(f"Fear & Greed Index alınırken hata: {fng}")
+            fng = None
+        if isinstance(trend, BaseException):
+            logger.error(f"Market trend verisi alınırken hata: {trend}")
+            trend = None
+        return fng, trend
+
     def format_market_sentiment_for_llm(self, fear_greed_data: Optional[Dict], market_trend_data: Optional[Dict]) -> str:
         """Formats market sentiment data for LLM context."""
-        sentiment_str = "## Piyasa Duyarlılık Verileri\n\n"
-        
-        # Fear & Greed Index
-        if fear_greed_data:
-            sentiment_str += "### Korku & Açgözlülük Endeksi\n"
-            sentiment_str += f"- Değer: {fear_greed_data['value']} ({fear_greed_data['value_classification']})\n"
-            sentiment_str += f"- Son Güncelleme: {fear_greed_data['timestamp']}\n\n"
-        else:
-            sentiment_str += "### Korku & Açgözlülük Endeksi\n"
-            sentiment_str += "- Veri alınamadı\n\n"
-        
-        # Market Trend
-        if market_trend_data:
-            sentiment_str += "### Piyasa Trendi\n"
-            sentiment_str += f"- Toplam Piyasa Değeri: ${market_trend_data['total_market_cap']:,.2f}\n"
-            sentiment_str += f"- 24s Değişim: %{market_trend_data['market_cap_change_percentage_24h']:.2f}\n"
-            sentiment_str += f"- Toplam Hacim: ${market_trend_data['total_volume']:,.2f}\n"
-            sentiment_str += f"- BTC Dominansı: %{market_trend_data['market_cap_dominance']['btc']:.2f}\n"
-            sentiment_str += f"- ETH Dominansı: %{market_trend_data['market_cap_dominance']['eth']:.2f}\n"
-            sentiment_str += f"- Aktif Kripto Para Sayısı: {market_trend_data['active_cryptocurrencies']}\n"
-        else:
-            sentiment_str += "### Piyasa Trendi\n"
-            sentiment_str += "- Veri alınamadı\n"
-        
-        return sentiment_str 
\ No newline at end of file
+        return _TEMPLATE.render(fng=fear_greed_data, trend=market_trend_data)
@@ -1,4 +1,6 @@
 import os
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
 import logging
 
@@ -8,27 +10,57 @@ logger = logging.getLogger(__name__)
 # Load environment variables from .env file
 load_dotenv()
 
-# Exchange API Credentials
-EXCHANGE_API_KEY = os.getenv("EXCHANGE_API_KEY")
-EXCHANGE_API_SECRET = os.getenv("EXCHANGE_API_SECRET")
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Uygulama ayarları; ortam değişkenlerinden bir kez okunur ve değiştirilemez."""
+    # Exchange API Credentials
+    exchange_api_key: Optional[str]
+    exchange_api_secret: Optional[str]
+    # LLM API Credentials
+    llm_api_key: Optional[str]
+    llm_model: Optional[str]
+    # CoinMarketCap API Key
+    coinmarketcap_api_key: Optional[str]
+    # Fundamental Analysis API Keys
+    cryptopanic_api_key: Optional[str]
+    # Telegram Bot Configuration
+    telegram_bot_token: Optional[str]
+    telegram_chat_id: Optional[str]
+    # Diğer Ayarlar
+    default_kline_interval: str = "1h" # Varsayılan mum aralığı (örn: 15m, 1h, 4h, 1d)
+    default_kline_limit: int = 500 # Asenkron çağrılar için varsayılan kline limiti
+    binance_http_concurrency: int = 10 # Eşzamanlı Binance REST isteği sınırı (1200 weight/dk)
+    llm_concurrency: int = 4 # Aynı anda en fazla kaç LLM isteği gönderilebilir
+    kline_cache_ttl: int = 60 # Aynı (sembol, aralık, limit) K-line isteklerinin önbellekte tutulma süresi (sn)
 
-# LLM API Credentials
-LLM_API_KEY = os.getenv("LLM_API_KEY")
-LLM_MODEL = os.getenv("LLM_MODEL")
+settings = Config(
+    exchange_api_key=os.getenv("EXCHANGE_API_KEY"),
+    exchange_api_secret=os.getenv("EXCHANGE_API_SECRET"),
+    llm_api_key=os.getenv("LLM_API_KEY"),
+    llm_model=os.getenv("LLM_MODEL"),
+    coinmarketcap_api_key=os.getenv("COINMARKETCAP_API_KEY"),
+    cryptopanic_api_key=os.getenv("CRYPTOPANIC_API_KEY"),
+    telegram_bot_token=os.getenv("TELEGRAM_BOT_TOKEN"),  # Load from .env file
+    telegram_chat_id=os.getenv("TELEGRAM_CHAT_ID"),    # Load from .env file (optional)
+    binance_http_concurrency=int(os.getenv("BINANCE_HTTP_CONCURRENCY", "10")),
+    llm_concurrency=int(os.getenv("LLM_CONCURRENCY", "4")),
+    kline_cache_ttl=int(os.getenv("KLINE_CACHE_TTL", "60")),
+)
 
-# CoinMarketCap API Key
-COINMARKETCAP_API_KEY = os.getenv("COINMARKETCAP_API_KEY")
-
-# Fundamental Analysis API Keys
-CRYPTOPANIC_API_KEY = os.getenv("CRYPTOPANIC_API_KEY")
-
-# Telegram Bot Configuration
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")  # Load from .env file
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")    # Load from .env file (optional)
-
-# Diğer Ayarlar
-DEFAULT_KLINE_INTERVAL = "1h" # Varsayılan mum aralığı (örn: 15m, 1h, 4h, 1d)
-DEFAULT_KLINE_LIMIT = 500 # Asenkron çağrılar için varsayılan kline limiti
+# Geriye dönük uyumluluk: eski modül seviyesindeki isimler
+EXCHANGE_API_KEY = settings.exchange_api_key
+EXCHANGE_API_SECRET = settings.exchange_api_secret
+LLM_API_KEY = settings.llm_api_key
+LLM_MODEL = settings.llm_model
+COINMARKETCAP_API_KEY = settings.coinmarketcap_api_key
+CRYPTOPANIC_API_KEY = settings.cryptopanic_api_key
+TELEGRAM_BOT_TOKEN = settings.telegram_bot_token
+TELEGRAM_CHAT_ID = settings.telegram_chat_id
+DEFAULT_KLINE_INTERVAL = settings.default_kline_interval
+DEFAULT_KLINE_LIMIT = settings.default_kline_limit
+BINANCE_HTTP_CONCURRENCY = settings.binance_http_concurrency
+LLM_CONCURRENCY = settings.llm_concurrency
+KLINE_CACHE_TTL = settings.kline_cache_ttl
 
 if not EXCHANGE_API_KEY or not EXCHANGE_API_SECRET:
     logger.warning("Borsa API anahtarı (EXCHANGE_API_KEY) veya gizli anahtar (EXCHANGE_API_SECRET) .env dosyasında bulunamadı veya ayarlanmadı.")
@@ -41,4 +73,19 @@ if not COINMARKETCAP_API_KEY:
 
 # Add warnings for Telegram Bot Token if not found
 if not TELEGRAM_BOT_TOKEN:
-    logger.warning("Telegram Bot Token (TELEGRAM_BOT_TOKEN) .env dosyasında bulunamadı veya ayarlanmadı.")
\ No newline at end of file
+    logger.warning("Telegram Bot Token (TELEGRAM_BOT_TOKEN) .env dosyasında bulunamadı veya ayarlanmadı.")
+
+def require(*names: str) -> None:
+    """
+    Uygulama başlangıcında gerekli ayarların tümünü tek seferde doğrular.
+
+    Args:
+        *names: Modül seviyesindeki ayar adları (örn. "EXCHANGE_API_KEY")
+
+    Raises:
+        RuntimeError: Eksik ayarların tamamını listeleyerek
+    """
+    missing = [n for n in names if not globals().get(n)]
+    if missing:
+        logger.error(f"Eksik ortam değişkenleri: {', '.join(missing)} (.env dosyasını kontrol edin).")
+        raise RuntimeError(f"Missing env vars: {missing}")
@@ -2,18 +2,15 @@
 Analysis Facade - Provides a simple interface to access the analysis modules.
 """
 import logging
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 
 from clients.exchange_client import BinanceClient
 from clients.llm_client import GeminiClient
 from fundamental_analysis.cryptopanic_client import CryptoPanicClient
-from core_logic.analysis_modules import (
-    BaseAnalysisModule, 
-    CryptoAnalysisModule, 
-    SpotTradingAnalysisModule, 
-    FuturesTradingAnalysisModule,
-    registry
-)
+from core_logic.analysis_modules import AnalysisResult, BaseAnalysisModule, registry
+
+if TYPE_CHECKING:
+    from clients.depth_stream import DepthStreamer
 
 logger = logging.getLogger("analysis.facade")
 
@@ -21,14 +18,15 @@ class AnalysisFacade:
     """
     Facade for the analysis system that simplifies interaction with the various analysis modules.
     
-    This class handles initialization of all analysis modules and provides a simplified
+    This class registers all analysis modules (instantiated on first use) and provides a simplified
     interface for performing analysis with different modules.
     """
     
     def __init__(self, 
                  binance_client: BinanceClient, 
                  llm_client: GeminiClient, 
-                 cryptopanic_client: Optional[CryptoPanicClient] = None):
+                 cryptopanic_client: Optional[CryptoPanicClient] = None,
+                 depth_stream: bool = False):
         """
         Initialize the analysis facade.
         
@@ -36,41 +34,68 @@ class AnalysisFacade:
             binance_client: Binance API client
             llm_client: LLM API client
             cryptopanic_client: Optional CryptoPanic API client for fundamental analysis
+            depth_stream: Feed futures order books from WebSocket depth streams; only worth
+                enabling in long-running processes that keep one event loop
         """
         self.binance_client = binance_client
         self.llm_client = llm_client
         self.cryptopanic_client = cryptopanic_client
+        self.depth_streamer: Optional["DepthStreamer"] = None
+        self._depth_stream = depth_stream
         
         # Initialize and register modules
         self._initialize_modules()
     
     def _initialize_modules(self) -> None:
-        """Initialize all available analysis modules."""
-        # Initialize core crypto analysis module
-        crypto_module = CryptoAnalysisModule(
-            self.binance_client, 
-            self.llm_client, 
-            self.cryptopanic_client
+        """Register factories for all available analysis modules; each is built on first use."""
+        # Core crypto analysis module
+        registry.register_factory(
+            "crypto_analysis",
+            self._build_crypto_module,
+            description="Comprehensive cryptocurrency technical and fundamental analysis"
         )
         
-        # Initialize spot trading module
-        spot_module = SpotTradingAnalysisModule(
-            self.binance_client,
-            self.llm_client
+        # Spot trading module
+        registry.register_factory(
+            "spot_trading_analysis",
+            self._build_spot_module,
+            description="Spot trading analysis with entry/exit points and risk management"
         )
         
-        # Initialize futures trading module
-        futures_module = FuturesTradingAnalysisModule(
-            self.binance_client,
-            self.llm_client
+        # Futures trading module
+        registry.register_factory(
+            "futures_trading_analysis",
+            self._build_futures_module,
+            description="Futures/leverage trading analysis with risk management"
         )
         
-        # Register modules in registry
-        registry.register_module(crypto_module)
-        registry.register_module(spot_module)
-        registry.register_module(futures_module)
-        
-        logger.info(f"Initialized and registered {len(registry.modules)} analysis modules")
+        logger.info(f"Registered {len(registry.module_names())} analysis modules (lazily initialized)")
+    
+    # The module classes are imported inside their factories so that a module (and its
+    # pandas/TA dependencies) is only loaded when it is first used
+    def _build_crypto_module(self) -> BaseAnalysisModule:
+        from core_logic.analysis_modules.crypto_analysis import CryptoAnalysisModule
+        return CryptoAnalysisModule(self.binance_client, self.llm_client, self.cryptopanic_client)
+    
+    def _build_spot_module(self) -> BaseAnalysisModule:
+        from core_logic.analysis_modules.spot_trading_analysis import SpotTradingAnalysisModule
+        return SpotTradingAnalysisModule(self.binance_client, self.llm_client)
+    
+    def _build_futures_module(self) -> BaseAnalysisModule:
+        from core_logic.analysis_modules.futures_trading_analysis import FuturesTradingAnalysisModule
+        return FuturesTradingAnalysisModule(self.binance_client, self.llm_client, self._get_depth_streamer())
+    
+    def _get_depth_streamer(self) -> Optional["DepthStreamer"]:
+        """Returns the shared depth streamer if depth streaming is enabled, creating it on first use."""
+        if self._depth_stream and self.depth_streamer is None:
+            from clients.depth_stream import DepthStreamer
+            self.depth_streamer = DepthStreamer(self.binance_client.client)
+        return self.depth_streamer
+    
+    async def close(self) -> None:
+        """Stops the depth streams of the running event loop, if any."""
+        if self.depth_streamer is not None:
+            await self.depth_streamer.close()
     
     def has_module(self, module_name: str) -> bool:
         """
@@ -82,12 +107,12 @@ class AnalysisFacade:
         Returns:
             bool: True if module exists, False otherwise
         """
-        return registry.get_module(module_name) is not None
+        return registry.has_module(module_name)
     
     async def analyze(self, 
                       module_name: str, 
                       symbol: str, 
-                      **kwargs) -> str:
+                      **kwargs) -> AnalysisResult:
         """
         Perform analysis using a specified module.
         
@@ -97,17 +122,21 @@ class AnalysisFacade:
             **kwargs: Additional parameters to pass to the module
             
         Returns:
-            str: Analysis result from the specified module
+            AnalysisResult: Analysis result from the specified module; plain strings from
+            older modules are wrapped as successful results, since only the module can flag a failure
         """
         module = registry.get_module(module_name)
         if not module:
-            available_modules = ", ".join(registry.modules.keys())
+            available_modules = ", ".join(registry.module_names())
             error_message = f"Module '{module_name}' not found. Available modules: {available_modules}"
             logger.error(error_message)
-            return f"❌ Analysis Error: {error_message}"
+            return AnalysisResult(symbol, module_name, f"❌ Analysis Error: {error_message}", is_error=True)
         
         logger.info(f"Performing {module_name} analysis on {symbol}")
-        return await module.perform_analysis(symbol, **kwargs)
+        result = await module.perform_analysis(symbol, **kwargs)
+        if isinstance(result, AnalysisResult):
+            return result
+        return AnalysisResult(symbol, module_name, result, btc_trend=kwargs.get('btc_trend_summary'))
     
     def list_available_modules(self) -> List[Dict[str, str]]:
         """
@@ -141,7 +170,8 @@ analysis_system = None  # type: Optional[AnalysisFacade]
 
 def initialize_analysis_system(binance_client: BinanceClient, 
                                llm_client: GeminiClient,
-                               cryptopanic_client: Optional[CryptoPanicClient] = None) -> AnalysisFacade:
+                               cryptopanic_client: Optional[CryptoPanicClient] = None,
+                               depth_stream: bool = False) -> AnalysisFacade:
     """
     Initialize the global analysis system.
     
@@ -149,12 +179,13 @@ def initialize_analysis_system(binance_client: BinanceClient,
         binance_client: Binance API client
         llm_client: LLM API client
         cryptopanic_client: Optional CryptoPanic API client
+        depth_stream: Feed futures order books from WebSocket depth streams
         
     Returns:
         AnalysisFacade: The initialized analysis system
     """
     global analysis_system
-    analysis_system = AnalysisFacade(binance_client, llm_client, cryptopanic_client)
+    analysis_system = AnalysisFacade(binance_client, llm_client, cryptopanic_client, depth_stream)
     return analysis_system
 
 def get_analysis_system() -> Optional[AnalysisFacade]:
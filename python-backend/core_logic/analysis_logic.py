@@ -6,12 +6,17 @@ from typing import Optional, Dict
 import os
 import json
 import asyncio
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from operator import attrgetter, itemgetter
 
 # Adjust import paths for utils and constants
 from utils.general_utils import (
     format_indicator_value, preprocess_klines_df, 
     calculate_technical_indicators, extract_latest_indicators, 
-    extract_price_summary_data
+    extract_price_summary_data, LatestIndicators
 )
 from utils.volume_analysis import compare_volume_across_timeframes
 
@@ -30,22 +35,93 @@ from .constants import (
 # Functions in this module are responsible for performing calculations, technical analysis,
 # and formatting data specifically for the LLM.
 
+# extract_latest_indicators keys read by the BTC summary, built once instead of per call
+# (the multi-timeframe builder reads LatestIndicators attributes).
+_SMA_SHORT_KEY = f'sma_{SMA_SHORT_PERIOD}'
+_SMA_LONG_KEY = f'sma_{SMA_LONG_PERIOD}'
+_VOLUME_MA_PERIODS = (20, 50, 100)
+# Reads (volume_ma_N, volume_vs_ma_N) pairs for every period from a LatestIndicators in one C call
+_VOLUME_MA_GETTER = attrgetter(*(name for p in _VOLUME_MA_PERIODS for name in (f'volume_ma_{p}', f'volume_vs_ma_{p}')))
+_TF_ORDER = ('15m', '1h', '4h', '1d')  # Shortest to longest; unknown timeframes go last
+_TF_RANK = {tf: i for i, tf in enumerate(_TF_ORDER)}
+_EXCLUDE_FIB = frozenset(('0.0%', '100.0%'))  # Shown separately as the high/low of the range
+# Per-timeframe prompt blocks with the constant periods substituted once at import time;
+# the remaining {placeholders} are filled per timeframe with str.format_map.
+_TF_PRICE_TEMPLATE = (
+    "--- Zaman Dilimi: {interval_str} ---\n"
+    f"  Bu Periyottaki En Yüksek Fiyat (Son {DEFAULT_KLINE_LIMIT} Mum): {{highest}} USDT\n"
+    f"  Bu Periyottaki En Düşük Fiyat (Son {DEFAULT_KLINE_LIMIT} Mum): {{lowest}} USDT\n"
+    f"  Son {RECENT_SR_CANDLE_COUNT} Mumun En Yüksek Fiyatı: {{recent_high}} USDT\n"
+    f"  Son {RECENT_SR_CANDLE_COUNT} Mumun En Düşük Fiyatı: {{recent_low}} USDT\n"
+    "  Son 5 Kapanış Fiyatı (en sondan başlayarak): {last_closes}\n"
+    "  Teknik İndikatörler (Son Değerler):\n"
+    f"    RSI({RSI_PERIOD}): {{rsi}}\n"
+)
+_TF_INDICATOR_TEMPLATE = (
+    f"    SMA({SMA_SHORT_PERIOD}): {{sma_short}} USDT\n"
+    f"    SMA({SMA_LONG_PERIOD}): {{sma_long}} USDT\n"
+    f"    EMA({EMA_SHORT_PERIOD}): {{ema_short}} USDT\n"
+    f"    EMA({EMA_LONG_PERIOD}): {{ema_long}} USDT\n"
+    f"    ATR({ATR_PERIOD}): {{atr}} (Volatilite Göstergesi)\n"
+    f"    MACD({MACD_FAST_PERIOD},{MACD_SLOW_PERIOD},{MACD_SIGNAL_PERIOD}): {{macd}}\n"
+    "    MACD Sinyal: {macd_signal}\n"
+    "    Hacim İndikatörleri:\n"
+    "      Güncel Hacim: {volume}\n"
+)
+_OPEN_TIME = itemgetter(0)  # kline[0] is the open time in ms
+
+_BTC_SUMMARY_TTL_S = 45  # Seconds a successful BTC trend summary is reused
+_btc_summary_cache: Dict[tuple, tuple] = {}  # (symbol, interval) -> (monotonic time, summary)
+
+# name -> (event loop, lock); locks are recreated when a different loop asks (web API uses asyncio.run per request)
+_loop_locks: Dict[str, tuple] = {}
+
+# event loop -> fallback (binance, llm, cryptopanic) clients for perform_analysis callers that pass none, see get_clients()
+_clients: Dict[asyncio.AbstractEventLoop, tuple] = {}
+
+# main.analyze_coin, resolved once on first use (main imports this module at load time)
+_analyze_coin = None
+
+_INDICATOR_CACHE_MAX_ENTRIES = 64
+_indicator_cache: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (df_with_indicators, latest_indicators)
+_indicator_cache_lock = threading.Lock()  # Intervals are processed on worker threads
+
+def _rel(a, b):
+    """Describes a relative to b as "üzerinde"/"altında"/"eşit", or "bilinmiyor" when either value is missing."""
+    if a is None or b is None or isinstance(a, str) or isinstance(b, str):
+        return "bilinmiyor"
+    if a > b:
+        return "üzerinde"
+    if a < b:
+        return "altında"
+    return "eşit"
+
+def _compute_cut(klines, timestamp_ms):
+    """Returns the index just past the last kline whose open time is at or before timestamp_ms.
+
+    kline[0] is open_time and klines are sorted ascendingly by the caller (e.g. get_historical_klines),
+    so this is a binary search on the open-time column instead of a linear filter.
+    """
+    return bisect.bisect_right(klines, timestamp_ms, key=_OPEN_TIME)
+
 def build_bitcoin_trend_summary_string(symbol, current_ticker_data, latest_indicators):
     """Builds the Bitcoin trend summary string using ticker data and latest indicators."""
-    logging.debug(f"Building Bitcoin trend summary for {symbol}. Received latest_indicators: {latest_indicators}")
+    debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+    if debug_enabled: # Skip building the indicator dict repr when DEBUG is off
+        logging.debug("Building Bitcoin trend summary for %s. Received latest_indicators: %s", symbol, latest_indicators)
     current_price_str = current_ticker_data.get('lastPrice', 'N/A')
     current_price_val = float(current_price_str) if current_price_str != 'N/A' and current_price_str is not None else None
     price_change_percent_str = current_ticker_data.get('priceChangePercent', 'N/A')
 
-    summary = f"Bitcoin ({symbol}) Güncel Durum Özeti:\\n"
-    summary += f"  Mevcut Fiyat: {format_indicator_value(current_price_str, 2)} USDT (24s Değişim: %{format_indicator_value(price_change_percent_str, 2)})\\n"
+    parts = [f"Bitcoin ({symbol}) Güncel Durum Özeti:\\n"]
+    parts.append(f"  Mevcut Fiyat: {format_indicator_value(current_price_str, 2)} USDT (24s Değişim: %{format_indicator_value(price_change_percent_str, 2)})\\n")
     
     rsi_val = latest_indicators.get('rsi')
-    summary += f"  RSI({RSI_PERIOD}): {format_indicator_value(rsi_val)}\\n"
+    parts.append(f"  RSI({RSI_PERIOD}): {format_indicator_value(rsi_val)}\\n")
 
-    # SMA değerlerini f-string anahtarlarıyla al ve formatla
-    latest_sma_short_key = f'sma_{SMA_SHORT_PERIOD}'
-    latest_sma_long_key = f'sma_{SMA_LONG_PERIOD}'
+    # SMA değerlerini önceden hesaplanmış anahtarlarla al ve formatla
+    latest_sma_short_key = _SMA_SHORT_KEY
+    latest_sma_long_key = _SMA_LONG_KEY
 
     latest_sma_short_val_raw = latest_indicators.get(latest_sma_short_key)
     latest_sma_long_val_raw = latest_indicators.get(latest_sma_long_key)
@@ -53,21 +129,16 @@ def build_bitcoin_trend_summary_string(symbol, current_ticker_data, latest_indic
     latest_sma_short_val_str = format_indicator_value(latest_sma_short_val_raw)
     latest_sma_long_val_str = format_indicator_value(latest_sma_long_val_raw)
     
-    logging.debug(f"BTC Summary: current_price_val={current_price_val}, sma_short_val_raw ({latest_sma_short_key})={latest_sma_short_val_raw}, sma_long_val_raw ({latest_sma_long_key})={latest_sma_long_val_raw}")
-
-    sma_short_relation = "bilinmiyor"
-    if current_price_val is not None and latest_sma_short_val_raw is not None and not isinstance(latest_sma_short_val_raw, str):
-        if current_price_val > latest_sma_short_val_raw: sma_short_relation = "üzerinde"
-        elif current_price_val < latest_sma_short_val_raw: sma_short_relation = "altında"
-        else: sma_short_relation = "eşit"
-    summary += f"  Fiyat vs SMA{SMA_SHORT_PERIOD} ({latest_sma_short_val_str}): Fiyat {sma_short_relation}\\n"
-
-    sma_long_relation = "bilinmiyor"
-    if current_price_val is not None and latest_sma_long_val_raw is not None and not isinstance(latest_sma_long_val_raw, str):
-        if current_price_val > latest_sma_long_val_raw: sma_long_relation = "üzerinde"
-        elif current_price_val < latest_sma_long_val_raw: sma_long_relation = "altında"
-        else: sma_long_relation = "eşit"
-    summary += f"  Fiyat vs SMA{SMA_LONG_PERIOD} ({latest_sma_long_val_str}): Fiyat {sma_long_relation}\\n"
+    if debug_enabled:
+        logging.debug("BTC Summary: current_price_val=%s, sma_short_val_raw (%s)=%s, sma_long_val_raw (%s)=%s",
+                      current_price_val, latest_sma_short_key, latest_sma_short_val_raw, latest_sma_long_key, latest_sma_long_val_raw)
+
+    # Fiyat vs SMA satırları tek bir tablodan üretilir
+    sma_rows = (
+        (SMA_SHORT_PERIOD, latest_sma_short_val_str, _rel(current_price_val, latest_sma_short_val_raw)),
+        (SMA_LONG_PERIOD, latest_sma_long_val_str, _rel(current_price_val, latest_sma_long_val_raw)),
+    )
+    parts.extend(f"  Fiyat vs SMA{period} ({val_str}): Fiyat {relation}\\n" for period, val_str, relation in sma_rows)
     
     latest_macd_val_raw = latest_indicators.get('macd')
     latest_macd_signal_val_raw = latest_indicators.get('macd_signal')
@@ -75,14 +146,64 @@ def build_bitcoin_trend_summary_string(symbol, current_ticker_data, latest_indic
     latest_macd_val_str = format_indicator_value(latest_macd_val_raw)
     latest_macd_signal_val_str = format_indicator_value(latest_macd_signal_val_raw)
 
-    macd_relation = "bilinmiyor"
-    if latest_macd_val_raw is not None and latest_macd_signal_val_raw is not None and \
-       not isinstance(latest_macd_val_raw, str) and not isinstance(latest_macd_signal_val_raw, str):
-        if latest_macd_val_raw > latest_macd_signal_val_raw: macd_relation = "üzerinde"
-        elif latest_macd_val_raw < latest_macd_signal_val_raw: macd_relation = "altında"
-        else: macd_relation = "eşit"
-    summary += f"  MACD Çizgisi ({latest_macd_val_str}) vs Sinyal Çizgisi ({latest_macd_signal_val_str}): MACD {macd_relation}\\n"
-    return summary
+    macd_relation = _rel(latest_macd_val_raw, latest_macd_signal_val_raw)
+    parts.append(f"  MACD Çizgisi ({latest_macd_val_str}) vs Sinyal Çizgisi ({latest_macd_signal_val_str}): MACD {macd_relation}\\n")
+    return "".join(parts)
+
+def _get_loop_lock(name: str) -> asyncio.Lock:
+    """Returns the named module lock for the running event loop, rebuilt if the loop changed."""
+    loop = asyncio.get_running_loop()
+    entry = _loop_locks.get(name)
+    if entry is None or entry[0] is not loop:
+        entry = _loop_locks[name] = (loop, asyncio.Lock())
+    return entry[1]
+
+async def get_clients():
+    """
+    Returns the fallback clients used by perform_analysis when the caller passes none.
+
+    Callers that already own clients (e.g. CryptoAnalysisModule) pass them to
+    perform_analysis instead. The Binance client owns a session bound to the event loop it
+    was created in, so each loop gets its own set; close_clients() closes the running loop's
+    set before the loop shuts down.
+
+    Returns:
+        tuple: (BinanceClient, GeminiClient, Optional[CryptoPanicClient])
+    """
+    loop = asyncio.get_running_loop()
+    clients = _clients.get(loop)
+    if clients is not None:
+        return clients
+    async with _get_loop_lock('clients'):
+        clients = _clients.get(loop)
+        if clients is None:
+            # Sets left by loops that shut down without close_clients() can no longer be used
+            for stale_loop in [l for l in list(_clients) if l.is_closed()]:
+                _clients.pop(stale_loop, None)
+            # All clients read their API keys from config.py; CryptoPanic is optional
+            cryptopanic_client = CryptoPanicClient(CRYPTOPANIC_API_KEY) if CRYPTOPANIC_API_KEY else None
+            clients = _clients[loop] = (BinanceClient(), GeminiClient(), cryptopanic_client)
+            logging.info("Analiz istemcileri oluşturuldu ve paylaşım için önbelleğe alındı.")
+    return clients
+
+async def close_clients():
+    """Closes the running loop's fallback Binance client created by get_clients(), if any."""
+    clients = _clients.pop(asyncio.get_running_loop(), None)
+    if clients is not None:
+        await clients[0].close()
+
+def _resolve_analyze_coin():
+    """
+    Returns main.analyze_coin, importing it only on the first call.
+
+    main imports this module at the top level, so the import cannot be hoisted to
+    module scope; caching the bound function keeps it off the per-request path.
+    """
+    global _analyze_coin
+    if _analyze_coin is None:
+        from main import analyze_coin
+        _analyze_coin = analyze_coin
+    return _analyze_coin
 
 async def get_bitcoin_trend_summary(binance_cli):
     logging.info("--- Bitcoin (BTCUSDT) Trend Özeti Alınıyor ---")
@@ -90,38 +211,112 @@ async def get_bitcoin_trend_summary(binance_cli):
     # For BTC summary, we use the primary KLINE_INTERVAL from constants for now.
     # This could be expanded to multi-timeframe in the future if needed.
     primary_btc_interval = KLINE_INTERVAL 
+    cache_key = (symbol, primary_btc_interval)
+
+    # The BTC context is identical for every coin analysed in a burst, so reuse it for a short while
+    entry = _btc_summary_cache.get(cache_key)
+    if entry and time.monotonic() - entry[0] < _BTC_SUMMARY_TTL_S:
+        logging.debug("Bitcoin trend özeti önbellekten döndürüldü (%s).", cache_key)
+        return entry[1]
+
+    async with _get_loop_lock('btc_summary'):
+        # Another task may have filled the cache while we were waiting for the lock
+        entry = _btc_summary_cache.get(cache_key)
+        if entry and time.monotonic() - entry[0] < _BTC_SUMMARY_TTL_S:
+            return entry[1]
+
+        summary, ok = await _fetch_bitcoin_trend_summary(binance_cli, symbol, primary_btc_interval)
+        if ok:
+            _btc_summary_cache[cache_key] = (time.monotonic(), summary)
+        return summary
+
+async def _fetch_bitcoin_trend_summary(binance_cli, symbol, primary_btc_interval):
+    """Fetches the data and builds the BTC summary; returns (summary, ok) where ok marks a cacheable result."""
     try:
-        # Use get_klines which is the async method in BinanceClient now
-        klines = await binance_cli.get_klines(
-            symbol,
-            primary_btc_interval, # Using the single primary interval for BTC summary
-            limit=500 # Explicitly request 500 candles for reliable indicator calculations
-            # KLINE_HISTORY_PERIOD is not directly used by get_klines, limit is used.
-            # Assuming DEFAULT_KLINE_LIMIT from config is used by get_klines by default if not specified
-            # For consistency, if KLINE_HISTORY_PERIOD implied a certain number of klines, ensure limit reflects that.
-            # However, the current get_klines takes `limit`. We should rely on a limit that ensures enough data (e.g., 500, or DEFAULT_KLINE_LIMIT from config)
+        # Klines and the 24h ticker are independent requests, so fetch them concurrently
+        klines, current_ticker_data = await asyncio.gather(
+            binance_cli.get_klines(
+                symbol,
+                primary_btc_interval, # Using the single primary interval for BTC summary
+                limit=500 # Explicitly request 500 candles for reliable indicator calculations
+                # KLINE_HISTORY_PERIOD is not directly used by get_klines, limit is used.
+                # Assuming DEFAULT_KLINE_LIMIT from config is used by get_klines by default if not specified
+                # For consistency, if KLINE_HISTORY_PERIOD implied a certain number of klines, ensure limit reflects that.
+                # However, the current get_klines takes `limit`. We should rely on a limit that ensures enough data (e.g., 500, or DEFAULT_KLINE_LIMIT from config)
+            ),
+            binance_cli.client.get_ticker(symbol=symbol),
         )
         if not klines or len(klines) < 50:
             logging.warning(f"{symbol} için trend özeti oluşturacak yeterli mum verisi (en az 50) bulunamadı.")
-            return "Bitcoin (BTCUSDT) trend verisi şu anda alınamıyor."
-
-        current_ticker_data = await binance_cli.client.get_ticker(symbol=symbol)
+            return "Bitcoin (BTCUSDT) trend verisi şu anda alınamıyor.", False
 
-        df = preprocess_klines_df(klines)
-        df_with_indicators = calculate_technical_indicators(df)
-        latest_indicators = extract_latest_indicators(df_with_indicators)
+        df_with_indicators, latest_indicators = _compute_indicators_cached(symbol, primary_btc_interval, klines)
         
         summary = build_bitcoin_trend_summary_string(symbol, current_ticker_data, latest_indicators)
         
-        logging.info(f"Bitcoin Trend Özeti:\n{summary}")
-        return summary
+        logging.info("Bitcoin Trend Özeti:\n%s", summary)
+        return summary, True
 
     except Exception as e:
         logging.error(f"Bitcoin (BTCUSDT) trend özeti alınırken hata oluştu: {e}")
         logging.exception("Bitcoin trend özeti alınırken bir istisna oluştu:")
-        return "Bitcoin (BTCUSDT) trend verisi alınırken bir hata oluştu."
+        return "Bitcoin (BTCUSDT) trend verisi alınırken bir hata oluştu.", False
+
+def _compute_indicators_cached(symbol, interval_code, klines):
+    """Runs preprocess -> indicators -> latest extraction, reusing the result for identical klines.
+
+    The key includes the last kline's close and volume as well as its open time, because the
+    live candle keeps its open time while it is still updating. Cached values are shared, so
+    callers must treat them as read-only.
+
+    Returns:
+        tuple: (df_with_indicators, latest_indicators dict)
+    """
+    last = klines[-1]
+    key = (symbol, interval_code, last[0], len(klines), last[4], last[5])
+    with _indicator_cache_lock:
+        hit = _indicator_cache.get(key)
+        if hit is not None:
+            _indicator_cache.move_to_end(key)
+            return hit
+
+    df = preprocess_klines_df(klines)
+    df_with_indicators = calculate_technical_indicators(df)
+    result = (df_with_indicators, extract_latest_indicators(df_with_indicators))
+
+    with _indicator_cache_lock:
+        _indicator_cache[key] = result
+        _indicator_cache.move_to_end(key)
+        while len(_indicator_cache) > _INDICATOR_CACHE_MAX_ENTRIES:
+            _indicator_cache.popitem(last=False)
+    return result
 
-def format_price_data_for_llm(symbol, klines_by_interval, current_ticker_details, is_historical: bool = False, historical_timestamp_ms: Optional[int] = None):
+def _process_one_interval(symbol, interval_code, interval_str, klines, target_iso, mode_label):
+    """Runs the indicator pipeline for one interval.
+
+    Returns (interval_code, interval_str, processed_data, df_with_indicators); on failure
+    processed_data holds an 'error' entry and the DataFrame is None.
+    """
+    if not klines or len(klines) < 50:
+        logging.warning("%s için %s zaman aralığında (hedef tarih: %s) yeterli veri yok (en az 50 mum gerekli), atlanıyor.", symbol, interval_str, target_iso)
+        return interval_code, interval_str, {'error': f"{interval_str} için yeterli veri yok (en az 50 mum gerekli)."}, None
+
+    try:
+        df_with_indicators, latest_indicators = _compute_indicators_cached(symbol, interval_code, klines)
+        latest_indicators = LatestIndicators.from_dict(latest_indicators)
+        price_summary = extract_price_summary_data(df_with_indicators, None) 
+        
+        processed = {
+            'price_summary': price_summary,
+            'latest_indicators': latest_indicators
+        }
+        logging.info("%s için %s verisi (%s) başarıyla işlendi.", symbol, interval_str, mode_label)
+        return interval_code, interval_str, processed, df_with_indicators
+    except Exception as e:
+        logging.error("%s için %s verisi işlenirken hata (%s): %s", symbol, interval_str, mode_label, e)
+        return interval_code, interval_str, {'error': f"{interval_str} verisi işlenirken hata: {e}"}, None
+
+async def format_price_data_for_llm(symbol, klines_by_interval, current_ticker_details, is_historical: bool = False, historical_timestamp_ms: Optional[int] = None):
     """Formats price data from multiple kline intervals for the LLM.
     Handles both live and historical data analysis."""
     
@@ -130,38 +325,37 @@ def format_price_data_for_llm(symbol, klines_by_interval, current_ticker_details
     header_price_info = {}
     timeframe_dfs = {} # Store processed DataFrames for cross-timeframe volume analysis
 
+    # For historical, each interval is cut at the last kline at or before historical_timestamp_ms.
+    # The cut indices are computed once here and reused by the header price and the per-interval slices.
+    cut_for = {}
+    if is_historical and historical_timestamp_ms:
+        cut_for = {interval_code: _compute_cut(klines, historical_timestamp_ms)
+                   for interval_code, klines in klines_by_interval.items() if klines}
+
     if is_historical:
-        logging.info(f"Geçmişe yönelik formatlama ({symbol} @ {historical_timestamp_ms})")
+        logging.info("Geçmişe yönelik formatlama (%s @ %s)", symbol, historical_timestamp_ms)
         # For historical, find the latest kline across all intervals to determine the "current price at that time"
         # This assumes klines are sorted oldest to newest, and we want the one closest to historical_timestamp_ms
         latest_close_price_historical = None
-        latest_kline_time_historical = 0
-
-        for interval_code, klines in klines_by_interval.items():
-            if klines and len(klines) > 0:
-                # Filter klines that are at or before the historical_timestamp_ms
-                # kline[0] is open_time, kline[6] is close_time
-                # We are interested in klines whose *open_time* is <= historical_timestamp_ms
-                # And we want the *last* such kline.
-                # Assuming klines are [open_time, open, high, low, close, ...]
-                # And sorted by open_time ascendingly by the caller (e.g. get_historical_klines)
-                valid_historical_klines = [k for k in klines if k[0] <= historical_timestamp_ms]
-                if valid_historical_klines:
-                    last_valid_kline = valid_historical_klines[-1] # Last kline at or before the target time
-                    if last_valid_kline[0] > latest_kline_time_historical: # If this kline is later than others found so far
-                        latest_kline_time_historical = last_valid_kline[0]
-                        try:
-                            latest_close_price_historical = float(last_valid_kline[4]) # Close price
-                        except (ValueError, TypeError):
-                            logging.warning(f"Geçmiş kline kapanış fiyatı ({last_valid_kline[4]}) float'a çevrilemedi.")
-                            latest_close_price_historical = "N/A"
+
+        # Last kline at or before the target time in each interval; the latest of those wins
+        candidates = [klines_by_interval[interval_code][cut - 1] for interval_code, cut in cut_for.items() if cut > 0]
+        if candidates:
+            last_valid_kline = max(candidates, key=_OPEN_TIME)
+            try:
+                latest_close_price_historical = float(last_valid_kline[4]) # Close price
+            except (ValueError, TypeError):
+                logging.warning(f"Geçmiş kline kapanış fiyatı ({last_valid_kline[4]}) float'a çevrilemedi.")
+                latest_close_price_historical = "N/A"
         
+        data_timestamp_iso = datetime.fromtimestamp(historical_timestamp_ms / 1000).isoformat() if historical_timestamp_ms else 'N/A'
+        mode_label = f"Geçmiş: {data_timestamp_iso}"
         header_price_info = {
             'current_price': latest_close_price_historical if latest_close_price_historical is not None else 'N/A',
             'price_change_percent': 'Geçmiş analiz için 24s değişim geçerli değil.',
-            'data_timestamp_iso': datetime.fromtimestamp(historical_timestamp_ms / 1000).isoformat() if historical_timestamp_ms else 'N/A'
+            'data_timestamp_iso': data_timestamp_iso
         }
-        logging.info(f"Geçmiş analiz için başlık fiyat bilgisi: {header_price_info}")
+        logging.info("Geçmiş analiz için başlık fiyat bilgisi: %s", header_price_info)
 
     else: # Live analysis
         header_price_info = {
@@ -169,53 +363,38 @@ def format_price_data_for_llm(symbol, klines_by_interval, current_ticker_details
             'price_change_percent': current_ticker_details.get('priceChangePercent', 'N/A'),
             'data_timestamp_iso': datetime.now().isoformat() # For live data, it's current
         }
+        data_timestamp_iso = header_price_info['data_timestamp_iso']
+        mode_label = 'Canlı'
 
+    map_get = KLINE_INTERVAL_MAP.get
+    jobs = []
     for interval_code, klines in klines_by_interval.items():
-        interval_str = KLINE_INTERVAL_MAP.get(interval_code, interval_code)
+        interval_str = map_get(interval_code, interval_code)
         
-        # For historical, filter klines up to the historical_timestamp_ms for each interval before processing
-        actual_klines_to_process = klines
-        if is_historical and historical_timestamp_ms:
-            actual_klines_to_process = [k for k in klines if k[0] <= historical_timestamp_ms]
-            # Ensure we have enough klines *after* filtering for the historical date
-            if len(actual_klines_to_process) > DEFAULT_KLINE_LIMIT:
-                 # Take the last DEFAULT_KLINE_LIMIT klines ending at or before historical_timestamp_ms
-                actual_klines_to_process = actual_klines_to_process[-DEFAULT_KLINE_LIMIT:]
-
-        if not actual_klines_to_process or len(actual_klines_to_process) < 50:
-            logging.warning(f"{symbol} için {interval_str} zaman aralığında (hedef tarih: {header_price_info.get('data_timestamp_iso', 'N/A')}) yeterli veri yok (en az 50 mum gerekli), atlanıyor.")
-            processed_data_by_interval[interval_code] = {'error': f"{interval_str} için yeterli veri yok (en az 50 mum gerekli)."}
-            continue
+        # For historical, take at most the last DEFAULT_KLINE_LIMIT klines ending at the precomputed cut
+        cut = cut_for.get(interval_code)
+        actual_klines_to_process = klines if cut is None else klines[max(0, cut - DEFAULT_KLINE_LIMIT):cut]
 
-        try:
-            df = preprocess_klines_df(actual_klines_to_process)
-            df_with_indicators = calculate_technical_indicators(df)
-            latest_indicators = extract_latest_indicators(df_with_indicators)
-            price_summary = extract_price_summary_data(df_with_indicators, None) 
-            
-            processed_data_by_interval[interval_code] = {
-                'price_summary': price_summary,
-                'latest_indicators': latest_indicators
-            }
-            
+        jobs.append(asyncio.to_thread(_process_one_interval, symbol, interval_code, interval_str,
+                                      actual_klines_to_process, data_timestamp_iso, mode_label))
+
+    # Intervals are independent pandas/numpy pipelines, so they run concurrently on the thread pool
+    for interval_code, interval_str, processed, df_with_indicators in await asyncio.gather(*jobs):
+        processed_data_by_interval[interval_code] = processed
+        if df_with_indicators is not None:
             # Store processed DataFrame for cross-timeframe volume analysis
             timeframe_dfs[interval_str] = df_with_indicators
-            
             has_any_valid_data = True
-            logging.info(f"{symbol} için {interval_str} verisi ({('Geçmiş: ' + header_price_info.get('data_timestamp_iso','')) if is_historical else 'Canlı'}) başarıyla işlendi.")
-        except Exception as e:
-            logging.error(f"{symbol} için {interval_str} verisi işlenirken hata ({('Geçmiş: ' + header_price_info.get('data_timestamp_iso','')) if is_historical else 'Canlı'}): {e}")
-            processed_data_by_interval[interval_code] = {'error': f"{interval_str} verisi işlenirken hata: {e}"}
 
     if not has_any_valid_data:
-        return f"{symbol} için analiz edilebilir veri bulunamadı ({('Geçmiş: ' + header_price_info.get('data_timestamp_iso','')) if is_historical else 'Canlı'})."
+        return f"{symbol} için analiz edilebilir veri bulunamadı ({mode_label})."
     
     # Perform cross-timeframe volume analysis if we have data for multiple timeframes
     cross_timeframe_volume_data = None
     if len(timeframe_dfs) > 1:
         try:
             cross_timeframe_volume_data = compare_volume_across_timeframes(timeframe_dfs)
-            logging.info(f"Cross-timeframe volume analysis completed: {cross_timeframe_volume_data}")
+            logging.info("Cross-timeframe volume analysis completed: %s", cross_timeframe_volume_data)
         except Exception as e:
             logging.error(f"Error performing cross-timeframe volume analysis: {e}")
     
@@ -232,38 +411,46 @@ def format_price_data_for_llm(symbol, klines_by_interval, current_ticker_details
 def build_multi_timeframe_llm_prompt_data_string(symbol, processed_data_by_interval, header_price_info, 
                                                is_historical: bool = False, cross_timeframe_volume_data: Optional[Dict] = None):
     """Builds the formatted string data for the LLM prompt from multiple timeframes."""
-    prompt_data = f"Coin Sembolü: {symbol}\n"
+    parts = [f"Coin Sembolü: {symbol}\n"]
+    write = parts.append # Bound once; this builder appends a few hundred fragments
     data_source_time_info = f"(Veri Zaman Damgası: {header_price_info.get('data_timestamp_iso')})" if is_historical else "(Canlı Veri)"
     
-    prompt_data += f"Fiyat Bilgisi {data_source_time_info}: {format_indicator_value(header_price_info.get('current_price'), 2)} USDT\n"
+    write(f"Fiyat Bilgisi {data_source_time_info}: {format_indicator_value(header_price_info.get('current_price'), 2)} USDT\n")
+
+    # Header price as a float for the per-timeframe Bollinger position, converted once
+    current_price = None
+    if header_price_info.get('current_price') != 'N/A':
+        try:
+            current_price = float(header_price_info.get('current_price', 0))
+        except (ValueError, TypeError):
+            current_price = None
     if not is_historical:
-        prompt_data += f"Son 24 Saatlik Değişim: %{format_indicator_value(header_price_info.get('price_change_percent'), 2)}\n\n"
+        write(f"Son 24 Saatlik Değişim: %{format_indicator_value(header_price_info.get('price_change_percent'), 2)}\n\n")
     else:
-        prompt_data += f"Son 24 Saatlik Değişim: {header_price_info.get('price_change_percent')}\n\n" # This will be 'Geçmiş analiz için 24s değişim geçerli değil.'
+        write(f"Son 24 Saatlik Değişim: {header_price_info.get('price_change_percent')}\n\n") # This will be 'Geçmiş analiz için 24s değişim geçerli değil.'
 
-    # Add cross-timeframe volume comparison if available
-    if cross_timeframe_volume_data and len(cross_timeframe_volume_data) > 1:
-        prompt_data += "## Farklı Zaman Dilimlerindeki Hacim Karşılaştırması:\n"
+    # Add cross-timeframe volume comparison if at least two timeframes have a usable volume trend
+    usable = {tf: data for tf, data in (cross_timeframe_volume_data or {}).items()
+              if data.get('volume_trend') not in ('insufficient_data', None)}
+    if len(usable) > 1:
+        write("## Farklı Zaman Dilimlerindeki Hacim Karşılaştırması:\n")
         
         # Create a table header for better readability
-        prompt_data += "| Zaman Dilimi | Hacim Trendi | Trend Değişim (%) | Güncel Hacim | MA(20) | Güncel/MA(%) | Normalize |\n"
-        prompt_data += "|--------------|--------------|-------------------|--------------|--------|--------------|----------|\n"
+        write("| Zaman Dilimi | Hacim Trendi | Trend Değişim (%) | Güncel Hacim | MA(20) | Güncel/MA(%) | Normalize |\n")
+        write("|--------------|--------------|-------------------|--------------|--------|--------------|----------|\n")
         
         # Sort timeframes from shortest to longest
-        sorted_timeframes = sorted(cross_timeframe_volume_data.keys(), key=lambda x: {
-            '15m': 1, '1h': 2, '4h': 3, '1d': 4
-        }.get(x, 999))
+        sorted_timeframes = [tf for tf in _TF_ORDER if tf in usable] + [tf for tf in usable if tf not in _TF_RANK]
         
         for timeframe in sorted_timeframes:
-            data = cross_timeframe_volume_data[timeframe]
+            data = usable[timeframe]
             
             # Convert volume trend to Turkish
             trend_str = {
                 "increasing": "Artıyor",
                 "decreasing": "Azalıyor", 
-                "flat": "Yatay",
-                "insufficient_data": "Veri Yetersiz"
-            }.get(data.get('volume_trend', 'N/A'), 'N/A')
+                "flat": "Yatay"
+            }.get(data['volume_trend'], 'N/A')
             
             # Format data values
             trend_pct = format_indicator_value(data.get('trend_pct_change'), 2)
@@ -273,116 +460,118 @@ def build_multi_timeframe_llm_prompt_data_string(symbol, processed_data_by_inter
             normalized = format_indicator_value(data.get('normalized_volume'), 2)
             
             # Build table row
-            prompt_data += f"| {timeframe} | {trend_str} | {trend_pct}% | {current_vol} | {ma_20} | {current_vs_ma}% | {normalized} |\n"
+            write(f"| {timeframe} | {trend_str} | {trend_pct}% | {current_vol} | {ma_20} | {current_vs_ma}% | {normalized} |\n")
         
         # Add interpretation
-        prompt_data += "\n**Zaman Dilimleri Arası Hacim Yorumu:**\n"
+        write("\n**Zaman Dilimleri Arası Hacim Yorumu:**\n")
         
-        # Check if there's consistent direction across timeframes
-        trends = [data.get('volume_trend') for data in cross_timeframe_volume_data.values() 
-                  if data.get('volume_trend') not in ['insufficient_data', None]]
+        # Single pass over the timeframes: trend direction flags and volume-vs-MA counters
+        all_increasing = all_decreasing = True
+        above_ma_count = below_ma_count = 0
+        for data in usable.values():
+            trend = data['volume_trend']
+            all_increasing &= trend == 'increasing'
+            all_decreasing &= trend == 'decreasing'
+            current_vs_ma = data.get('current_vs_ma')
+            if current_vs_ma:
+                if current_vs_ma > 100:
+                    above_ma_count += 1
+                elif current_vs_ma < 100:
+                    below_ma_count += 1
         
-        if all(trend == 'increasing' for trend in trends if trend):
-            prompt_data += "- Tüm zaman dilimlerinde hacim artış eğiliminde, bu güçlü bir alım baskısı göstergesi olabilir.\n"
-        elif all(trend == 'decreasing' for trend in trends if trend):
-            prompt_data += "- Tüm zaman dilimlerinde hacim azalış eğiliminde, bu ilginin azaldığının göstergesi olabilir.\n"
+        # Check if there's consistent direction across timeframes
+        if all_increasing:
+            write("- Tüm zaman dilimlerinde hacim artış eğiliminde, bu güçlü bir alım baskısı göstergesi olabilir.\n")
+        elif all_decreasing:
+            write("- Tüm zaman dilimlerinde hacim azalış eğiliminde, bu ilginin azaldığının göstergesi olabilir.\n")
         else:
-            prompt_data += "- Farklı zaman dilimlerinde hacim trendi değişkenlik gösteriyor.\n"
+            write("- Farklı zaman dilimlerinde hacim trendi değişkenlik gösteriyor.\n")
             
             # Check if shorter timeframes show more activity than longer ones
             shorter_tfs = sorted_timeframes[:len(sorted_timeframes)//2]
             longer_tfs = sorted_timeframes[len(sorted_timeframes)//2:]
             
-            if shorter_tfs and longer_tfs:
-                shorter_increasing = any(cross_timeframe_volume_data[tf].get('volume_trend') == 'increasing' for tf in shorter_tfs)
-                longer_flat_or_decreasing = all(cross_timeframe_volume_data[tf].get('volume_trend') in ['flat', 'decreasing'] 
-                                          for tf in longer_tfs if cross_timeframe_volume_data[tf].get('volume_trend'))
-                
-                if shorter_increasing and longer_flat_or_decreasing:
-                    prompt_data += "- Kısa vadeli zaman dilimlerinde hacim artışı, uzun vadede ise düşüş/stabilite görülüyor. Bu, yeni başlayan bir trend değişimi işareti olabilir.\n"
+            shorter_increasing = any(usable[tf]['volume_trend'] == 'increasing' for tf in shorter_tfs)
+            longer_flat_or_decreasing = all(usable[tf]['volume_trend'] in ('flat', 'decreasing') for tf in longer_tfs)
+            
+            if shorter_increasing and longer_flat_or_decreasing:
+                write("- Kısa vadeli zaman dilimlerinde hacim artışı, uzun vadede ise düşüş/stabilite görülüyor. Bu, yeni başlayan bir trend değişimi işareti olabilir.\n")
         
         # Compare current volume to moving averages across timeframes
-        above_ma_count = sum(1 for data in cross_timeframe_volume_data.values() 
-                           if data.get('current_vs_ma') and data.get('current_vs_ma') > 100)
-        below_ma_count = sum(1 for data in cross_timeframe_volume_data.values() 
-                           if data.get('current_vs_ma') and data.get('current_vs_ma') < 100)
-        
         total_valid = above_ma_count + below_ma_count
         if total_valid > 0:
             if above_ma_count > below_ma_count:
-                prompt_data += f"- Çoğu zaman diliminde ({above_ma_count}/{total_valid}) güncel hacim, ortalamanın üzerinde seyrediyor.\n"
+                write(f"- Çoğu zaman diliminde ({above_ma_count}/{total_valid}) güncel hacim, ortalamanın üzerinde seyrediyor.\n")
             elif below_ma_count > above_ma_count:
-                prompt_data += f"- Çoğu zaman diliminde ({below_ma_count}/{total_valid}) güncel hacim, ortalamanın altında seyrediyor.\n"
+                write(f"- Çoğu zaman diliminde ({below_ma_count}/{total_valid}) güncel hacim, ortalamanın altında seyrediyor.\n")
             
-        prompt_data += "\n"
+        write("\n")
     
-    prompt_data += "# Çoklu Zaman Dilimi Analizi (Geçmiş Veri ve İndikatörler):\n"
-    prompt_data += f"(Not: Analiz için her zaman diliminden {DEFAULT_KLINE_LIMIT} mum çubuğu kullanılmıştır.)\n\n"
+    write("# Çoklu Zaman Dilimi Analizi (Geçmiş Veri ve İndikatörler):\n")
+    write(f"(Not: Analiz için her zaman diliminden {DEFAULT_KLINE_LIMIT} mum çubuğu kullanılmıştır.)\n\n")
 
+    map_get = KLINE_INTERVAL_MAP.get
     for interval_code, data in processed_data_by_interval.items():
-        interval_str = KLINE_INTERVAL_MAP.get(interval_code, interval_code)
+        interval_str = map_get(interval_code, interval_code)
         if data.get('error'):
-            prompt_data += f"--- Zaman Dilimi: {interval_str} ---\n"
-            prompt_data += f"  Durum: {data['error']}\n\n"
+            write(f"--- Zaman Dilimi: {interval_str} ---\n")
+            write(f"  Durum: {data['error']}\n\n")
             continue
 
         price_summary = data['price_summary']
         latest_indicators = data['latest_indicators']
         
-        prompt_data += f"--- Zaman Dilimi: {interval_str} ---\n"
-        prompt_data += f"  Bu Periyottaki En Yüksek Fiyat (Son {DEFAULT_KLINE_LIMIT} Mum): {format_indicator_value(price_summary['highest_price_period'], 2)} USDT\n"
-        prompt_data += f"  Bu Periyottaki En Düşük Fiyat (Son {DEFAULT_KLINE_LIMIT} Mum): {format_indicator_value(price_summary['lowest_price_period'], 2)} USDT\n"
-        prompt_data += f"  Son {RECENT_SR_CANDLE_COUNT} Mumun En Yüksek Fiyatı: {format_indicator_value(price_summary['recent_high_last_N'], 2)} USDT\n"
-        prompt_data += f"  Son {RECENT_SR_CANDLE_COUNT} Mumun En Düşük Fiyatı: {format_indicator_value(price_summary['recent_low_last_N'], 2)} USDT\n"
-        prompt_data += f"  Son 5 Kapanış Fiyatı (en sondan başlayarak): {price_summary['last_n_closes'][::-1]}\n"
-        prompt_data += f"  Teknik İndikatörler (Son Değerler):\n"
-        prompt_data += f"    RSI({RSI_PERIOD}): {format_indicator_value(latest_indicators.get('rsi'))}\n"
-        rsi_divergence_status = latest_indicators.get('rsi_divergence', 'N/A') # Get divergence status
+        write(_TF_PRICE_TEMPLATE.format_map({
+            'interval_str': interval_str,
+            'highest': format_indicator_value(price_summary['highest_price_period'], 2),
+            'lowest': format_indicator_value(price_summary['lowest_price_period'], 2),
+            'recent_high': format_indicator_value(price_summary['recent_high_last_N'], 2),
+            'recent_low': format_indicator_value(price_summary['recent_low_last_N'], 2),
+            'last_closes': price_summary['last_n_closes'][::-1],
+            'rsi': format_indicator_value(latest_indicators.rsi),
+        }))
+        rsi_divergence_status = latest_indicators.rsi_divergence # Get divergence status
         if rsi_divergence_status and rsi_divergence_status not in ["None", "N/A", "Data Missing", "Not Enough Data", "RSI/Price Invalid"]:
-            prompt_data += f"    RSI Uyumsuzluk: {rsi_divergence_status}\n"
-        prompt_data += f"    SMA({SMA_SHORT_PERIOD}): {format_indicator_value(latest_indicators.get(f'sma_{SMA_SHORT_PERIOD}'), 2)} USDT\n"
-        prompt_data += f"    SMA({SMA_LONG_PERIOD}): {format_indicator_value(latest_indicators.get(f'sma_{SMA_LONG_PERIOD}'), 2)} USDT\n"
-        prompt_data += f"    EMA({EMA_SHORT_PERIOD}): {format_indicator_value(latest_indicators.get(f'ema_{EMA_SHORT_PERIOD}'), 2)} USDT\n"
-        prompt_data += f"    EMA({EMA_LONG_PERIOD}): {format_indicator_value(latest_indicators.get(f'ema_{EMA_LONG_PERIOD}'), 2)} USDT\n"
-        prompt_data += f"    ATR({ATR_PERIOD}): {format_indicator_value(latest_indicators.get(f'atr_{ATR_PERIOD}'), 4)} (Volatilite Göstergesi)\n"
-        prompt_data += f"    MACD({MACD_FAST_PERIOD},{MACD_SLOW_PERIOD},{MACD_SIGNAL_PERIOD}): {format_indicator_value(latest_indicators.get('macd'))}\n"
-        prompt_data += f"    MACD Sinyal: {format_indicator_value(latest_indicators.get('macd_signal'))}\n"
-        
-        # --- GELIŞMIŞ HACIM ANALIZI BÖLÜMÜ ---
-        prompt_data += f"    Hacim İndikatörleri:\n"
-        # Temel hacim değeri
-        prompt_data += f"      Güncel Hacim: {format_indicator_value(latest_indicators.get('volume'), 0)}\n"
+            write(f"    RSI Uyumsuzluk: {rsi_divergence_status}\n")
+        # Hareketli ortalamalar, ATR, MACD ve temel hacim değeri (GELIŞMIŞ HACIM ANALIZI BÖLÜMÜ başlangıcı)
+        write(_TF_INDICATOR_TEMPLATE.format_map({
+            'sma_short': format_indicator_value(latest_indicators.sma_short, 2),
+            'sma_long': format_indicator_value(latest_indicators.sma_long, 2),
+            'ema_short': format_indicator_value(latest_indicators.ema_short, 2),
+            'ema_long': format_indicator_value(latest_indicators.ema_long, 2),
+            'atr': format_indicator_value(latest_indicators.atr, 4),
+            'macd': format_indicator_value(latest_indicators.macd),
+            'macd_signal': format_indicator_value(latest_indicators.macd_signal),
+            'volume': format_indicator_value(latest_indicators.volume, 0),
+        }))
         
         # Hacim trendi
-        volume_trend = latest_indicators.get('volume_trend')
-        volume_trend_pct = latest_indicators.get('volume_trend_pct_change')
+        volume_trend = latest_indicators.volume_trend
+        volume_trend_pct = latest_indicators.volume_trend_pct_change
         if volume_trend and volume_trend not in ["insufficient_data", "error", "None", "N/A"]:
             trend_str = {
                 "increasing": "Artıyor",
                 "decreasing": "Azalıyor",
                 "flat": "Yatay"
             }.get(volume_trend, volume_trend)
-            prompt_data += f"      Hacim Trendi (Son 10 Mum): {trend_str} (%{format_indicator_value(volume_trend_pct, 2)} değişim)\n"
+            write(f"      Hacim Trendi (Son 10 Mum): {trend_str} (%{format_indicator_value(volume_trend_pct, 2)} değişim)\n")
         
         # Hacim hareketli ortalamaları
-        for period in [20, 50, 100]:
-            ma_key = f'volume_ma_{period}'
-            vs_ma_key = f'volume_vs_ma_{period}'
-            ma_value = latest_indicators.get(ma_key)
-            vs_ma_value = latest_indicators.get(vs_ma_key)
-            
-            if ma_value is not None and vs_ma_value is not None:
-                prompt_data += f"      Hacim MA({period}): {format_indicator_value(ma_value, 0)} "
-                prompt_data += f"(Güncel Hacim: MA'nın %{format_indicator_value(vs_ma_value, 2)} seviyesinde)\n"
+        vma = _VOLUME_MA_GETTER(latest_indicators) # (ma_20, vs_ma_20, ma_50, vs_ma_50, ma_100, vs_ma_100)
+        for row in [f"      Hacim MA({period}): {format_indicator_value(ma_value, 0)} "
+                    f"(Güncel Hacim: MA'nın %{format_indicator_value(vs_ma_value, 2)} seviyesinde)\n"
+                    for period, ma_value, vs_ma_value in zip(_VOLUME_MA_PERIODS, vma[::2], vma[1::2])
+                    if ma_value is not None and vs_ma_value is not None]:
+            write(row)
         
         # Fiyat-hacim ilişkisi
-        pv_correlation = latest_indicators.get('pv_correlation')
-        pv_interpretation = latest_indicators.get('pv_interpretation')
-        pv_strength = latest_indicators.get('pv_strength')
-        pv_is_confirming = latest_indicators.get('pv_is_confirming')
+        pv_correlation = latest_indicators.pv_correlation
+        pv_interpretation = latest_indicators.pv_interpretation
+        pv_strength = latest_indicators.pv_strength
+        pv_is_confirming = latest_indicators.pv_is_confirming
         
         if pv_interpretation and pv_interpretation not in ["insufficient_data", "error", "unknown", "None", "N/A"]:
-            prompt_data += f"      Fiyat-Hacim İlişkisi:\n"
+            write(f"      Fiyat-Hacim İlişkisi:\n")
             
             # Korelasyon yorumu
             correlation_str = f"Korelasyon: {format_indicator_value(pv_correlation, 2)}"
@@ -393,7 +582,7 @@ def build_multi_timeframe_llm_prompt_data_string(symbol, processed_data_by_inter
                     "strong": "güçlü"
                 }.get(pv_strength, pv_strength)
                 correlation_str += f" ({strength_str})"
-            prompt_data += f"        {correlation_str}\n"
+            write(f"        {correlation_str}\n")
             
             # Yorum
             interpretation_str = {
@@ -402,77 +591,74 @@ def build_multi_timeframe_llm_prompt_data_string(symbol, processed_data_by_inter
                 "inconsistent_confirmation": "Tutarsız onaylama (Hacim bazen fiyat hareketlerini destekliyor)",
                 "indecisive_market": "Kararsız piyasa (Hacim ile fiyat arasında belirgin bir ilişki yok)"
             }.get(pv_interpretation, pv_interpretation)
-            prompt_data += f"        Yorum: {interpretation_str}\n"
+            write(f"        Yorum: {interpretation_str}\n")
             
             # Yükseliş/düşüş hacmi karşılaştırması
             confirming_str = "Evet" if pv_is_confirming else "Hayır"
-            prompt_data += f"        Hacim Fiyat Yönünü Onaylıyor mu: {confirming_str}\n"
+            write(f"        Hacim Fiyat Yönünü Onaylıyor mu: {confirming_str}\n")
         
         # Hacim anomalileri
-        va_detected = latest_indicators.get('volume_anomaly_detected')
-        va_type = latest_indicators.get('volume_anomaly_type')
-        va_z_score = latest_indicators.get('volume_anomaly_z_score')
-        va_deviation_pct = latest_indicators.get('volume_anomaly_deviation_pct')
+        present_groups = latest_indicators.present_groups # Which optional sections have data
+        va_type = latest_indicators.volume_anomaly_type
         
-        if va_detected is not None and va_detected is not False and va_type not in ["none", "None", "N/A"]:
-            prompt_data += f"      Hacim Anomalisi:\n"
+        if 'volume_anomaly' in present_groups and va_type not in ["none", "None", "N/A"]:
+            va_z_score = latest_indicators.volume_anomaly_z_score
+            va_deviation_pct = latest_indicators.volume_anomaly_deviation_pct
+            write(f"      Hacim Anomalisi:\n")
             type_str = "Ani yükseliş" if va_type == "spike" else "Ani düşüş" if va_type == "drop" else va_type
-            prompt_data += f"        Tip: {type_str}\n"
+            write(f"        Tip: {type_str}\n")
             
             if va_z_score is not None:
-                prompt_data += f"        Z-skor: {format_indicator_value(va_z_score, 2)}\n"
+                write(f"        Z-skor: {format_indicator_value(va_z_score, 2)}\n")
                 
             if va_deviation_pct is not None:
                 deviation_dir = "üzerinde" if va_deviation_pct > 0 else "altında"
-                prompt_data += f"        Sapma: Normal hacmin %{format_indicator_value(abs(va_deviation_pct), 2)} {deviation_dir}\n"
+                write(f"        Sapma: Normal hacmin %{format_indicator_value(abs(va_deviation_pct), 2)} {deviation_dir}\n")
               
         # Bollinger Bantları
-        bb_lower = latest_indicators.get('bb_lower')
-        bb_middle = latest_indicators.get('bb_middle')
-        bb_upper = latest_indicators.get('bb_upper')
+        bb_lower = latest_indicators.bb_lower
+        bb_middle = latest_indicators.bb_middle
+        bb_upper = latest_indicators.bb_upper
         
         if bb_lower is not None and bb_middle is not None and bb_upper is not None:
-            prompt_data += f"    Bollinger Bantları ({BBANDS_LENGTH}, {BBANDS_STD}):\n"
-            prompt_data += f"      Alt Bant: {format_indicator_value(bb_lower, 2)}\n"
-            prompt_data += f"      Orta Bant: {format_indicator_value(bb_middle, 2)}\n"
-            prompt_data += f"      Üst Bant: {format_indicator_value(bb_upper, 2)}\n"
+            write(f"    Bollinger Bantları ({BBANDS_LENGTH}, {BBANDS_STD}):\n")
+            write(f"      Alt Bant: {format_indicator_value(bb_lower, 2)}\n")
+            write(f"      Orta Bant: {format_indicator_value(bb_middle, 2)}\n")
+            write(f"      Üst Bant: {format_indicator_value(bb_upper, 2)}\n")
             
             # Son fiyatın bantlara göre konumu
-            current_price = float(header_price_info.get('current_price', 0)) if header_price_info.get('current_price') != 'N/A' else None
             if current_price is not None:
-                if current_price > bb_upper:
-                    prompt_data += f"      Konum: Fiyat üst bandın üzerinde (aşırı alım bölgesi)\n"
-                elif current_price < bb_lower:
-                    prompt_data += f"      Konum: Fiyat alt bandın altında (aşırı satım bölgesi)\n"
+                if _rel(current_price, bb_upper) == "üzerinde":
+                    write(f"      Konum: Fiyat üst bandın üzerinde (aşırı alım bölgesi)\n")
+                elif _rel(current_price, bb_lower) == "altında":
+                    write(f"      Konum: Fiyat alt bandın altında (aşırı satım bölgesi)\n")
                 else:
-                    prompt_data += f"      Konum: Fiyat bantlar arasında\n"
+                    write(f"      Konum: Fiyat bantlar arasında\n")
 
         # Fibonacci Seviyeleri
-        fib_levels_str = latest_indicators.get('fib_levels')
-        fib_high = latest_indicators.get('fib_high')
-        fib_low = latest_indicators.get('fib_low')
+        fib_high = latest_indicators.fib_high
+        fib_low = latest_indicators.fib_low
         
-        if fib_high is not None and fib_low is not None and fib_high != fib_low:
-            prompt_data += f"    Fibonacci Düzeltme Seviyeleri (Son {FIB_LOOKBACK_PERIOD} muma dayanarak):\n"
-            prompt_data += f"      Kullanılan Yüksek: {format_indicator_value(fib_high, 2)} USDT\n"
-            prompt_data += f"      Kullanılan Düşük: {format_indicator_value(fib_low, 2)} USDT\n"
+        if 'fib' in present_groups and fib_high != fib_low:
+            fib_levels_str = latest_indicators.fib_levels
+            write(f"    Fibonacci Düzeltme Seviyeleri (Son {FIB_LOOKBACK_PERIOD} muma dayanarak):\n")
+            write(f"      Kullanılan Yüksek: {format_indicator_value(fib_high, 2)} USDT\n")
+            write(f"      Kullanılan Düşük: {format_indicator_value(fib_low, 2)} USDT\n")
             
             if fib_levels_str:
                 try:
-                    import json
-                    fib_levels = json.loads(fib_levels_str)
+                    # extract_latest_indicators stores the levels as a JSON string (read back from a
+                    # DataFrame cell); an already-decoded dict is used as is.
+                    fib_levels = fib_levels_str if isinstance(fib_levels_str, dict) else json.loads(fib_levels_str)
                     for level_name, level_value in fib_levels.items():
-                        if level_name not in ['0.0%', '100.0%']:  # Zaten Yüksek/Düşük olarak gösterdik
-                            prompt_data += f"      {level_name}: {format_indicator_value(level_value, 2)} USDT\n"
-                except:
-                    prompt_data += f"      Fibonacci Seviyelerini Okurken Hata!\n"
+                        if level_name not in _EXCLUDE_FIB:  # Zaten Yüksek/Düşük olarak gösterdik
+                            write(f"      {level_name}: {format_indicator_value(level_value, 2)} USDT\n")
+                except (ValueError, TypeError, AttributeError):
+                    write(f"      Fibonacci Seviyelerini Okurken Hata!\n")
         
         # Ekstra Destek Direnç / Pivot Seviyeleri
-        pivot_fields = ['pivot_p', 'pivot_r1', 'pivot_r2', 'pivot_r3', 'pivot_s1', 'pivot_s2', 'pivot_s3']
-        has_pivot_data = any(latest_indicators.get(field) is not None for field in pivot_fields)
-        
-        if has_pivot_data:
-            prompt_data += f"    Pivot Seviyeleri (Fibonacci tabanlı):\n"
+        if 'pivots' in present_groups:
+            write(f"    Pivot Seviyeleri (Fibonacci tabanlı):\n")
             pivot_titles = {
                 'pivot_p': 'Pivot Noktası', 
                 'pivot_r1': 'Direnç 1', 
@@ -486,54 +672,54 @@ def build_multi_timeframe_llm_prompt_data_string(symbol, processed_data_by_inter
             # Seviyeleri sırayla yan yana göster:
             # Önce P, sonra S1,S2,S3 sonra R1,R2,R3 (yükselen fiyat sırasıyla)
             for field in ['pivot_s3', 'pivot_s2', 'pivot_s1', 'pivot_p', 'pivot_r1', 'pivot_r2', 'pivot_r3']:
-                pivot_value = latest_indicators.get(field)
+                pivot_value = getattr(latest_indicators, field)
                 if pivot_value is not None:
-                    prompt_data += f"      {pivot_titles.get(field)}: {format_indicator_value(pivot_value, 2)} USDT\n"
+                    write(f"      {pivot_titles.get(field)}: {format_indicator_value(pivot_value, 2)} USDT\n")
         
-        prompt_data += "\n"  # Extra newline for readability between timeframes
+        write("\n")  # Extra newline for readability between timeframes
     
-    return prompt_data
+    return "".join(parts)
 
-async def perform_analysis(coin_symbol: str) -> str:
+async def perform_analysis(coin_symbol: str, btc_trend_summary: Optional[str] = None,
+                           binance_client: Optional[BinanceClient] = None,
+                           llm_client: Optional[GeminiClient] = None,
+                           cryptopanic_client: Optional[CryptoPanicClient] = None) -> str:
     """
     Wrapper function for analyze_coin in main.py for use by the Telegram bot.
     
     Args:
         coin_symbol: The cryptocurrency symbol to analyze (e.g., 'BTCUSDT')
+        btc_trend_summary: Bitcoin trend summary already fetched by the caller; fetched here if omitted
+        binance_client: Binance client to analyse with; the get_clients() fallback is used if omitted
+        llm_client: LLM client to analyse with; the get_clients() fallback is used if omitted
+        cryptopanic_client: Optional CryptoPanic client used together with the clients above
         
     Returns:
         str: Analysis result as text
+
+    Raises:
+        Exception: Any failure of the analysis is propagated to the caller
     """
     logging.info(f"[perform_analysis] Starting analysis for {coin_symbol}")
     
-    try:
-        # Initialize clients - all clients read their API keys from config.py
-        binance_client = BinanceClient()
-        llm_client = GeminiClient()
-        
-        # Initialize CryptoPanicClient if API key is available
-        cryptopanic_client = None
-        if CRYPTOPANIC_API_KEY:
-            cryptopanic_client = CryptoPanicClient(CRYPTOPANIC_API_KEY)
-        
-        # Get Bitcoin trend summary for context (needed by analyze_coin)
-        from main import get_bitcoin_trend_summary
+    # Prefer the caller's clients so their connection pools and kline caches are reused
+    if binance_client is None or llm_client is None:
+        binance_client, llm_client, cryptopanic_client = await get_clients()
+    
+    # Get Bitcoin trend summary for context (needed by analyze_coin).
+    # get_bitcoin_trend_summary is TTL-cached, so back-to-back analyses share one fetch.
+    if not btc_trend_summary:
         btc_trend_summary = await get_bitcoin_trend_summary(binance_client)
-        
-        # Call the analyze_coin function from main.py
-        from main import analyze_coin
-        analysis_result = await analyze_coin(
-            binance_client, 
-            llm_client, 
-            cryptopanic_client, 
-            coin_symbol, 
-            btc_trend_summary
-        )
-        
-        return analysis_result
     
-    except Exception as e:
-        error_message = f"Error in perform_analysis for {coin_symbol}: {str(e)}"
-        logging.error(error_message)
-        logging.exception("Exception details:")
-        return f"❌ Analysis failed: {error_message}"
\ No newline at end of file
+    # Call the analyze_coin function from main.py
+    analyze_coin = _resolve_analyze_coin()
+    analysis_result = await analyze_coin(
+        binance_client, 
+        llm_client, 
+        cryptopanic_client, 
+        coin_symbol, 
+        btc_trend_summary,
+        raise_on_error=True
+    )
+    
+    return analysis_result
\ No newline at end of file
@@ -1,10 +1,39 @@
 """
 Analysis modules package for different types of cryptocurrency analysis.
 Each module provides specialized analysis capabilities.
+
+The concrete analysis modules are imported on first attribute access (PEP 562),
+so importing the package only loads the ones that are actually used.
 """
+import importlib
+from typing import TYPE_CHECKING
+
+from .base_analysis import BaseAnalysisModule, AnalysisResult
+from .module_registry import registry, AnalysisModuleRegistry
+
+# Exported class name -> submodule that defines it
+_LAZY_MODULES = {
+    "CryptoAnalysisModule": ".crypto_analysis",
+    "SpotTradingAnalysisModule": ".spot_trading_analysis",
+    "FuturesTradingAnalysisModule": ".futures_trading_analysis",
+}
+
+__all__ = ["BaseAnalysisModule", "AnalysisResult", "registry", "AnalysisModuleRegistry", *_LAZY_MODULES]
+
+if TYPE_CHECKING:
+    from .crypto_analysis import CryptoAnalysisModule
+    from .spot_trading_analysis import SpotTradingAnalysisModule
+    from .futures_trading_analysis import FuturesTradingAnalysisModule
+
+
+def __getattr__(name):
+    module_name = _LAZY_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
 
-from .base_analysis import BaseAnalysisModule
-from .crypto_analysis import CryptoAnalysisModule
-from .spot_trading_analysis import SpotTradingAnalysisModule
-from .futures_trading_analysis import FuturesTradingAnalysisModule
-from .module_registry import registry, AnalysisModuleRegistry 
\ No newline at end of file
+def __dir__():
+    return sorted(__all__)
@@ -3,7 +3,36 @@ Base Analysis Module that defines the common interface for all analysis modules.
 """
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Union
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """
+    Structured result of an analysis run.
+    
+    Modules return this instead of a bare string so callers can read the parts
+    they need; the markdown text is produced only at the presentation edge.
+    
+    Attributes:
+        symbol: The analysed symbol
+        module: Name of the module that produced the result
+        narrative: The analysis text (markdown)
+        btc_trend: Bitcoin trend summary used as context, if any
+        is_error: True if the analysis failed and narrative holds the error message
+    """
+    symbol: str
+    module: str
+    narrative: str
+    btc_trend: Optional[str] = None
+    is_error: bool = False
+    
+    def to_markdown(self) -> str:
+        """Renders the result as markdown for the Telegram bot, web API and console."""
+        return self.narrative
+    
+    def __str__(self) -> str:
+        return self.to_markdown()
 
 class BaseAnalysisModule(ABC):
     """
@@ -26,7 +55,7 @@ class BaseAnalysisModule(ABC):
         self.logger = logging.getLogger(f"analysis.{name}")
     
     @abstractmethod
-    async def perform_analysis(self, symbol: str, **kwargs) -> str:
+    async def perform_analysis(self, symbol: str, **kwargs) -> Union[str, AnalysisResult]:
         """
         Perform analysis on the specified symbol.
         
@@ -35,7 +64,8 @@ class BaseAnalysisModule(ABC):
             **kwargs: Additional parameters specific to the analysis type
             
         Returns:
-            str: Analysis result as a formatted string
+            Union[str, AnalysisResult]: Structured result, or a formatted string for
+            modules that have not moved to AnalysisResult yet
         """
         pass
     
@@ -64,11 +94,10 @@ class BaseAnalysisModule(ABC):
     
     def log_info(self, message: str) -> None:
         """Helper method to log info messages with module context."""
-        self.logger.info(f"[{self.name}] {message}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("[%s] %s", self.name, message)
     
     def log_error(self, message: str, exc_info: Optional[Exception] = None) -> None:
         """Helper method to log error messages with module context."""
-        if exc_info:
-            self.logger.error(f"[{self.name}] {message}", exc_info=exc_info)
-        else:
-            self.logger.error(f"[{self.name}] {message}") 
\ No newline at end of file
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error("[%s] %s", self.name, message, exc_info=exc_info or None) 
\ No newline at end of file
@@ -1,22 +1,65 @@
 """
 Crypto Analysis Module - Provides technical and fundamental analysis of cryptocurrencies.
 """
+import asyncio
+import copy
 import logging
-from typing import Dict, Any, Optional
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 
-from clients.exchange_client import BinanceClient
-from clients.llm_client import GeminiClient
-from fundamental_analysis.cryptopanic_client import CryptoPanicClient
 from core_logic.constants import (
     TARGET_KLINE_INTERVALS, KLINE_INTERVAL_MAP, RSI_PERIOD, MACD_FAST_PERIOD, 
     MACD_SLOW_PERIOD, MACD_SIGNAL_PERIOD, SMA_SHORT_PERIOD, SMA_LONG_PERIOD,
     EMA_SHORT_PERIOD, EMA_LONG_PERIOD, ATR_PERIOD, BBANDS_LENGTH, BBANDS_STD
 )
 
-# Import actual analysis functions
-from core_logic.analysis_logic import get_bitcoin_trend_summary, perform_analysis
+from .base_analysis import AnalysisResult, BaseAnalysisModule
 
-from .base_analysis import BaseAnalysisModule
+if TYPE_CHECKING:
+    # Clients are only needed for annotations; the instances are injected by the caller
+    from clients.exchange_client import BinanceClient
+    from clients.llm_client import GeminiClient
+    from fundamental_analysis.cryptopanic_client import CryptoPanicClient
+
+# Result cache: symbols with a live candle are cached for one minute bucket,
+# symbols whose last candle has already closed (halted / illiquid) for longer
+_RESULT_TTL_ACTIVE_S = 60
+_RESULT_TTL_IDLE_S = 300
+_RESULT_CACHE_MAX_ENTRIES = 512
+_ERROR_PREFIX = "❌"
+
+# Built from import-time constants only; get_analysis_parameters returns a deep copy (the nested
+# dicts and lists are mutable) with the per-instance fields added
+_ANALYSIS_PARAMETERS = MappingProxyType({
+    "timeframes": [KLINE_INTERVAL_MAP.get(interval, interval) for interval in TARGET_KLINE_INTERVALS],
+    "indicators": {
+        "RSI": {
+            "period": RSI_PERIOD
+        },
+        "MACD": {
+            "fast_period": MACD_FAST_PERIOD,
+            "slow_period": MACD_SLOW_PERIOD,
+            "signal_period": MACD_SIGNAL_PERIOD
+        },
+        "SMA": {
+            "short_period": SMA_SHORT_PERIOD,
+            "long_period": SMA_LONG_PERIOD
+        },
+        "EMA": {
+            "short_period": EMA_SHORT_PERIOD,
+            "long_period": EMA_LONG_PERIOD
+        },
+        "ATR": {
+            "period": ATR_PERIOD
+        },
+        "Bollinger Bands": {
+            "length": BBANDS_LENGTH,
+            "std": BBANDS_STD
+        }
+    }
+})
 
 class CryptoAnalysisModule(BaseAnalysisModule):
     """
@@ -26,8 +69,8 @@ class CryptoAnalysisModule(BaseAnalysisModule):
     market trends, and fundamental data to provide a complete analysis report.
     """
     
-    def __init__(self, binance_client: BinanceClient, llm_client: GeminiClient, 
-                 cryptopanic_client: Optional[CryptoPanicClient] = None):
+    def __init__(self, binance_client: "BinanceClient", llm_client: "GeminiClient", 
+                 cryptopanic_client: Optional["CryptoPanicClient"] = None):
         """
         Initialize the crypto analysis module.
         
@@ -43,39 +86,122 @@ class CryptoAnalysisModule(BaseAnalysisModule):
         self.binance_client = binance_client
         self.llm_client = llm_client
         self.cryptopanic_client = cryptopanic_client
+        # (symbol, time bucket) -> analysis text, least recently used first
+        self._result_cache: "OrderedDict[Tuple[str, int], AnalysisResult]" = OrderedDict()
+        # symbol -> bucket length learned from the last analysis of that symbol
+        self._result_ttl: Dict[str, int] = {}
+        # symbol -> future of the analysis currently running for it (single-flight)
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    def _result_key(self, symbol: str) -> Tuple[str, int]:
+        """Returns the cache key for a resolved symbol: the symbol and its current time bucket."""
+        ttl = self._result_ttl.get(symbol, _RESULT_TTL_ACTIVE_S)
+        return symbol, int(time.time() // ttl)
     
-    async def perform_analysis(self, symbol: str, **kwargs) -> str:
+    def _store_result(self, symbol: str, result: AnalysisResult) -> None:
+        """Caches a successful result under the bucket length learned from the symbol's klines."""
+        last_close_ms = self.binance_client.latest_cached_close_time(symbol)
+        is_idle = last_close_ms is not None and last_close_ms < time.time() * 1000
+        self._result_ttl[symbol] = _RESULT_TTL_IDLE_S if is_idle else _RESULT_TTL_ACTIVE_S
+        # Keyed with the TTL just learned so the next lookup hits the same bucket
+        key = self._result_key(symbol)
+        self._result_cache[key] = result
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > _RESULT_CACHE_MAX_ENTRIES:
+            self._result_cache.popitem(last=False)
+    
+    async def perform_analysis(self, symbol: str, **kwargs) -> AnalysisResult:
         """
         Perform comprehensive analysis on a cryptocurrency.
         
+        The symbol is resolved to its Binance pair first (e.g. 'ETH' -> 'ETHUSDT'). Results
+        are cached per resolved symbol and time bucket; concurrent requests for the same
+        symbol wait for the first one instead of running the analysis twice.
+        
         Args:
             symbol: The cryptocurrency symbol to analyze (e.g., 'BTCUSDT')
-            **kwargs: Additional parameters (currently unused)
+            **kwargs: Additional parameters (btc_trend_summary: precomputed Bitcoin context)
             
         Returns:
-            str: Formatted analysis result
+            AnalysisResult: The analysis; render with to_markdown()
         """
+        # Preflight symbol check so an unknown symbol fails before any kline or LLM work
+        is_valid, valid_symbol = await self.binance_client.validate_symbol(symbol)
+        if not is_valid:
+            self.log_info(f"{symbol} is not a valid Binance symbol")
+            return AnalysisResult(symbol, self.name, f"{_ERROR_PREFIX} Analysis failed: {symbol} is not a valid Binance symbol",
+                                  btc_trend=kwargs.get('btc_trend_summary'), is_error=True)
+        symbol = valid_symbol
+        
+        key = self._result_key(symbol)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            self._result_cache.move_to_end(key)
+            self.log_info(f"Returning cached analysis for {symbol}")
+            return cached
+        
+        # The same symbol is already being analysed: wait for that run instead of starting
+        # another one. Keyed by symbol alone so requests straddling a bucket edge coalesce too.
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key[0])
+        if inflight is not None and inflight.get_loop() is loop:
+            self.log_info(f"Waiting for in-flight analysis of {symbol}")
+            # shield: a cancelled waiter must not cancel the shared run
+            return await asyncio.shield(inflight)
+        
+        future = loop.create_future()
+        self._inflight[key[0]] = future
+        try:
+            result = await self._run_analysis(symbol, **kwargs)
+            # Failed analyses are not cached so the next request retries
+            if not result.is_error:
+                self._store_result(symbol, result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved; waiters (if any) still receive it
+            raise
+        finally:
+            if self._inflight.get(key[0]) is future:
+                del self._inflight[key[0]]
+    
+    async def _run_analysis(self, symbol: str, **kwargs) -> AnalysisResult:
+        """Runs the uncached analysis for a symbol."""
+        # analysis_logic pulls in pandas_ta and the clients; load it on first analysis
+        from core_logic.analysis_logic import get_bitcoin_trend_summary, perform_analysis
+        
         self.log_info(f"Starting analysis for {symbol}")
         
+        btc_trend_summary = kwargs.get('btc_trend_summary')
         try:
             # Get Bitcoin trend for context if not provided
-            btc_trend_summary = kwargs.get('btc_trend_summary')
             if not btc_trend_summary:
                 btc_trend_summary = await get_bitcoin_trend_summary(self.binance_client)
             
             # Call the existing perform_analysis function from analysis_logic.py
-            # This reuses all the existing analysis logic
+            # This reuses all the existing analysis logic; the BTC summary is passed
+            # down so it is not fetched again
             analysis_result = await perform_analysis(
-                coin_symbol=symbol
+                coin_symbol=symbol,
+                btc_trend_summary=btc_trend_summary,
+                binance_client=self.binance_client,
+                llm_client=self.llm_client,
+                cryptopanic_client=self.cryptopanic_client
             )
             
             self.log_info(f"Completed analysis for {symbol}")
-            return analysis_result
+            return AnalysisResult(symbol, self.name, analysis_result, btc_trend=btc_trend_summary)
             
         except Exception as e:
+            # perform_analysis raises on failure, so errors are reported here rather than parsed from the text
             error_message = f"Error analyzing {symbol}: {str(e)}"
             self.log_error(error_message, exc_info=e)
-            return f"❌ Analysis failed: {error_message}"
+            return AnalysisResult(symbol, self.name, f"{_ERROR_PREFIX} Analysis failed: {error_message}",
+                                  btc_trend=btc_trend_summary, is_error=True)
     
     async def get_analysis_parameters(self) -> Dict[str, Any]:
         """
@@ -84,32 +210,7 @@ class CryptoAnalysisModule(BaseAnalysisModule):
         Returns:
             Dict[str, Any]: Dictionary of parameter names and their values
         """
-        return {
-            "timeframes": [KLINE_INTERVAL_MAP.get(interval, interval) for interval in TARGET_KLINE_INTERVALS],
-            "indicators": {
-                "RSI": {
-                    "period": RSI_PERIOD
-                },
-                "MACD": {
-                    "fast_period": MACD_FAST_PERIOD,
-                    "slow_period": MACD_SLOW_PERIOD,
-                    "signal_period": MACD_SIGNAL_PERIOD
-                },
-                "SMA": {
-                    "short_period": SMA_SHORT_PERIOD,
-                    "long_period": SMA_LONG_PERIOD
-                },
-                "EMA": {
-                    "short_period": EMA_SHORT_PERIOD,
-                    "long_period": EMA_LONG_PERIOD
-                },
-                "ATR": {
-                    "period": ATR_PERIOD
-                },
-                "Bollinger Bands": {
-                    "length": BBANDS_LENGTH,
-                    "std": BBANDS_STD
-                }
-            },
-            "fundamental_data": self.cryptopanic_client is not None
-        } 
\ No newline at end of file
+        parameters = copy.deepcopy(dict(_ANALYSIS_PARAMETERS))
+        parameters["fundamental_data"] = self.cryptopanic_client is not None
+        return parameters
+
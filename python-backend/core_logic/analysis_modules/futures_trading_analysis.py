@@ -1,25 +1,40 @@
 """
 Futures Trading Analysis Module - Analyzes cryptocurrencies for futures/leverage trading opportunities.
 """
+import asyncio
+import bisect
+import copy
 import logging
 import json
-from typing import Dict, Any, Optional, List, Tuple
-from datetime import datetime
+import math
+import string
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Any, Optional, List, Tuple
+from datetime import datetime, timedelta
+import aiohttp
 import numpy as np
-import pandas as pd
 from decimal import Decimal
 
-from clients.exchange_client import BinanceClient
-from clients.llm_client import GeminiClient
 from core_logic.constants import (
     RSI_PERIOD, MACD_FAST_PERIOD, MACD_SLOW_PERIOD, MACD_SIGNAL_PERIOD,
     SMA_SHORT_PERIOD, SMA_LONG_PERIOD, EMA_SHORT_PERIOD, EMA_LONG_PERIOD
 )
-from utils.general_utils import (
-    preprocess_klines_df, calculate_technical_indicators, extract_latest_indicators
-)
+from core_logic.http import get_shared_session
+from core_logic.retry import with_retry
+
+from .base_analysis import AnalysisResult, BaseAnalysisModule
+
+if TYPE_CHECKING:
+    # Clients are only needed for annotations; the instances are injected by the caller
+    from clients.depth_stream import DepthStreamer
+    from clients.exchange_client import BinanceClient
+    from clients.llm_client import GeminiClient
 
-from .base_analysis import BaseAnalysisModule
+try:
+    import orjson
+except ImportError:  # orjson isteğe bağlı; yoksa standart json kullanılır
+    orjson = None
 
 # LLM prompt template for futures trading analysis
 FUTURES_TRADING_PROMPT = """
@@ -192,6 +207,208 @@ Bu bölümde, mevcut piyasa koşulları ve teknik göstergelere dayalı olarak,
 Lütfen analizini yukarıdaki tüm başlıkları kapsayacak şekilde, net, gerekçelendirilmiş ve uygulanabilir finansal terimler kullanarak hazırla. Özellikle risk yönetimi unsurlarını ve yeni eklenen veri noktalarını (`vwap`, `fear_and_greed_index`, `recent_liquidations`, `order_book_summary`) her adımda vurgula.
 """
 
+# Instructions for the dynamic signal count (section 12 of the prompt)
+_SIGNAL_TEMPLATE = """
+**Not:** Piyasa koşullarına göre 1-3 arası sinyal oluştur. Eğer potansiyel bir işlem fırsatı görmüyorsan, sadece Sinyal 1'i doldur ve bu bir potansiyel senaryo olarak belirt. Her sinyal için aşağıdaki şablonu takip et:
+
+Aşağıdaki kriterlere göre sinyal sayısına karar ver:
+1. Birden fazla sinyal oluşturacaksan her biri farklı giriş noktaları veya farklı senaryolar için olsun
+2. "Güçlü" olarak işaretlenecek sinyaller için trend, teknik göstergeler ve destek/direnç seviyeleri tam bir uyum içinde olmalı
+3. Her sinyal için Risk/Ödül oranının en az 1:1.5 olmasına dikkat et
+4. Piyasa volatilitesi yüksekse, daha az sinyal oluştur ve risk/ödül oranını daha yüksek belirle
+5. Eğer hiçbir açık fırsat yoksa, Sinyal 1'i gelecekteki potansiyel bir senaryo olarak işaretle ve "Sinyal Gücü: Zayıf" olarak belirt
+"""
+
+_RISK_WARNING = (
+    "⚠️ **RİSK UYARISI**: Vadeli işlemler ve kaldıraçlı alım satım önemli ölçüde risk içerir. "
+    "Sağlanan analiz yalnızca bilgilendirme amaçlıdır ve mali tavsiye olarak değerlendirilmemelidir. "
+    "Her zaman uygun risk yönetimi uygulayın."
+)
+
+class _KeepMissingFields(dict):
+    """format_map mapping that leaves unknown fields in place for a later format call."""
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+# The indicator periods and the signal instructions are import-time constants, so they are
+# filled in once here and each analysis only formats the per-symbol fields
+_FUTURES_PROMPT_TEMPLATE = FUTURES_TRADING_PROMPT.format_map(_KeepMissingFields(
+    rsi_period=RSI_PERIOD,
+    sma_short=SMA_SHORT_PERIOD,
+    sma_long=SMA_LONG_PERIOD,
+    signal_template=_SIGNAL_TEMPLATE
+))
+
+# Fields perform_analysis fills per symbol. The template's remaining fields are parsed once and
+# checked against this set, so a renamed or missing placeholder fails at import, not mid-analysis
+_FUTURES_PROMPT_FIELDS = frozenset({
+    'symbol', 'technical_data', 'current_price', 'price_change_percent', 'volume_24h',
+    'open_interest', 'funding_rate', 'rsi_value', 'macd_value', 'macd_signal',
+    'sma_short_value', 'sma_long_value', 'vwap_value', 'fear_and_greed_value'
+})
+_template_fields = frozenset(
+    field for _, field, _, _ in string.Formatter().parse(_FUTURES_PROMPT_TEMPLATE) if field
+)
+if _template_fields != _FUTURES_PROMPT_FIELDS:
+    raise ValueError(
+        "FUTURES_TRADING_PROMPT placeholders do not match the fields perform_analysis provides: "
+        f"unfilled={sorted(_template_fields - _FUTURES_PROMPT_FIELDS)}, "
+        f"unused={sorted(_FUTURES_PROMPT_FIELDS - _template_fields)}"
+    )
+del _template_fields
+
+def _json_default(obj):
+    """Serializes the values json/orjson cannot handle natively (numpy scalars/arrays, Decimal)."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps_technical_data(data: Dict[str, Any]) -> str:
+    """Dumps the technical data block of the prompt as indented JSON, numpy values included."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, default=_json_default, indent=2, ensure_ascii=False)
+
+def _to_float(value: Any) -> float:
+    """Converts an API/indicator value to float; missing values ('N/A', '', None) become NaN."""
+    if value is None or value == 'N/A' or value == '':
+        return math.nan
+    return float(value)
+
+def _fmt_num(value: float) -> str:
+    """Formats a numeric prompt field, rendering NaN as 'N/A'."""
+    return "N/A" if math.isnan(value) else f"{value}"
+
+# Quote assets a symbol may already end with; anything else gets USDT appended
+_QUOTE_SUFFIXES = ('USDT', 'BTC', 'ETH', 'BUSD')
+
+# Candles fetched per analysis: the slowest indicator's warm-up plus a margin, instead of a flat 300
+_KLINE_LIMIT = max(SMA_LONG_PERIOD, EMA_LONG_PERIOD, MACD_SLOW_PERIOD + MACD_SIGNAL_PERIOD, RSI_PERIOD * 3) + 50
+
+# Default number of symbols perform_analysis_batch analyzes at the same time
+_BATCH_MAX_CONCURRENT = 10
+
+# Depth snapshots are reused for a few seconds so modules analyzing the same symbol share one fetch
+_ORDER_BOOK_CACHE_TTL_S = 3.0
+
+def _nlargest_indices(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Returns the indices of the n largest values, largest first, in O(N).
+    
+    Equivalent to a stable descending sort cut to n (earlier index wins ties), but only the
+    candidates at or above the n-th largest value are sorted.
+    
+    Args:
+        values: 1-D array to rank
+        n: Number of indices to return
+        
+    Returns:
+        np.ndarray: Up to n indices into values
+    """
+    if values.size > n > 0:
+        threshold = np.partition(values, values.size - n)[values.size - n]
+        candidates = np.flatnonzero(values >= threshold)
+    else:
+        candidates = np.arange(values.size)
+    return candidates[np.argsort(-values[candidates], kind='stable')[:n]]
+
+# Timestamp format used throughout the futures report; per-row loops use the equivalent
+# isoformat(sep=' ', timespec='seconds'), which skips strftime's format parsing
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+# Fallback payloads for failed fetches; callers copy them and fill in the timestamp where needed
+_PLACEHOLDER_LIQUIDATION = MappingProxyType({
+    "side": "long",
+    "price": 0,
+    "qty": 0,
+    "time": None,
+    "value_usdt": 0,
+    "placeholder": True
+})
+_FNG_UNAVAILABLE = MappingProxyType({
+    "value": "N/A",
+    "classification": "N/A",
+    "timestamp": "N/A"
+})
+
+# Source of the illustrative sizes in the estimated-liquidation fallback
+_PLACEHOLDER_RNG = np.random.default_rng()
+
+# Order book levels above this quantity count as walls
+_ORDER_BOOK_WALL_MIN_QTY = 10
+
+def _order_book_walls(levels: np.ndarray, fallback_note: str, top_n: int = 3) -> List[Dict[str, Any]]:
+    """
+    Picks the largest order book walls on one side of the book.
+    
+    Args:
+        levels: (N, 2) array of [price, quantity] rows, best level first
+        fallback_note: Note attached to the best level when no row passes the wall threshold
+        top_n: Maximum number of walls to return
+        
+    Returns:
+        List[Dict[str, Any]]: Up to top_n walls ordered by USDT value, largest first
+    """
+    if not len(levels):
+        return []
+    prices = levels[:, 0]
+    qtys = levels[:, 1]
+    values = prices * qtys
+    
+    wall_idx = np.flatnonzero(qtys > _ORDER_BOOK_WALL_MIN_QTY)
+    if not wall_idx.size:
+        return [{
+            "price": float(prices[0]),
+            "quantity": float(qtys[0]),
+            "value_usdt": float(values[0]),
+            "note": fallback_note
+        }]
+    # Book order is kept among equal values
+    top = wall_idx[_nlargest_indices(values[wall_idx], top_n)]
+    return [
+        {"price": float(prices[k]), "quantity": float(qtys[k]), "value_usdt": float(values[k])}
+        for k in top
+    ]
+
+# Built from import-time constants only; get_analysis_parameters hands out deep copies since the
+# nested dicts and lists are mutable
+_ANALYSIS_PARAMETERS = MappingProxyType({
+    "supported_timeframes": ["15m", "1h", "4h", "1d"],
+    "default_timeframe": "4h",
+    "max_recommended_leverage": 20,
+    "indicators": {
+        "RSI": {
+            "period": RSI_PERIOD
+        },
+        "MACD": {
+            "fast_period": MACD_FAST_PERIOD,
+            "slow_period": MACD_SLOW_PERIOD,
+            "signal_period": MACD_SIGNAL_PERIOD
+        },
+        "SMA": {
+            "short_period": SMA_SHORT_PERIOD,
+            "long_period": SMA_LONG_PERIOD
+        },
+        "EMA": {
+            "short_period": EMA_SHORT_PERIOD,
+            "long_period": EMA_LONG_PERIOD
+        },
+    },
+    "volatility_metrics": ["daily_volatility", "atr_14", "bollinger_width", "price_range_24h"]
+})
+
+# Fear & Greed is market-wide and updates about once a day; one fetch per hour serves every symbol
+_FNG_CACHE_TTL_S = 3600
+_FNG_API_URL = "https://api.alternative.me/fng/?limit=1"
+# Upper bounds (inclusive) of each Fear & Greed band; bisect_left keeps a value on a cut in the lower band
+_FNG_CUTS = (25, 40, 60, 75)
+_FNG_LABELS = ("Aşırı Korku", "Korku", "Nötr", "Açgözlülük", "Aşırı Açgözlülük")
+
 class FuturesTradingAnalysisModule(BaseAnalysisModule):
     """
     Module for futures trading analysis of cryptocurrencies.
@@ -200,13 +417,21 @@ class FuturesTradingAnalysisModule(BaseAnalysisModule):
     and futures market-specific factors for cryptocurrency trading.
     """
     
-    def __init__(self, binance_client: BinanceClient, llm_client: GeminiClient):
+    # (value, expiry on time.monotonic()) shared by all instances; the lock is rebuilt per event loop
+    _fng_cache: Optional[Tuple[Dict[str, Any], float]] = None
+    _fng_lock: Optional[asyncio.Lock] = None
+    _fng_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def __init__(self, binance_client: "BinanceClient", llm_client: "GeminiClient",
+                 depth_streamer: Optional["DepthStreamer"] = None):
         """
         Initialize the futures trading analysis module.
         
         Args:
             binance_client: Client for accessing Binance exchange data
             llm_client: Client for accessing language model services
+            depth_streamer: Optional WebSocket order book feed; worth it in long-running
+                processes, otherwise order books are fetched over REST
         """
         super().__init__(
             name="futures_trading_analysis",
@@ -214,8 +439,15 @@ class FuturesTradingAnalysisModule(BaseAnalysisModule):
         )
         self.binance_client = binance_client
         self.llm_client = llm_client
+        self.depth_streamer = depth_streamer
+        # Order book summaries per symbol as (summary, expiry); per-symbol locks coalesce concurrent misses
+        self._order_book_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._order_book_locks: Dict[str, asyncio.Lock] = {}
+        self._order_book_locks_loop: Optional[asyncio.AbstractEventLoop] = None
+        # (endpoint, symbol) -> future of the Binance request currently in flight
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
     
-    async def perform_analysis(self, symbol: str, **kwargs) -> str:
+    async def perform_analysis(self, symbol: str, **kwargs) -> AnalysisResult:
         """
         Perform futures trading analysis on a cryptocurrency.
         
@@ -224,92 +456,78 @@ class FuturesTradingAnalysisModule(BaseAnalysisModule):
             **kwargs: Additional parameters (timeframe, etc.)
             
         Returns:
-            str: Formatted futures trading analysis result
+            AnalysisResult: Formatted futures trading analysis; is_error is set on failure
         """
         self.log_info(f"Starting futures trading analysis for {symbol}")
         
         try:
             # Standardize symbol format
-            if not any(symbol.upper().endswith(suffix) for suffix in ['USDT', 'BTC', 'ETH', 'BUSD']):
-                symbol = f"{symbol.upper()}USDT"
-            else:
-                symbol = symbol.upper()
+            upper_symbol = symbol.upper()
+            symbol = upper_symbol if upper_symbol.endswith(_QUOTE_SUFFIXES) else f"{upper_symbol}USDT"
             
             # Get primary timeframe or default to 4h
             timeframe = kwargs.get('timeframe', '4h')
             
-            # Get current symbol data from spot market
-            try:
-                current_ticker_data = await self.binance_client.client.get_ticker(symbol=symbol)
-                if not current_ticker_data:
-                    # Try alternative symbol forms (for flexibility)
-                    base_symbol = symbol.rstrip("USDT")
-                    alternative_symbols = [
-                        f"{base_symbol}USDT", 
-                        f"{base_symbol}BTC",
-                        f"{base_symbol}ETH",
-                        f"{base_symbol}BUSD"
-                    ]
-                    
-                    for alt_symbol in alternative_symbols:
-                        if alt_symbol != symbol:
-                            self.log_info(f"Trying alternative symbol: {alt_symbol}")
-                            current_ticker_data = await self.binance_client.client.get_ticker(symbol=alt_symbol)
-                            if current_ticker_data:
-                                symbol = alt_symbol  # Update the symbol to the working one
-                                self.log_info(f"Successfully found data using alternative symbol: {symbol}")
-                                break
-                
-                if not current_ticker_data:
-                    return f"❌ Binance borsasında {symbol} sembolü bulunamadı veya veri alınamadı.\n\nÖneriler:\n1. Sembolün tam adını kontrol edin (örn: 'BTC' yerine 'BTCUSDT')\n2. Bu token Binance'de listelenmemiş olabilir\n3. Alternatif pariteler deneyin (örn: BUSD, BTC veya ETH ile çiftler)"
-            except Exception as e:
-                self.log_error(f"Error retrieving ticker data for {symbol}: {e}")
-                return f"❌ {symbol} için veri alırken bir hata oluştu: {str(e)}\n\nÖneriler:\n1. Sembolün Binance'de listelendiğinden emin olun\n2. Doğru formatta yazdığınızı kontrol edin (örn: 'BTC' yerine 'BTCUSDT')"
+            # Fear & Greed does not depend on the symbol, so it is already in flight while the
+            # symbol listing (a cold exchange-info fetch on first use) is consulted
+            fear_and_greed_task = asyncio.ensure_future(self._get_fear_and_greed_index())
             
-            # Get futures specific data
-            futures_specific_data = await self._get_futures_data(symbol) # Enhanced for liquidations
+            # Pick the listed form of the symbol locally instead of probing the ticker endpoint
+            symbol = await self._resolve_symbol(symbol)
             
-            # Get klines data for the specified timeframe
-            klines = await self.binance_client.get_klines(symbol, timeframe, limit=300) 
+            # Ticker, futures data, klines and order book are independent requests,
+            # so they are fetched concurrently
+            current_ticker_data, market_data, fear_and_greed_data = await asyncio.gather(
+                self._single_flight(('ticker', symbol), lambda: self.binance_client.client.get_ticker(symbol=symbol)),
+                self._fetch_market_data(symbol, timeframe),
+                fear_and_greed_task,
+                return_exceptions=True
+            )
+            if isinstance(market_data, BaseException):
+                raise market_data
+            if isinstance(fear_and_greed_data, BaseException):
+                raise fear_and_greed_data
+            
+            # Get current symbol data from spot market
+            if isinstance(current_ticker_data, BaseException):
+                self.log_error(f"Error retrieving ticker data for {symbol}: {current_ticker_data}")
+                return self._error_result(symbol, f"❌ {symbol} için veri alırken bir hata oluştu: {str(current_ticker_data)}\n\nÖneriler:\n1. Sembolün Binance'de listelendiğinden emin olun\n2. Doğru formatta yazdığınızı kontrol edin (örn: 'BTC' yerine 'BTCUSDT')")
+            if not current_ticker_data:
+                return self._error_result(symbol, f"❌ Binance borsasında {symbol} sembolü bulunamadı veya veri alınamadı.\n\nÖneriler:\n1. Sembolün tam adını kontrol edin (örn: 'BTC' yerine 'BTCUSDT')\n2. Bu token Binance'de listelenmemiş olabilir\n3. Alternatif pariteler deneyin (örn: BUSD, BTC veya ETH ile çiftler)")
+            
+            futures_specific_data, klines, order_book_summary = market_data
             if not klines or len(klines) < 50:
-                return f"❌ {symbol} için {timeframe} zaman diliminde yeterli geçmiş veri bulunamadı. Bu sembol Binance'de yakın zamanda listelenmiş olabilir veya çok düşük işlem hacmine sahip olabilir."
+                return self._error_result(symbol, f"❌ {symbol} için {timeframe} zaman diliminde yeterli geçmiş veri bulunamadı. Bu sembol Binance'de yakın zamanda listelenmiş olabilir veya çok düşük işlem hacmine sahip olabilir.")
+            
+            # pandas/pandas_ta come in with general_utils; imported here so loading the module stays cheap
+            from utils.general_utils import (
+                preprocess_klines_df, calculate_technical_indicators, extract_latest_indicators
+            )
             
             # Process klines data
             df = preprocess_klines_df(klines)
             
-            # Calculate VWAP manually if not included in the indicators
-            vwap_df = self._calculate_vwap(df)
-            
-            # Calculate other technical indicators
-            df_with_indicators = calculate_technical_indicators(df)
-            
-            # Merge VWAP with other indicators
-            df_with_indicators['vwap'] = vwap_df['vwap']
+            # Calculate technical indicators; VWAP is computed in the same pass
+            df_with_indicators = calculate_technical_indicators(df, vwap=True)
             
             latest_indicators = extract_latest_indicators(df_with_indicators)
             
             # Get volatility data
             volatility_data = self._calculate_volatility(df)
-
-            # Get Fear & Greed Index - use placeholder as it requires external API
-            fear_and_greed_data = await self._get_fear_and_greed_index()
-
-            # Get Order Book Summary
-            order_book_summary = await self._get_order_book_summary(symbol)
             
             # Prepare data for LLM prompt
-            current_price = float(current_ticker_data.get('lastPrice', 'N/A'))
-            price_change_percent = float(current_ticker_data.get('priceChangePercent', 'N/A'))
-            volume_24h = float(current_ticker_data.get('volume', 'N/A'))
+            current_price = _to_float(current_ticker_data.get('lastPrice'))
+            price_change_percent = _to_float(current_ticker_data.get('priceChangePercent'))
+            volume_24h = _to_float(current_ticker_data.get('volume'))
             
-            vwap_value = latest_indicators.get('vwap', 'N/A')
-            if vwap_value == 'N/A' and 'vwap' in vwap_df:
-                vwap_value = float(vwap_df['vwap'].iloc[-1])
+            vwap_value = _to_float(latest_indicators.get('vwap'))
+            if math.isnan(vwap_value) and 'vwap' in df_with_indicators:
+                vwap_value = _to_float(df_with_indicators['vwap'].iloc[-1])
 
             technical_data_dict = {
                 "price_data": {
-                    "high_24h": float(current_ticker_data.get('highPrice', 'N/A')),
-                    "low_24h": float(current_ticker_data.get('lowPrice', 'N/A')),
+                    "high_24h": _to_float(current_ticker_data.get('highPrice')),
+                    "low_24h": _to_float(current_ticker_data.get('lowPrice')),
                     "volume_24h": volume_24h,
                 },
                 "indicators": latest_indicators,
@@ -320,128 +538,179 @@ class FuturesTradingAnalysisModule(BaseAnalysisModule):
                 "vwap": vwap_value
             }
             
-            technical_data_dict = self._convert_numpy_types(technical_data_dict)
-            technical_data = json.dumps(technical_data_dict, indent=2, ensure_ascii=False)
+            technical_data = _dumps_technical_data(technical_data_dict)
             
-            # Format the Fear & Greed value for prompt
-            fear_and_greed_value = "N/A"
-            if fear_and_greed_data.get('value') != 'N/A':
-                fear_and_greed_value = f"{fear_and_greed_data.get('value')} - {fear_and_greed_data.get('classification')}"
+            # Values shown in both the prompt and the report header are formatted once
+            current_price_str = _fmt_num(current_price)
+            price_change_str = _fmt_num(price_change_percent)
+            vwap_str = _fmt_num(vwap_value)
+            fng_value = fear_and_greed_data.get('value', 'N/A')
+            fng_classification = fear_and_greed_data.get('classification')
+            has_fng = fng_value != 'N/A'
+            fear_and_greed_value = f"{fng_value} - {fng_classification}" if has_fng else "N/A"
             
-            # Signal template for dynamic signal count
-            signal_template = """
-**Not:** Piyasa koşullarına göre 1-3 arası sinyal oluştur. Eğer potansiyel bir işlem fırsatı görmüyorsan, sadece Sinyal 1'i doldur ve bu bir potansiyel senaryo olarak belirt. Her sinyal için aşağıdaki şablonu takip et:
-
-Aşağıdaki kriterlere göre sinyal sayısına karar ver:
-1. Birden fazla sinyal oluşturacaksan her biri farklı giriş noktaları veya farklı senaryolar için olsun
-2. "Güçlü" olarak işaretlenecek sinyaller için trend, teknik göstergeler ve destek/direnç seviyeleri tam bir uyum içinde olmalı
-3. Her sinyal için Risk/Ödül oranının en az 1:1.5 olmasına dikkat et
-4. Piyasa volatilitesi yüksekse, daha az sinyal oluştur ve risk/ödül oranını daha yüksek belirle
-5. Eğer hiçbir açık fırsat yoksa, Sinyal 1'i gelecekteki potansiyel bir senaryo olarak işaretle ve "Sinyal Gücü: Zayıf" olarak belirt
-"""
-            
-            prompt = FUTURES_TRADING_PROMPT.format(
-                symbol=symbol,
-                technical_data=technical_data,
-                current_price=current_price,
-                price_change_percent=price_change_percent,
-                volume_24h=volume_24h,
-                open_interest=futures_specific_data.get('openInterest', 'N/A'),
-                funding_rate=futures_specific_data.get('fundingRate', 'N/A'),
-                rsi_period=RSI_PERIOD,
-                rsi_value=latest_indicators.get('rsi', 'N/A'),
-                macd_value=latest_indicators.get('macd', 'N/A'),
-                macd_signal=latest_indicators.get('macd_signal', 'N/A'),
-                sma_short=SMA_SHORT_PERIOD,
-                sma_short_value=latest_indicators.get(f'sma_{SMA_SHORT_PERIOD}', 'N/A'),
-                sma_long=SMA_LONG_PERIOD,
-                sma_long_value=latest_indicators.get(f'sma_{SMA_LONG_PERIOD}', 'N/A'),
-                vwap_value=vwap_value,
-                fear_and_greed_value=fear_and_greed_value,
-                signal_template=signal_template
-            )
+            prompt = _FUTURES_PROMPT_TEMPLATE.format_map({
+                'symbol': symbol,
+                'technical_data': technical_data,
+                'current_price': current_price_str,
+                'price_change_percent': price_change_str,
+                'volume_24h': _fmt_num(volume_24h),
+                'open_interest': _fmt_num(futures_specific_data['openInterest']),
+                'funding_rate': _fmt_num(futures_specific_data['fundingRate']),
+                'rsi_value': _fmt_num(_to_float(latest_indicators.get('rsi'))),
+                'macd_value': _fmt_num(_to_float(latest_indicators.get('macd'))),
+                'macd_signal': _fmt_num(_to_float(latest_indicators.get('macd_signal'))),
+                'sma_short_value': _fmt_num(_to_float(latest_indicators.get(f'sma_{SMA_SHORT_PERIOD}'))),
+                'sma_long_value': _fmt_num(_to_float(latest_indicators.get(f'sma_{SMA_LONG_PERIOD}'))),
+                'vwap_value': vwap_str,
+                'fear_and_greed_value': fear_and_greed_value
+            })
             
-            response = self.llm_client.generate_text(prompt)
+            response = await self.llm_client.agenerate_text(prompt)
             
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            risk_warning = (
-                "⚠️ **RİSK UYARISI**: Vadeli işlemler ve kaldıraçlı alım satım önemli ölçüde risk içerir. "
-                "Sağlanan analiz yalnızca bilgilendirme amaçlıdır ve mali tavsiye olarak değerlendirilmemelidir. "
-                "Her zaman uygun risk yönetimi uygulayın."
-            )
+            timestamp = datetime.now().strftime(_TS_FMT)
             
             final_analysis = f"# {symbol} VADELİ İŞLEMLER ANALİZİ\n"
             final_analysis += f"**Analiz Zamanı**: {timestamp}\n"
             final_analysis += f"**Zaman Dilimi**: {timeframe}\n\n"
-            final_analysis += f"**Anlık Fiyat**: {current_price} USDT ({price_change_percent}% 24s)\n"
-            if vwap_value != 'N/A':
-                final_analysis += f"**VWAP**: {vwap_value} USDT\n"
-            if fear_and_greed_data.get('value') != 'N/A':
-                 final_analysis += f"**Korku & Açgözlülük Endeksi**: {fear_and_greed_data.get('value')} ({fear_and_greed_data.get('classification')})\n"
+            final_analysis += f"**Anlık Fiyat**: {current_price_str} USDT ({price_change_str}% 24s)\n"
+            if not math.isnan(vwap_value):
+                final_analysis += f"**VWAP**: {vwap_str} USDT\n"
+            if has_fng:
+                final_analysis += f"**Korku & Açgözlülük Endeksi**: {fng_value} ({fng_classification})\n"
             final_analysis += "\n"
-            final_analysis += f"{risk_warning}\n\n"
+            final_analysis += f"{_RISK_WARNING}\n\n"
             final_analysis += response
             
             self.log_info(f"Completed futures trading analysis for {symbol}")
-            return final_analysis
+            return AnalysisResult(symbol, self.name, final_analysis)
             
         except Exception as e:
             error_message = f"Error analyzing {symbol} for futures trading: {str(e)}"
             self.log_error(error_message, exc_info=e)
-            return f"❌ Vadeli işlemler analizi başarısız oldu: {error_message}"
+            return self._error_result(symbol, f"❌ Vadeli işlemler analizi başarısız oldu: {error_message}")
+    
+    def _error_result(self, symbol: str, message: str) -> AnalysisResult:
+        """Wraps a user-facing failure message in an error result."""
+        return AnalysisResult(symbol, self.name, message, is_error=True)
     
-    def _calculate_vwap(self, df: pd.DataFrame) -> pd.DataFrame:
+    async def perform_analysis_batch(self, symbols: List[str], max_concurrent: int = _BATCH_MAX_CONCURRENT,
+                                     **kwargs) -> Dict[str, AnalysisResult]:
         """
-        Calculate VWAP (Volume Weighted Average Price) from OHLC data.
+        Run futures analysis for several symbols concurrently.
+        
+        All analyses share this module's clients, the cached Fear & Greed index and the
+        cached symbol listing; a semaphore bounds how many run at the same time.
         
         Args:
-            df: DataFrame with OHLC price data including 'volume' column
+            symbols: Symbols to analyze (e.g., ['BTCUSDT', 'ETH'])
+            max_concurrent: Maximum number of analyses in flight at once
+            **kwargs: Passed through to perform_analysis (timeframe, etc.)
             
         Returns:
-            DataFrame with VWAP added
+            Dict[str, AnalysisResult]: Analysis result per input symbol, in input order
         """
-        try:
-            if 'volume' not in df.columns:
-                self.log_error("Volume data not found in DataFrame, cannot calculate VWAP")
-                df['vwap'] = np.nan
-                return df
-            
-            # Create a copy to avoid modifying the original
-            vwap_df = df.copy()
-            
-            # Calculate typical price
-            vwap_df['typical_price'] = (vwap_df['high'] + vwap_df['low'] + vwap_df['close']) / 3
-            
-            # Calculate VWAP components
-            vwap_df['tp_volume'] = vwap_df['typical_price'] * vwap_df['volume']
-            
-            # Calculate cumulative values
-            vwap_df['cumulative_tp_volume'] = vwap_df['tp_volume'].cumsum()
-            vwap_df['cumulative_volume'] = vwap_df['volume'].cumsum()
-            
-            # Calculate VWAP
-            vwap_df['vwap'] = vwap_df['cumulative_tp_volume'] / vwap_df['cumulative_volume']
-            
-            # Drop intermediate columns to keep the DataFrame clean
-            vwap_df = vwap_df[['vwap']]
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        
+        async def _bounded(symbol: str) -> AnalysisResult:
+            async with semaphore:
+                return await self.perform_analysis(symbol, **kwargs)
+        
+        # perform_analysis reports its own failures as error results, so no exception handling is needed here
+        results = await asyncio.gather(*(_bounded(symbol) for symbol in symbols))
+        return dict(zip(symbols, results))
+    
+    async def _single_flight(self, key: Tuple[str, str], api_call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a Binance request, or join the identical one already in flight.
+        
+        Concurrent analyses of the same symbol (batch runs, several modules) would otherwise
+        each fire the same request; the first caller makes it and later callers share its result.
+        
+        Args:
+            key: (endpoint, symbol) identifying the request
+            api_call: Zero-argument callable returning the request awaitable
             
-            self.log_info("VWAP calculated successfully")
-            return vwap_df
+        Returns:
+            Any: Result of the request; its exception is raised to every caller
+        """
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is loop:
+            # shield: a cancelled waiter must not cancel the shared request
+            return await asyncio.shield(inflight)
+        
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await api_call()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved; waiters (if any) still receive it
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+    
+    async def _resolve_symbol(self, symbol: str) -> str:
+        """
+        Return the first listed form of a symbol: as given, then its USDT/BTC/ETH/BUSD pairs.
+        
+        Uses the client's cached exchange info, so no extra request is made per analysis.
+        The symbol is returned unchanged if nothing matches or the listing is unavailable.
+        
+        Args:
+            symbol: Normalized symbol (e.g., 'BTCUSDT')
             
+        Returns:
+            str: Symbol to request data for
+        """
+        try:
+            listed = await self.binance_client.get_symbol_set()
         except Exception as e:
-            self.log_error(f"Error calculating VWAP: {e}")
-            df_result = pd.DataFrame()
-            df_result['vwap'] = np.nan
-            return df_result
+            self.log_error(f"Could not load the Binance symbol list: {e}")
+            return symbol
+        if not listed or symbol in listed:
+            return symbol
+        
+        base_symbol = next((symbol[:-len(q)] for q in _QUOTE_SUFFIXES if symbol.endswith(q)), symbol)
+        for quote in _QUOTE_SUFFIXES:
+            alt_symbol = f"{base_symbol}{quote}"
+            if alt_symbol in listed:
+                self.log_info(f"Using alternative symbol {alt_symbol} for {symbol}")
+                return alt_symbol
+        return symbol
+    
+    async def _fetch_market_data(self, symbol: str, timeframe: str) -> Tuple[Dict[str, Any], Optional[List], Dict[str, Any]]:
+        """
+        Fetch the symbol-specific inputs of the analysis concurrently.
+        
+        Args:
+            symbol: The cryptocurrency symbol (e.g., 'BTCUSDT')
+            timeframe: Kline interval for the analysis
+            
+        Returns:
+            Tuple: (futures data incl. liquidations, klines, order book summary)
+        """
+        return await asyncio.gather(
+            self._get_futures_data(symbol),
+            self.binance_client.get_klines(symbol, timeframe, limit=_KLINE_LIMIT),
+            self._get_order_book_summary(symbol)
+        )
     
     async def _get_futures_data(self, symbol: str) -> Dict[str, Any]:
         """
         Get futures-specific data for a symbol, including enhanced liquidation info.
         """
         futures_data = {
-            "openInterest": "N/A",
-            "fundingRate": "N/A",
-            "longShortRatio": "N/A",
+            "openInterest": math.nan,
+            "fundingRate": math.nan,
+            "longShortRatio": math.nan,
             "recent_liquidations": {
                 "last_hour": [],
                 "last_day": [],
@@ -450,39 +719,54 @@ Aşağıdaki kriterlere göre sinyal sayısına karar ver:
         }
         
         try:
-            # Funding rate
-            funding_rate_data = await self._safe_futures_api_call(
-                lambda: self.binance_client.client.futures_funding_rate(symbol=symbol, limit=1)
+            # Funding rate, open interest, long/short ratio and liquidations are independent calls;
+            # a failed call (e.g. no futures permission) only leaves its own field unset
+            results = await asyncio.gather(
+                self._single_flight(
+                    ('funding_rate', symbol),
+                    lambda: self.binance_client.client.futures_funding_rate(symbol=symbol, limit=1)
+                ),
+                self._single_flight(
+                    ('open_interest', symbol),
+                    lambda: self.binance_client.client.futures_open_interest(symbol=symbol)
+                ),
+                self._single_flight(
+                    ('long_short_ratio', symbol),
+                    lambda: self.binance_client.client.futures_top_longshort_position_ratio(
+                        symbol=symbol, period='1h', limit=1
+                    )
+                ),
+                self._get_recent_liquidations(symbol),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    self.log_error(f"Futures API call error: {result}")
+            funding_rate_data, open_interest_data, ratio_data, recent_liquidations = (
+                None if isinstance(result, Exception) else result for result in results
             )
+            if recent_liquidations is not None:
+                futures_data['recent_liquidations'] = recent_liquidations
+            
+            # Funding rate
             if funding_rate_data and len(funding_rate_data) > 0:
                 funding_rate = funding_rate_data[0]['fundingRate']
-                futures_data['fundingRate'] = float(funding_rate) * 100
+                futures_data['fundingRate'] = _to_float(funding_rate) * 100
             
             # Open interest
-            open_interest_data = await self._safe_futures_api_call(
-                lambda: self.binance_client.client.futures_open_interest(symbol=symbol)
-            )
             if open_interest_data:
-                futures_data['openInterest'] = float(open_interest_data.get('openInterest', 'N/A'))
+                futures_data['openInterest'] = _to_float(open_interest_data.get('openInterest'))
                 
             # Long/short ratio
-            ratio_data = await self._safe_futures_api_call(
-                lambda: self.binance_client.client.futures_top_longshort_position_ratio(
-                    symbol=symbol, period='1h', limit=1
-                )
-            )
             if ratio_data and len(ratio_data) > 0:
-                futures_data['longShortRatio'] = float(ratio_data[0]['longShortRatio'])
-
-            # Try to get recent liquidations - from futures API if available
-            await self._get_recent_liquidations(symbol, futures_data)
+                futures_data['longShortRatio'] = _to_float(ratio_data[0].get('longShortRatio'))
 
         except Exception as e:
             self.log_error(f"Error getting futures data for {symbol}: {e}")
         
         return futures_data
     
-    async def _get_recent_liquidations(self, symbol: str, futures_data: Dict[str, Any]) -> None:
+    async def _get_recent_liquidations(self, symbol: str) -> Dict[str, Any]:
         """
         Get recent liquidation data for a symbol.
         This method uses a combination of:
@@ -491,62 +775,79 @@ Aşağıdaki kriterlere göre sinyal sayısına karar ver:
         
         Args:
             symbol: The cryptocurrency symbol to get liquidations for
-            futures_data: Dictionary to update with liquidation information
+            
+        Returns:
+            Dict[str, Any]: Liquidations bucketed into 'last_hour', 'last_day' and 'significant_levels'
         """
+        recent_liquidations = {
+            "last_hour": [],
+            "last_day": [],
+            "significant_levels": []
+        }
+        
         try:
             # Try to get recent liquidations from Binance if the API endpoint is available
             # Note: This might be restricted or might not exist depending on the Binance API version
-            liquidation_orders = await self._safe_futures_api_call(
-                lambda: self.binance_client.client.futures_liquidation_orders(symbol=symbol)
-            )
+            try:
+                liquidation_orders = await self._single_flight(
+                    ('liquidation_orders', symbol),
+                    lambda: self.binance_client.client.futures_liquidation_orders(symbol=symbol)
+                )
+            except Exception as e:
+                self.log_error(f"Futures API call error: {e}")
+                liquidation_orders = None
             
             if liquidation_orders and isinstance(liquidation_orders, list) and len(liquidation_orders) > 0:
-                # Process real liquidation data
-                for liq in liquidation_orders:
-                    # Convert timestamp to datetime
-                    liq_time = datetime.fromtimestamp(liq.get('time', 0) / 1000)
-                    now = datetime.now()
-                    
-                    # Create liquidation entry
+                # Process real liquidation data: parse the numeric fields once into arrays and
+                # bucket by age with one comparison per bucket instead of per-row datetime math
+                count = len(liquidation_orders)
+                times_ms = np.fromiter((liq.get('time', 0) for liq in liquidation_orders), dtype=np.float64, count=count)
+                prices = np.fromiter((float(liq.get('price', 0)) for liq in liquidation_orders), dtype=np.float64, count=count)
+                qtys = np.fromiter((float(liq.get('origQty', 0)) for liq in liquidation_orders), dtype=np.float64, count=count)
+                values = prices * qtys
+                age_s = (time.time() * 1000 - times_ms) / 1000
+                in_last_hour = age_s <= 3600
+                day_idx = np.flatnonzero(age_s <= 86400)
+                
+                # Only entries inside the last day are materialized
+                for k in day_idx:
                     liq_entry = {
-                        "side": liq.get('side', 'N/A').lower(),
-                        "price": float(liq.get('price', 0)),
-                        "qty": float(liq.get('origQty', 0)),
-                        "time": liq_time.strftime('%Y-%m-%d %H:%M:%S'),
-                        "value_usdt": float(liq.get('price', 0)) * float(liq.get('origQty', 0))
+                        "side": liquidation_orders[k].get('side', 'N/A').lower(),
+                        "price": float(prices[k]),
+                        "qty": float(qtys[k]),
+                        "time": datetime.fromtimestamp(times_ms[k] / 1000).isoformat(sep=' ', timespec='seconds'),
+                        "value_usdt": float(values[k])
                     }
-                    
-                    # Add to appropriate time bucket
-                    if (now - liq_time).total_seconds() <= 3600:  # Last hour
-                        futures_data['recent_liquidations']['last_hour'].append(liq_entry)
-                    
-                    if (now - liq_time).total_seconds() <= 86400:  # Last day
-                        futures_data['recent_liquidations']['last_day'].append(liq_entry)
+                    if in_last_hour[k]:
+                        recent_liquidations['last_hour'].append(liq_entry)
+                    recent_liquidations['last_day'].append(liq_entry)
                 
                 # Identify significant liquidation levels
-                if futures_data['recent_liquidations']['last_day']:
-                    # Group by price ranges to find clusters
-                    price_clusters = {}
-                    for liq in futures_data['recent_liquidations']['last_day']:
-                        # Round price to nearest 10 or 100 depending on asset price range
-                        price_key = round(liq['price'] / 10) * 10
-                        if price_key not in price_clusters:
-                            price_clusters[price_key] = {
-                                "price_range": f"{price_key-5} to {price_key+5}",
-                                "total_value": 0,
-                                "count": 0
-                            }
-                        price_clusters[price_key]["total_value"] += liq['value_usdt']
-                        price_clusters[price_key]["count"] += 1
+                if day_idx.size:
+                    # Group by price ranges to find clusters. The bucket is ~1% of the median price
+                    # (a power of ten), so a $0.001 token and BTC both get meaningful buckets;
+                    # values are then summed per bucket in one pass
+                    day_prices = prices[day_idx]
+                    positive = day_prices[day_prices > 0]
+                    exponent = int(np.floor(np.log10(np.median(positive)))) - 2 if positive.size else 1
+                    tick = 10.0 ** exponent
+                    decimals = max(0, 1 - exponent)
+                    bucket_ids, inverse = np.unique(np.round(day_prices / tick).astype(np.int64), return_inverse=True)
+                    total_values = np.bincount(inverse, weights=values[day_idx])
+                    counts = np.bincount(inverse)
                     
-                    # Sort by total value to find most significant clusters
-                    significant_clusters = sorted(
-                        price_clusters.values(),
-                        key=lambda x: x["total_value"],
-                        reverse=True
-                    )[:3]  # Take top 3
+                    # Take the top 3 clusters by total value
+                    top = _nlargest_indices(total_values, 3)
+                    significant_clusters = [
+                        {
+                            "price_range": f"{(bucket_ids[k] - 0.5) * tick:.{decimals}f} to {(bucket_ids[k] + 0.5) * tick:.{decimals}f}",
+                            "total_value": float(total_values[k]),
+                            "count": int(counts[k])
+                        }
+                        for k in top
+                    ]
                     
-                    futures_data['recent_liquidations']['significant_levels'] = significant_clusters
+                    recent_liquidations['significant_levels'] = significant_clusters
             else:
                 # If no real liquidation data, use estimated data based on funding rate and price history
                 self.log_info(f"No liquidation data available for {symbol}, using estimated significant levels")
@@ -554,15 +855,14 @@ Aşağıdaki kriterlere göre sinyal sayısına karar ver:
                 # Get klines to estimate potential liquidation levels
                 klines = await self.binance_client.get_klines(symbol, '1d', limit=7)
                 if klines and len(klines) > 0:
-                    df = preprocess_klines_df(klines)
-                    
-                    # Identify significant price levels
-                    high = df['high'].max()
-                    low = df['low'].min()
-                    last_close = df['close'].iloc[-1]
+                    # Identify significant price levels; only three scalars are needed from the
+                    # seven raw rows ([open_time, open, high, low, close, ...]), so no DataFrame is built
+                    high = max(float(k[2]) for k in klines)
+                    low = min(float(k[3]) for k in klines)
+                    last_close = float(klines[-1][4])
                     
                     # Create estimated liquidation levels
-                    futures_data['recent_liquidations']['significant_levels'] = [
+                    recent_liquidations['significant_levels'] = [
                         {
                             "price_range": f"{round(low * 0.97)} to {round(low * 0.99)}",
                             "estimated": True,
@@ -577,18 +877,22 @@ Aşağıdaki kriterlere göre sinyal sayısına karar ver:
                     
                     # Create placeholder liquidation events for recent history
                     # These are fictional but representative for demonstration
-                    from_time = datetime.now()
+                    # Random sizes are drawn in one call per field instead of per event
+                    qtys = _PLACEHOLDER_RNG.uniform(0.1, 2.0, 3)
+                    value_mults = _PLACEHOLDER_RNG.uniform(1000, 10000, 3)
+                    base_time = datetime.now().replace(microsecond=0)
                     for i in range(3):
-                        from_time = from_time.replace(minute=from_time.minute - 15)
+                        # timedelta rather than replace(minute=...), which fails when minute < 15
+                        from_time = base_time - timedelta(minutes=15 * (i + 1))
                         side = "long" if i % 2 == 0 else "short"
                         price_mod = 0.98 if side == "long" else 1.02
                         
-                        futures_data['recent_liquidations']['last_hour'].append({
+                        recent_liquidations['last_hour'].append({
                             "side": side,
                             "price": round(last_close * price_mod, 2),
-                            "qty": round(np.random.uniform(0.1, 2.0), 2),
-                            "time": from_time.strftime('%Y-%m-%d %H:%M:%S'),
-                            "value_usdt": round(last_close * price_mod * np.random.uniform(1000, 10000), 2),
+                            "qty": round(float(qtys[i]), 2),
+                            "time": from_time.isoformat(sep=' ', timespec='seconds'),
+                            "value_usdt": round(float(last_close * price_mod * value_mults[i]), 2),
                             "estimated": True
                         })
         
@@ -597,68 +901,112 @@ Aşağıdaki kriterlere göre sinyal sayısına karar ver:
             self.log_info(f"Using placeholder liquidation data for {symbol}")
             
             # Always provide some data even if API calls fail
-            futures_data['recent_liquidations']['last_hour'] = [
-                {
-                    "side": "long",
-                    "price": 0,
-                    "qty": 0,
-                    "time": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    "value_usdt": 0,
-                    "placeholder": True
-                }
-            ]
+            placeholder = dict(_PLACEHOLDER_LIQUIDATION)
+            placeholder["time"] = datetime.now().strftime(_TS_FMT)
+            recent_liquidations['last_hour'] = [placeholder]
+        
+        return recent_liquidations
+    
+    @classmethod
+    def _get_fng_lock(cls) -> asyncio.Lock:
+        """Returns the class-wide Fear & Greed lock for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if cls._fng_lock is None or cls._fng_lock_loop is not loop:
+            cls._fng_lock = asyncio.Lock()
+            cls._fng_lock_loop = loop
+        return cls._fng_lock
     
     async def _get_fear_and_greed_index(self) -> Dict[str, Any]:
         """
-        Get the latest Fear & Greed Index data.
-        In a real implementation, this would call an external API like alternative.me.
+        Get the Fear & Greed Index, cached across symbols for _FNG_CACHE_TTL_S seconds.
+        
+        Returns:
+            Dict[str, Any]: Dictionary with fear and greed data
+        """
+        cls = type(self)
+        if cls._fng_cache and time.monotonic() < cls._fng_cache[1]:
+            return cls._fng_cache[0]
+        async with cls._get_fng_lock():
+            # Another coroutine may have filled the cache while we waited for the lock
+            if cls._fng_cache and time.monotonic() < cls._fng_cache[1]:
+                return cls._fng_cache[0]
+            result = await self._fetch_fear_and_greed_index()
+            if result.get('value') != 'N/A':
+                cls._fng_cache = (result, time.monotonic() + _FNG_CACHE_TTL_S)
+            return result
+    
+    async def _fetch_fear_and_greed_index(self) -> Dict[str, Any]:
+        """
+        Get the latest Fear & Greed Index data from alternative.me.
+        
+        The request goes through the application-wide shared HTTP session, so repeated
+        fetches reuse its pooled keep-alive connections.
         
         Returns:
             Dict[str, Any]: Dictionary with fear and greed data
         """
         self.log_info("Getting Fear & Greed Index data")
         
-        # In a production environment, you would implement an HTTP request to an API
-        # Example for alternative.me API:
         try:
-            # This is a placeholder for the actual HTTP API call
-            # In a real implementation you would use aiohttp or similar:
-            # async with aiohttp.ClientSession() as session:
-            #     async with session.get('https://api.alternative.me/fng/?limit=1') as response:
-            #         if response.status == 200:
-            #             data = await response.json()
-            
-            # For now, use hardcoded recent data or random value for demonstration
-            import random
-            value = random.randint(20, 75)
-            
-            # Map value to classification
-            classification = "Neutral"
-            if value <= 25:
-                classification = "Aşırı Korku"
-            elif value <= 40:
-                classification = "Korku"
-            elif value <= 60:
-                classification = "Nötr"
-            elif value <= 75:
-                classification = "Açgözlülük"
-            else:
-                classification = "Aşırı Açgözlülük"
+            session = get_shared_session()
+            
+            async def _request():
+                async with session.get(_FNG_API_URL, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                    if response.status == 429 or response.status >= 500:
+                        response.raise_for_status()
+                    return response.status, await response.read()
+            
+            status, body = await with_retry(_request, max_attempts=3)
+            if status != 200:
+                raise ValueError(f"HTTP {status}")
+            
+            latest = (orjson.loads(body) if orjson is not None else json.loads(body))['data'][0]
+            value = int(latest['value'])
             
             return {
                 "value": value,
-                "classification": classification,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "classification": _FNG_LABELS[bisect.bisect_left(_FNG_CUTS, value)],
+                "timestamp": datetime.fromtimestamp(int(latest['timestamp'])).strftime(_TS_FMT)
             }
         except Exception as e:
             self.log_error(f"Error fetching Fear & Greed Index: {e}")
-            return {
-                "value": "N/A",
-                "classification": "N/A",
-                "timestamp": "N/A"
-            }
+            return dict(_FNG_UNAVAILABLE)
+    
+    def _get_order_book_lock(self, symbol: str) -> asyncio.Lock:
+        """Returns the order book lock of a symbol for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._order_book_locks_loop is not loop:
+            self._order_book_locks.clear()
+            self._order_book_locks_loop = loop
+        lock = self._order_book_locks.get(symbol)
+        if lock is None:
+            lock = self._order_book_locks[symbol] = asyncio.Lock()
+        return lock
     
     async def _get_order_book_summary(self, symbol: str) -> Dict[str, Any]:
+        """
+        Get the order book summary, cached per symbol for _ORDER_BOOK_CACHE_TTL_S seconds.
+        
+        Args:
+            symbol: The cryptocurrency symbol to get order book for
+            
+        Returns:
+            Dict[str, Any]: Dictionary with order book summary
+        """
+        cached = self._order_book_cache.get(symbol)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+        async with self._get_order_book_lock(symbol):
+            # Another coroutine may have filled the cache while we waited for the lock
+            cached = self._order_book_cache.get(symbol)
+            if cached and time.monotonic() < cached[1]:
+                return cached[0]
+            summary = await self._fetch_order_book_summary(symbol)
+            if summary["bid_ask_spread_percent"] != "N/A":
+                self._order_book_cache[symbol] = (summary, time.monotonic() + _ORDER_BOOK_CACHE_TTL_S)
+            return summary
+    
+    async def _fetch_order_book_summary(self, symbol: str) -> Dict[str, Any]:
         """
         Get a summary of the order book for a symbol.
         
@@ -674,78 +1022,42 @@ Aşağıdaki kriterlere göre sinyal sayısına karar ver:
             "strongest_bid_levels": [],
             "strongest_ask_levels": [],
             "bid_ask_spread_percent": "N/A",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "timestamp": datetime.now().strftime(_TS_FMT)
         }
         
         try:
-            # Get order book from Binance
-            depth = await self.binance_client.client.get_order_book(symbol=symbol, limit=100)
+            # A live depth stream (top 20 levels) is read in-process; REST is the fallback
+            # while the stream is starting or stale
+            book = None
+            if self.depth_streamer is not None:
+                self.depth_streamer.subscribe(symbol)
+                book = self.depth_streamer.snapshot(symbol)
             
-            if not depth or 'bids' not in depth or 'asks' not in depth:
-                self.log_error(f"Invalid order book data received for {symbol}")
-                return summary
+            if book is not None:
+                bids, asks = book
+            else:
+                # Get order book from Binance
+                depth = await self._single_flight(
+                    ('order_book', symbol), lambda: self.binance_client.client.get_order_book(symbol=symbol, limit=100)
+                )
+                
+                if not depth or 'bids' not in depth or 'asks' not in depth:
+                    self.log_error(f"Invalid order book data received for {symbol}")
+                    return summary
+                
+                # Parse each side once into an (N, 2) float array of [price, quantity]
+                bids = np.asarray(depth['bids'], dtype=np.float64).reshape(-1, 2)
+                asks = np.asarray(depth['asks'], dtype=np.float64).reshape(-1, 2)
             
             # Calculate bid-ask spread
-            best_bid = float(depth['bids'][0][0])
-            best_ask = float(depth['asks'][0][0])
+            best_bid = bids[0, 0]
+            best_ask = asks[0, 0]
             spread = ((best_ask - best_bid) / best_ask) * 100
-            summary["bid_ask_spread_percent"] = round(spread, 4)
+            summary["bid_ask_spread_percent"] = round(float(spread), 4)
             
-            # Process bids - find walls (large orders)
-            bids_processed = []
-            for bid in depth['bids']:
-                price = float(bid[0])
-                qty = float(bid[1])
-                
-                # Check if this is large enough to be considered a wall
-                # (either absolute size or compared to nearby orders)
-                if qty > 10:  # Simple threshold, adjust based on typical volume
-                    bids_processed.append({
-                        "price": price,
-                        "quantity": qty,
-                        "value_usdt": price * qty
-                    })
-            
-            # Process asks - find walls
-            asks_processed = []
-            for ask in depth['asks']:
-                price = float(ask[0])
-                qty = float(ask[1])
-                
-                # Similar logic for ask walls
-                if qty > 10:  # Simple threshold
-                    asks_processed.append({
-                        "price": price,
-                        "quantity": qty,
-                        "value_usdt": price * qty
-                    })
-            
-            # Sort by value to find the strongest levels
-            bids_processed.sort(key=lambda x: x["value_usdt"], reverse=True)
-            asks_processed.sort(key=lambda x: x["value_usdt"], reverse=True)
-            
-            # Take top 3 or all if less than 3
-            summary["strongest_bid_levels"] = bids_processed[:min(3, len(bids_processed))]
-            summary["strongest_ask_levels"] = asks_processed[:min(3, len(asks_processed))]
-            
-            # If no walls found, include strongest visible levels anyway
-            if not summary["strongest_bid_levels"] and depth['bids']:
-                top_bid = {
-                    "price": float(depth['bids'][0][0]),
-                    "quantity": float(depth['bids'][0][1]),
-                    "value_usdt": float(depth['bids'][0][0]) * float(depth['bids'][0][1]),
-                    "note": "Best bid (not a significant wall)"
-                }
-                summary["strongest_bid_levels"].append(top_bid)
-            
-            if not summary["strongest_ask_levels"] and depth['asks']:
-                top_ask = {
-                    "price": float(depth['asks'][0][0]),
-                    "quantity": float(depth['asks'][0][1]),
-                    "value_usdt": float(depth['asks'][0][0]) * float(depth['asks'][0][1]),
-                    "note": "Best ask (not a significant wall)"
-                }
-                summary["strongest_ask_levels"].append(top_ask)
+            # Top 3 walls (large orders) per side; the best level is used if there are none
+            summary["strongest_bid_levels"] = _order_book_walls(bids, "Best bid (not a significant wall)")
+            summary["strongest_ask_levels"] = _order_book_walls(asks, "Best ask (not a significant wall)")
                 
         except Exception as e:
             self.log_error(f"Error processing order book for {symbol}: {e}")
@@ -753,22 +1065,6 @@ Aşağıdaki kriterlere göre sinyal sayısına karar ver:
             
         return summary
     
-    async def _safe_futures_api_call(self, api_call_function):
-        """
-        Safely call a futures API function, handling potential permission issues.
-        
-        Args:
-            api_call_function: Function to call that accesses futures API
-            
-        Returns:
-            Any: Result of the API call or None if failed
-        """
-        try:
-            return await api_call_function()
-        except Exception as e:
-            self.log_error(f"Futures API call error: {e}")
-            return None
-    
     def _calculate_volatility(self, df) -> Dict[str, Any]:
         """
         Calculate volatility metrics from price data.
@@ -787,29 +1083,32 @@ Aşağıdaki kriterlere göre sinyal sayısına karar ver:
         }
         
         try:
-            # Daily volatility (standard deviation of daily returns)
-            df['daily_returns'] = df['close'].pct_change() * 100
-            volatility_data['daily_volatility_percent'] = float(df['daily_returns'].std())
+            # Daily volatility (standard deviation of daily returns), computed on the raw
+            # close array; nothing is written back to the caller's frame
+            close = df['close'].to_numpy(dtype=np.float64, copy=False)
+            if close.size > 2:
+                returns = np.diff(close) / close[:-1]
+                volatility_data['daily_volatility_percent'] = float(returns.std(ddof=1) * 100)
             
             # ATR-14 from the indicators (if available)
             if 'atr_14' in df.columns:
-                volatility_data['atr_14'] = float(df['atr_14'].iloc[-1])
+                volatility_data['atr_14'] = float(df['atr_14'].iat[-1])
             
             # Bollinger Band width
             if all(col in df.columns for col in ['bb_upper', 'bb_lower', 'bb_middle']):
-                latest_upper = float(df['bb_upper'].iloc[-1])
-                latest_lower = float(df['bb_lower'].iloc[-1])
-                latest_middle = float(df['bb_middle'].iloc[-1])
+                latest_upper = float(df['bb_upper'].iat[-1])
+                latest_lower = float(df['bb_lower'].iat[-1])
+                latest_middle = float(df['bb_middle'].iat[-1])
                 
                 # Calculate width as percentage of middle band
                 width_percent = ((latest_upper - latest_lower) / latest_middle) * 100
                 volatility_data['bollinger_width'] = float(width_percent)
             
             # 24h price range
-            recent_df = df.tail(24)  # Assume hourly data or adjust accordingly
-            if len(recent_df) > 0:
-                high_24h = float(recent_df['high'].max())
-                low_24h = float(recent_df['low'].min())
+            recent = df[['high', 'low']].tail(24).to_numpy(dtype=np.float64)  # Assume hourly data or adjust accordingly
+            if len(recent) > 0:
+                high_24h = float(recent[:, 0].max())
+                low_24h = float(recent[:, 1].min())
                 avg_price = (high_24h + low_24h) / 2
                 
                 range_percent = ((high_24h - low_24h) / avg_price) * 100
@@ -828,54 +1127,4 @@ Aşağıdaki kriterlere göre sinyal sayısına karar ver:
         Returns:
             Dict[str, Any]: Dictionary of parameter names and their values
         """
-        return {
-            "supported_timeframes": ["15m", "1h", "4h", "1d"],
-            "default_timeframe": "4h",
-            "max_recommended_leverage": 20,
-            "indicators": {
-                "RSI": {
-                    "period": RSI_PERIOD
-                },
-                "MACD": {
-                    "fast_period": MACD_FAST_PERIOD,
-                    "slow_period": MACD_SLOW_PERIOD,
-                    "signal_period": MACD_SIGNAL_PERIOD
-                },
-                "SMA": {
-                    "short_period": SMA_SHORT_PERIOD,
-                    "long_period": SMA_LONG_PERIOD
-                },
-                "EMA": {
-                    "short_period": EMA_SHORT_PERIOD,
-                    "long_period": EMA_LONG_PERIOD
-                },
-            },
-            "volatility_metrics": ["daily_volatility", "atr_14", "bollinger_width", "price_range_24h"]
-        }
-
-    def _convert_numpy_types(self, obj):
-        """
-        Recursively convert numpy types to native Python types for JSON serialization.
-        
-        Args:
-            obj: Object to convert (can be dict, list, or scalar value)
-            
-        Returns:
-            Object with numpy types converted to native Python types
-        """
-        if isinstance(obj, dict):
-            return {k: self._convert_numpy_types(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_numpy_types(item) for item in obj]
-        elif isinstance(obj, (np.integer, np.floating)):
-            return float(obj)
-        elif isinstance(obj, np.bool_):
-            return bool(obj)
-        elif obj is np.True_:
-            return True
-        elif obj is np.False_:
-            return False
-        elif isinstance(obj, np.ndarray):
-            return self._convert_numpy_types(obj.tolist())
-        else:
-            return obj 
\ No newline at end of file
+        return copy.deepcopy(dict(_ANALYSIS_PARAMETERS))
@@ -2,7 +2,7 @@
 Module Registry to manage all analysis modules in the system.
 """
 import logging
-from typing import Dict, List, Type, Optional
+from typing import Callable, Dict, List, Tuple, Type, Optional
 
 from .base_analysis import BaseAnalysisModule
 
@@ -17,6 +17,10 @@ class AnalysisModuleRegistry:
     def __init__(self):
         """Initialize an empty registry."""
         self.modules: Dict[str, BaseAnalysisModule] = {}
+        # name -> (factory, description) of modules not instantiated yet
+        self._factories: Dict[str, Tuple[Callable[[], BaseAnalysisModule], str]] = {}
+        # Materialized list_modules() output; reset whenever the set of modules changes
+        self._module_info_cache: Optional[List[Dict[str, str]]] = None
         self.logger = logging.getLogger("analysis.registry")
     
     def register_module(self, module: BaseAnalysisModule) -> None:
@@ -28,10 +32,11 @@ class AnalysisModuleRegistry:
         """
         module_name = module.name
         
-        if module_name in self.modules:
+        # One lookup on the common (new name) path
+        if self.modules.setdefault(module_name, module) is not module:
             self.logger.warning(f"Module '{module_name}' is already registered. Overwriting.")
-        
-        self.modules[module_name] = module
+            self.modules[module_name] = module
+        self._module_info_cache = None
         self.logger.info(f"Registered analysis module: {module_name} ({module.description})")
     
     def register_module_class(self, module_class: Type[BaseAnalysisModule], *args, **kwargs) -> None:
@@ -46,9 +51,29 @@ class AnalysisModuleRegistry:
         module = module_class(*args, **kwargs)
         self.register_module(module)
     
+    def register_factory(self, name: str, factory: Callable[[], BaseAnalysisModule],
+                         description: str) -> None:
+        """
+        Register a factory that builds the module on first access.
+        
+        Any existing instance under the same name is discarded so that the next
+        lookup is built from the new factory.
+        
+        Args:
+            name: The name the module will be registered under
+            factory: Zero-argument callable returning the module instance
+            description: Module description, listed before the module is instantiated
+        """
+        if name in self.modules or name in self._factories:
+            self.logger.warning(f"Module '{name}' is already registered. Overwriting.")
+        self.modules.pop(name, None)
+        self._factories[name] = (factory, description)
+        self._module_info_cache = None
+        self.logger.info(f"Registered analysis module factory: {name}")
+    
     def get_module(self, name: str) -> Optional[BaseAnalysisModule]:
         """
-        Get a module by name.
+        Get a module by name, instantiating it from its factory on first access.
         
         Args:
             name: The name of the module to retrieve
@@ -56,20 +81,52 @@ class AnalysisModuleRegistry:
         Returns:
             Optional[BaseAnalysisModule]: The module instance or None if not found
         """
-        if name not in self.modules:
+        module = self.modules.get(name)
+        if module is not None:
+            return module
+        
+        pending = self._factories.get(name)
+        if pending is None:
             self.logger.warning(f"Module '{name}' not found in registry")
             return None
         
-        return self.modules[name]
+        try:
+            module = pending[0]()
+        except Exception as e:
+            # Keep the factory so the module stays listed and the next access retries
+            self.logger.error(f"Failed to instantiate module '{name}': {e}", exc_info=e)
+            return None
+        self.register_module(module)
+        self._factories.pop(name, None)
+        return module
+    
+    def module_names(self) -> List[str]:
+        """
+        Names of all registered modules, including ones not yet instantiated.
+        
+        Returns:
+            List[str]: Module names
+        """
+        return list(self.modules) + [name for name in self._factories if name not in self.modules]
     
     def list_modules(self) -> List[Dict[str, str]]:
         """
         List all registered modules.
         
+        Modules not instantiated yet are listed from the description registered with their
+        factory, so listing does not build them. The result is cached until a module is
+        registered or unregistered.
+        
         Returns:
             List[Dict[str, str]]: List of module info dictionaries
         """
-        return [module.module_info for module in self.modules.values()]
+        if self._module_info_cache is None:
+            self._module_info_cache = [module.module_info for module in self.modules.values()]
+            self._module_info_cache.extend(
+                {"name": name, "description": description}
+                for name, (_, description) in self._factories.items() if name not in self.modules
+            )
+        return list(self._module_info_cache)
     
     def has_module(self, name: str) -> bool:
         """
@@ -81,7 +138,7 @@ class AnalysisModuleRegistry:
         Returns:
             bool: True if module is registered, False otherwise
         """
-        return name in self.modules
+        return name in self.modules or name in self._factories
     
     def unregister_module(self, name: str) -> bool:
         """
@@ -93,11 +150,12 @@ class AnalysisModuleRegistry:
         Returns:
             bool: True if module was unregistered, False if not found
         """
-        if name in self.modules:
-            del self.modules[name]
+        removed = self.modules.pop(name, None) is not None
+        removed = self._factories.pop(name, None) is not None or removed
+        if removed:
+            self._module_info_cache = None
             self.logger.info(f"Unregistered module: {name}")
-            return True
-        return False
+        return removed
 
 # Global instance of the registry
 registry = AnalysisModuleRegistry() 
\ No newline at end of file
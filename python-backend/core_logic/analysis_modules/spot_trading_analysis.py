@@ -1,9 +1,11 @@
 """
 Spot Trading Analysis Module - Analyzes cryptocurrencies for spot trading opportunities.
 """
+import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional, List
+import re
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
 import numpy as np
 
@@ -15,26 +17,113 @@ from core_logic.constants import (
 from utils.general_utils import (
     preprocess_klines_df, calculate_technical_indicators, extract_latest_indicators
 )
+from utils._njit import njit, NUMBA_AVAILABLE
 
-from .base_analysis import BaseAnalysisModule
+from .base_analysis import AnalysisResult, BaseAnalysisModule
 
-# LLM prompt template for spot trading analysis
-SPOT_TRADING_PROMPT = """
-# ROL VE GÖREV
-Sen deneyimli bir kripto para spot trading uzmanısın. Ana görevin {symbol} için mevcut verilere dayanarak net alım-satım stratejileri ve özellikle isabetli alım noktaları belirleyerek fırsatları önermektir. Detaylı piyasa analizi yerine, yalnızca spot trading açısından önemli noktalara odaklan, pratik, uygulanabilir işlem stratejileri sun ve önerdiğin her alım seviyesinin gerekçelerini detaylıca açıkla.
+def _convert_numpy_types(obj):
+    """
+    Recursively convert numpy types to native Python types for JSON serialization.
+    
+    Common types are dispatched on their exact type with one dict lookup; only types
+    missing from the table fall back to the isinstance checks.
+    
+    Args:
+        obj: Object to convert (can be dict, list, or scalar value)
+        
+    Returns:
+        Object with numpy types converted to native Python types
+    """
+    converter = _NUMPY_CONVERTERS.get(type(obj))
+    if converter is not None:
+        return converter(obj)
+    if isinstance(obj, (np.integer, np.floating)):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    return obj
 
-# VERİLER
-**{symbol} İçin Teknik Veriler:**
-{technical_data}
+def _find_pivots(values: np.ndarray, find_highs: bool) -> np.ndarray:
+    """
+    Finds the indices of 5-candle pivots: values strictly above (or below) the two
+    candles on each side.
+    
+    Args:
+        values: 1-D array of highs or lows
+        find_highs: True for local highs, False for local lows
+        
+    Returns:
+        np.ndarray: Indices of the pivots, in order
+    """
+    if values.size < 5:
+        return np.empty(0, dtype=np.intp)
+    center = values[2:-2]
+    neighbours = (values[1:-3], values[:-4], values[3:-1], values[4:])
+    if find_highs:
+        mask = (center > neighbours[0]) & (center > neighbours[1]) & (center > neighbours[2]) & (center > neighbours[3])
+    else:
+        mask = (center < neighbours[0]) & (center < neighbours[1]) & (center < neighbours[2]) & (center < neighbours[3])
+    return np.flatnonzero(mask) + 2
 
-**Mevcut Durum:**
-Güncel Fiyat: {current_price} USDT
-24s Değişim: {price_change_percent}%
-RSI({rsi_period}): {rsi_value}
-SMA{sma_short}: {sma_short_value}
-SMA{sma_long}: {sma_long_value}
+# Candles on each side a pivot must exceed
+_PIVOT_WINDOW = 2
+
+@njit(cache=True)
+def _find_pivots_njit(highs, lows, left, right):
+    """
+    Single-pass pivot scan over highs and lows; compiled when numba is available.
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indices of local highs and of local lows, in order
+    """
+    n = highs.shape[0]
+    out_h = np.empty(n, np.int64)
+    out_l = np.empty(n, np.int64)
+    count_h = 0
+    count_l = 0
+    for i in range(left, n - right):
+        is_high = True
+        is_low = True
+        for k in range(i - left, i + right + 1):
+            if k == i:
+                continue
+            # Written as "not >" so NaN on either side never forms a pivot
+            if is_high and not highs[i] > highs[k]:
+                is_high = False
+            if is_low and not lows[i] < lows[k]:
+                is_low = False
+            if not is_high and not is_low:
+                break
+        if is_high:
+            out_h[count_h] = i
+            count_h += 1
+        if is_low:
+            out_l[count_l] = i
+            count_l += 1
+    return out_h[:count_h], out_l[:count_l]
+
+def _unchanged(obj):
+    return obj
+
+_NUMPY_CONVERTERS = {
+    dict: lambda obj: {k: _convert_numpy_types(v) for k, v in obj.items()},
+    list: lambda obj: [_convert_numpy_types(item) for item in obj],
+    np.ndarray: lambda obj: _convert_numpy_types(obj.tolist()),
+    np.float64: float,
+    np.float32: float,
+    np.int64: float,
+    np.int32: float,
+    np.bool_: bool,
+    # Native leaves are returned as-is without reaching the isinstance fallback
+    float: _unchanged,
+    int: _unchanged,
+    str: _unchanged,
+    bool: _unchanged,
+    type(None): _unchanged,
+}
 
-# SPOT TİCARET ANALİZİ
+# Analysis instructions shared by the single-symbol and the batch prompt; see SPOT_TRADING_PROMPT below
+_SPOT_ANALYSIS_INSTRUCTIONS = """# SPOT TİCARET ANALİZİ
 Aşağıdaki bölümleri içeren, ticaret odaklı bir analiz hazırla:
 
 ## {symbol} Spot Ticaret Fırsatı Analizi
@@ -110,6 +199,79 @@ Aşağıdaki bölümleri içeren, ticaret odaklı bir analiz hazırla:
 Analizini spot alım-satım kararları verecek kişiler için net, özlü, gerekçelendirilmiş ve uygulanabilir yap. Özellikle fiyat seviyelerine, giriş koşullarına, risk yönetimine ve alım stratejilerine odaklan. Her önerinin nedenini açıkla.
 """
 
+# LLM prompt template for spot trading analysis
+SPOT_TRADING_PROMPT = """
+# ROL VE GÖREV
+Sen deneyimli bir kripto para spot trading uzmanısın. Ana görevin {symbol} için mevcut verilere dayanarak net alım-satım stratejileri ve özellikle isabetli alım noktaları belirleyerek fırsatları önermektir. Detaylı piyasa analizi yerine, yalnızca spot trading açısından önemli noktalara odaklan, pratik, uygulanabilir işlem stratejileri sun ve önerdiğin her alım seviyesinin gerekçelerini detaylıca açıkla.
+
+# VERİLER
+**{symbol} İçin Teknik Veriler:**
+{technical_data}
+
+**Mevcut Durum:**
+Güncel Fiyat: {current_price} USDT
+24s Değişim: {price_change_percent}%
+RSI({rsi_period}): {rsi_value}
+SMA{sma_short}: {sma_short_value}
+SMA{sma_long}: {sma_long_value}
+
+""" + _SPOT_ANALYSIS_INSTRUCTIONS
+
+# Batch prompt: one shared preamble and instruction block, then one numbered data block per
+# symbol; the model answers each symbol in a section opened by its delimiter
+SPOT_BATCH_PROMPT_HEADER = """
+# ROL VE GÖREV
+Sen deneyimli bir kripto para spot trading uzmanısın. Ana görevin aşağıdaki {count} sembolün her biri için mevcut verilere dayanarak net alım-satım stratejileri ve özellikle isabetli alım noktaları belirleyerek fırsatları önermektir. Detaylı piyasa analizi yerine, yalnızca spot trading açısından önemli noktalara odaklan, pratik, uygulanabilir işlem stratejileri sun ve önerdiğin her alım seviyesinin gerekçelerini detaylıca açıkla.
+
+# VERİLER
+"""
+
+SPOT_BATCH_SYMBOL_BLOCK = """
+## SEMBOL {idx}: {symbol}
+**{symbol} İçin Teknik Veriler:**
+{technical_data}
+
+**Mevcut Durum:**
+Güncel Fiyat: {current_price} USDT
+24s Değişim: {price_change_percent}%
+RSI({rsi_period}): {rsi_value}
+SMA{sma_short}: {sma_short_value}
+SMA{sma_long}: {sma_long_value}
+"""
+
+SPOT_BATCH_PROMPT_FOOTER = """
+# YANIT BİÇİMİ
+Yukarıdaki analiz şablonunu her sembol için ayrı ayrı uygula ([SEMBOL] yerine ilgili sembolü yaz). Yanıtı {count} bölüm halinde ver: her bölüm tek başına bir satırda `=== SYMBOL_<numara> ===` ayırıcısıyla başlasın (<numara>, yukarıdaki SEMBOL numarasıdır). Ayırıcıları değiştirme ve bölümlerin dışına metin ekleme.
+"""
+
+# Section delimiter the batch prompt asks for, e.g. "=== SYMBOL_2 ==="
+_BATCH_SECTION_RE = re.compile(r"^\s*=== SYMBOL_(\d+) ===\s*$", re.MULTILINE)
+# Symbols per LLM call; larger batches save more preamble tokens but risk truncated answers
+_SPOT_BATCH_SIZE = 5
+
+
+def _split_batch_response(response: str, count: int) -> Dict[int, str]:
+    """
+    Split a batch LLM answer into its per-symbol sections.
+    
+    Args:
+        response: LLM answer containing "=== SYMBOL_<n> ===" delimited sections
+        count: Number of symbols in the batch
+        
+    Returns:
+        Dict[int, str]: Non-empty section text keyed by 1-based symbol number
+    """
+    parts = _BATCH_SECTION_RE.split(response or "")
+    sections: Dict[int, str] = {}
+    # parts = [preamble, number, text, number, text, ...]
+    for number, text in zip(parts[1::2], parts[2::2]):
+        idx = int(number)
+        text = text.strip()
+        if 1 <= idx <= count and text and idx not in sections:
+            sections[idx] = text
+    return sections
+
+
 class SpotTradingAnalysisModule(BaseAnalysisModule):
     """
     Module for spot trading analysis of cryptocurrencies.
@@ -133,7 +295,7 @@ class SpotTradingAnalysisModule(BaseAnalysisModule):
         self.binance_client = binance_client
         self.llm_client = llm_client
     
-    async def perform_analysis(self, symbol: str, **kwargs) -> str:
+    async def perform_analysis(self, symbol: str, **kwargs) -> AnalysisResult:
         """
         Perform spot trading analysis on a cryptocurrency.
         
@@ -142,89 +304,239 @@ class SpotTradingAnalysisModule(BaseAnalysisModule):
             **kwargs: Additional parameters (timeframe, etc.)
             
         Returns:
-            str: Formatted trading analysis result
+            AnalysisResult: Formatted trading analysis; is_error is set on failure
         """
         self.log_info(f"Starting spot trading analysis for {symbol}")
         
         try:
-            # Standardize symbol format
-            if not any(symbol.upper().endswith(suffix) for suffix in ['USDT', 'BTC', 'ETH', 'BUSD']):
-                symbol = f"{symbol.upper()}USDT"
-            else:
-                symbol = symbol.upper()
-            
             # Get primary timeframe or default to 4h
             timeframe = kwargs.get('timeframe', '4h')
             
-            # Get current symbol data
-            current_ticker_data = await self.binance_client.client.get_ticker(symbol=symbol)
-            if not current_ticker_data:
-                return f"❌ {symbol} için güncel piyasa verisi alınamadı"
+            symbol_data = await self._collect_symbol_data(symbol, timeframe)
+            if isinstance(symbol_data, AnalysisResult):
+                return symbol_data
             
-            # Get klines data for the specified timeframe
-            klines = await self.binance_client.get_klines(symbol, timeframe, limit=300) # 300 candles required for reliable technical indicator calculations (especially SMA200)
-            if not klines or len(klines) < 50:
-                return f"❌ {symbol} için {timeframe} zaman diliminde yeterli geçmiş veri bulunamadı"
+            return await self._analyze_single(symbol_data, timeframe)
             
-            # Process klines data
-            df = preprocess_klines_df(klines)
-            df_with_indicators = calculate_technical_indicators(df)
-            latest_indicators = extract_latest_indicators(df_with_indicators)
-            
-            # Prepare data for LLM prompt
-            current_price = float(current_ticker_data.get('lastPrice', 'N/A'))
-            price_change_percent = float(current_ticker_data.get('priceChangePercent', 'N/A'))
+        except Exception as e:
+            return self._failure_result(symbol, e)
+    
+    async def perform_analysis_batch(self, symbols: List[str], batch_size: int = _SPOT_BATCH_SIZE,
+                                     **kwargs) -> Dict[str, AnalysisResult]:
+        """
+        Perform spot trading analysis on several cryptocurrencies with shared LLM calls.
+        
+        Market data for all symbols is fetched concurrently, then up to ``batch_size``
+        symbols share one prompt so the role and analysis instructions are sent once per
+        batch instead of once per symbol. Symbols whose section is missing from the batch
+        answer are re-analyzed on their own.
+        
+        Args:
+            symbols: The cryptocurrency symbols to analyze (e.g., ['BTCUSDT', 'ETHUSDT'])
+            batch_size: Maximum number of symbols per LLM call
+            **kwargs: Additional parameters (timeframe, etc.)
             
-            # Get support and resistance levels
-            sr_levels = self._calculate_support_resistance(df)
+        Returns:
+            Dict[str, AnalysisResult]: Analysis result per requested symbol, in request order
+        """
+        self.log_info(f"Starting batched spot trading analysis for {len(symbols)} symbols")
+        timeframe = kwargs.get('timeframe', '4h')
+        batch_size = max(1, batch_size)
+        
+        collected = await asyncio.gather(
+            *(self._collect_symbol_data(symbol, timeframe) for symbol in symbols),
+            return_exceptions=True
+        )
+        
+        results: Dict[str, AnalysisResult] = {}
+        ready = []
+        for symbol, symbol_data in zip(symbols, collected):
+            if isinstance(symbol_data, Exception):
+                results[symbol] = self._failure_result(symbol, symbol_data)
+            elif isinstance(symbol_data, AnalysisResult):
+                results[symbol] = symbol_data
+            else:
+                ready.append((symbol, symbol_data))
+        
+        batches = [ready[i:i + batch_size] for i in range(0, len(ready), batch_size)]
+        for batch_results in await asyncio.gather(*(self._analyze_batch(batch, timeframe) for batch in batches)):
+            results.update(batch_results)
+        
+        self.log_info(f"Completed batched spot trading analysis for {len(symbols)} symbols "
+                      f"in {len(batches)} LLM batches")
+        return {symbol: results[symbol] for symbol in symbols}
+    
+    async def _collect_symbol_data(self, symbol: str, timeframe: str) -> Union[Dict[str, Any], AnalysisResult]:
+        """
+        Fetch market data for a symbol and prepare its prompt fields.
+        
+        Args:
+            symbol: The cryptocurrency symbol to analyze
+            timeframe: Kline interval to analyze
             
-            # Format technical data as JSON for LLM
-            technical_data_dict = {
-                "price_data": {
-                    "high_24h": float(current_ticker_data.get('highPrice', 'N/A')),
-                    "low_24h": float(current_ticker_data.get('lowPrice', 'N/A')),
-                    "volume_24h": float(current_ticker_data.get('volume', 'N/A')),
-                },
-                "indicators": latest_indicators,
-                "support_resistance": sr_levels
+        Returns:
+            Union[Dict[str, Any], AnalysisResult]: Symbol data, or an error result if data is missing
+        """
+        # Standardize symbol format
+        if not any(symbol.upper().endswith(suffix) for suffix in ['USDT', 'BTC', 'ETH', 'BUSD']):
+            symbol = f"{symbol.upper()}USDT"
+        else:
+            symbol = symbol.upper()
+        
+        # Get current symbol data
+        current_ticker_data = await self.binance_client.client.get_ticker(symbol=symbol)
+        if not current_ticker_data:
+            return AnalysisResult(symbol, self.name, f"❌ {symbol} için güncel piyasa verisi alınamadı", is_error=True)
+        
+        # Get klines data for the specified timeframe
+        klines = await self.binance_client.get_klines(symbol, timeframe, limit=300) # 300 candles required for reliable technical indicator calculations (especially SMA200)
+        if not klines or len(klines) < 50:
+            return AnalysisResult(symbol, self.name, f"❌ {symbol} için {timeframe} zaman diliminde yeterli geçmiş veri bulunamadı",
+                                  is_error=True)
+        
+        # Process klines data
+        df = preprocess_klines_df(klines)
+        df_with_indicators = calculate_technical_indicators(df)
+        latest_indicators = extract_latest_indicators(df_with_indicators)
+        
+        # Prepare data for LLM prompt
+        current_price = float(current_ticker_data.get('lastPrice', 'N/A'))
+        price_change_percent = float(current_ticker_data.get('priceChangePercent', 'N/A'))
+        
+        # Get support and resistance levels
+        sr_levels = self._calculate_support_resistance(df)
+        
+        # Format technical data as JSON for LLM
+        technical_data_dict = {
+            "price_data": {
+                "high_24h": float(current_ticker_data.get('highPrice', 'N/A')),
+                "low_24h": float(current_ticker_data.get('lowPrice', 'N/A')),
+                "volume_24h": float(current_ticker_data.get('volume', 'N/A')),
+            },
+            "indicators": latest_indicators,
+            "support_resistance": sr_levels
+        }
+        
+        # Convert numpy types to native Python types before JSON serialization
+        technical_data_dict = _convert_numpy_types(technical_data_dict)
+        technical_data = json.dumps(technical_data_dict, indent=2)
+        
+        return {
+            "symbol": symbol,
+            "current_price": current_price,
+            "price_change_percent": price_change_percent,
+            "prompt_fields": {
+                "symbol": symbol,
+                "technical_data": technical_data,
+                "current_price": current_price,
+                "price_change_percent": price_change_percent,
+                "rsi_period": RSI_PERIOD,
+                "rsi_value": latest_indicators.get('rsi', 'N/A'),
+                "sma_short": SMA_SHORT_PERIOD,
+                "sma_short_value": latest_indicators.get(f'sma_{SMA_SHORT_PERIOD}', 'N/A'),
+                "sma_long": SMA_LONG_PERIOD,
+                "sma_long_value": latest_indicators.get(f'sma_{SMA_LONG_PERIOD}', 'N/A')
             }
+        }
+    
+    async def _analyze_single(self, symbol_data: Dict[str, Any], timeframe: str) -> AnalysisResult:
+        """
+        Run the single-symbol prompt and format its report.
+        
+        Args:
+            symbol_data: Output of _collect_symbol_data
+            timeframe: Kline interval that was analyzed
             
-            # Convert numpy types to native Python types before JSON serialization
-            technical_data_dict = self._convert_numpy_types(technical_data_dict)
-            technical_data = json.dumps(technical_data_dict, indent=2)
+        Returns:
+            AnalysisResult: Formatted trading analysis result
+        """
+        # Create LLM prompt
+        prompt = SPOT_TRADING_PROMPT.format(**symbol_data["prompt_fields"])
+        
+        # Get analysis from LLM
+        response = await self.llm_client.agenerate_text(prompt)
+        
+        self.log_info(f"Completed spot trading analysis for {symbol_data['symbol']}")
+        return self._format_report(symbol_data, timeframe, response)
+    
+    async def _analyze_batch(self, batch: List[Tuple[str, Dict[str, Any]]],
+                             timeframe: str) -> Dict[str, AnalysisResult]:
+        """
+        Analyze a batch of symbols with one LLM call, falling back per symbol.
+        
+        Args:
+            batch: (requested symbol, symbol data) pairs
+            timeframe: Kline interval that was analyzed
             
-            # Create LLM prompt
-            prompt = SPOT_TRADING_PROMPT.format(
-                symbol=symbol,
-                technical_data=technical_data,
-                current_price=current_price,
-                price_change_percent=price_change_percent,
-                rsi_period=RSI_PERIOD,
-                rsi_value=latest_indicators.get('rsi', 'N/A'),
-                sma_short=SMA_SHORT_PERIOD,
-                sma_short_value=latest_indicators.get(f'sma_{SMA_SHORT_PERIOD}', 'N/A'),
-                sma_long=SMA_LONG_PERIOD,
-                sma_long_value=latest_indicators.get(f'sma_{SMA_LONG_PERIOD}', 'N/A')
+        Returns:
+            Dict[str, AnalysisResult]: Analysis result per requested symbol
+        """
+        results: Dict[str, AnalysisResult] = {}
+        
+        if len(batch) > 1:
+            prompt_parts = [SPOT_BATCH_PROMPT_HEADER.format(count=len(batch))]
+            prompt_parts.extend(
+                SPOT_BATCH_SYMBOL_BLOCK.format(idx=idx, **symbol_data["prompt_fields"])
+                for idx, (_, symbol_data) in enumerate(batch, start=1)
             )
+            prompt_parts.append("\n")
+            prompt_parts.append(_SPOT_ANALYSIS_INSTRUCTIONS.format(
+                symbol="[SEMBOL]", sma_short=SMA_SHORT_PERIOD, sma_long=SMA_LONG_PERIOD
+            ))
+            prompt_parts.append(SPOT_BATCH_PROMPT_FOOTER.format(count=len(batch)))
             
-            # Get analysis from LLM
-            response = self.llm_client.generate_text(prompt)
+            try:
+                response = await self.llm_client.agenerate_text("".join(prompt_parts))
+                sections = _split_batch_response(response, len(batch))
+            except Exception as e:
+                self.log_error(f"Batched spot trading analysis failed for "
+                               f"{', '.join(data['symbol'] for _, data in batch)}: {str(e)}", exc_info=e)
+                sections = {}
             
-            # Format the final analysis
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            final_analysis = f"# {symbol} SPOT TİCARET ANALİZİ\n"
-            final_analysis += f"**Analiz Zamanı**: {timestamp}\n"
-            final_analysis += f"**Zaman Dilimi**: {timeframe}\n\n"
-            final_analysis += f"**Güncel Fiyat**: {current_price} USDT (%{price_change_percent} 24s)\n\n"
-            final_analysis += response
-            
-            self.log_info(f"Completed spot trading analysis for {symbol}")
-            return final_analysis
+            for idx, (symbol, symbol_data) in enumerate(batch, start=1):
+                if idx in sections:
+                    results[symbol] = self._format_report(symbol_data, timeframe, sections[idx])
+        
+        # Symbols missing from the batch answer (or alone in their batch) get their own prompt
+        missing = [(symbol, symbol_data) for symbol, symbol_data in batch if symbol not in results]
+        if missing:
+            if len(batch) > 1:
+                self.log_info(f"Batch answer lacked {len(missing)} of {len(batch)} sections; "
+                                 f"analyzing them individually")
+            reports = await asyncio.gather(
+                *(self._analyze_single(symbol_data, timeframe) for _, symbol_data in missing),
+                return_exceptions=True
+            )
+            for (symbol, _), report in zip(missing, reports):
+                results[symbol] = self._failure_result(symbol, report) if isinstance(report, Exception) else report
+        
+        return results
+    
+    def _format_report(self, symbol_data: Dict[str, Any], timeframe: str, response: str) -> AnalysisResult:
+        """
+        Prepend the report header to an LLM answer.
+        
+        Args:
+            symbol_data: Output of _collect_symbol_data
+            timeframe: Kline interval that was analyzed
+            response: LLM answer for the symbol
             
-        except Exception as e:
-            error_message = f"Error analyzing {symbol} for spot trading: {str(e)}"
-            self.log_error(error_message, exc_info=e)
-            return f"❌ Spot ticaret analizi başarısız oldu: {error_message}"
+        Returns:
+            AnalysisResult: Formatted trading analysis result
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        final_analysis = f"# {symbol_data['symbol']} SPOT TİCARET ANALİZİ\n"
+        final_analysis += f"**Analiz Zamanı**: {timestamp}\n"
+        final_analysis += f"**Zaman Dilimi**: {timeframe}\n\n"
+        final_analysis += f"**Güncel Fiyat**: {symbol_data['current_price']} USDT (%{symbol_data['price_change_percent']} 24s)\n\n"
+        final_analysis += response
+        return AnalysisResult(symbol_data['symbol'], self.name, final_analysis)
+    
+    def _failure_result(self, symbol: str, error: BaseException) -> AnalysisResult:
+        """Log an analysis failure and return it as an error result."""
+        error_message = f"Error analyzing {symbol} for spot trading: {str(error)}"
+        self.log_error(error_message, exc_info=error)
+        return AnalysisResult(symbol, self.name, f"❌ Spot ticaret analizi başarısız oldu: {error_message}", is_error=True)
     
     def _calculate_support_resistance(self, df) -> List[Dict[str, float]]:
         """
@@ -239,62 +551,32 @@ class SpotTradingAnalysisModule(BaseAnalysisModule):
         # Simple implementation - find local highs and lows
         sr_levels = []
         
-        # Use last 50 candles for analysis
+        # Use last 50 candles for analysis; read each column once as a float64 array
         recent_df = df.tail(50)
+        highs = recent_df['high'].to_numpy(dtype=np.float64, copy=False)
+        lows = recent_df['low'].to_numpy(dtype=np.float64, copy=False)
+        
+        # Compiled single pass when numba is installed, array comparisons otherwise
+        if NUMBA_AVAILABLE:
+            resistance_idx, support_idx = _find_pivots_njit(highs, lows, _PIVOT_WINDOW, _PIVOT_WINDOW)
+        else:
+            resistance_idx = _find_pivots(highs, find_highs=True)
+            support_idx = _find_pivots(lows, find_highs=False)
         
         # Find local highs (potential resistance)
-        for i in range(2, len(recent_df)-2):
-            if (recent_df.iloc[i]['high'] > recent_df.iloc[i-1]['high'] and 
-                recent_df.iloc[i]['high'] > recent_df.iloc[i-2]['high'] and
-                recent_df.iloc[i]['high'] > recent_df.iloc[i+1]['high'] and
-                recent_df.iloc[i]['high'] > recent_df.iloc[i+2]['high']):
-                sr_levels.append({
-                    "type": "resistance",
-                    "price": float(recent_df.iloc[i]['high']),
-                    "strength": 1  # Simple strength indicator
-                })
+        sr_levels.extend(
+            {"type": "resistance", "price": float(highs[i]), "strength": 1}  # Simple strength indicator
+            for i in resistance_idx
+        )
         
         # Find local lows (potential support)
-        for i in range(2, len(recent_df)-2):
-            if (recent_df.iloc[i]['low'] < recent_df.iloc[i-1]['low'] and 
-                recent_df.iloc[i]['low'] < recent_df.iloc[i-2]['low'] and
-                recent_df.iloc[i]['low'] < recent_df.iloc[i+1]['low'] and
-                recent_df.iloc[i]['low'] < recent_df.iloc[i+2]['low']):
-                sr_levels.append({
-                    "type": "support",
-                    "price": float(recent_df.iloc[i]['low']),
-                    "strength": 1  # Simple strength indicator
-                })
+        sr_levels.extend(
+            {"type": "support", "price": float(lows[i]), "strength": 1}  # Simple strength indicator
+            for i in support_idx
+        )
         
         return sr_levels
     
-    def _convert_numpy_types(self, obj):
-        """
-        Recursively convert numpy types to native Python types for JSON serialization.
-        
-        Args:
-            obj: Object to convert (can be dict, list, or scalar value)
-            
-        Returns:
-            Object with numpy types converted to native Python types
-        """
-        if isinstance(obj, dict):
-            return {k: self._convert_numpy_types(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_numpy_types(item) for item in obj]
-        elif isinstance(obj, (np.integer, np.floating)):
-            return float(obj)
-        elif isinstance(obj, np.bool_):
-            return bool(obj)
-        elif obj is np.True_:
-            return True
-        elif obj is np.False_:
-            return False
-        elif isinstance(obj, np.ndarray):
-            return self._convert_numpy_types(obj.tolist())
-        else:
-            return obj
-    
     async def get_analysis_parameters(self) -> Dict[str, Any]:
         """
         Get the parameters used by this analysis module.
@@ -17,7 +17,7 @@ from utils.general_utils import (
     preprocess_klines_df, calculate_technical_indicators, extract_latest_indicators
 )
 
-from .base_analysis import BaseAnalysisModule
+from .base_analysis import AnalysisResult, BaseAnalysisModule
 
 # Example template for an LLM prompt if needed
 TEMPLATE_PROMPT = """
@@ -64,7 +64,7 @@ class TemplateAnalysisModule(BaseAnalysisModule):
         # Add any additional instance variables you need
         self.timeframe = kwargs.get('timeframe', '1h')  # Default timeframe
     
-    async def perform_analysis(self, symbol: str, **kwargs) -> str:
+    async def perform_analysis(self, symbol: str, **kwargs) -> AnalysisResult:
         """
         Perform analysis on a cryptocurrency.
         
@@ -73,7 +73,7 @@ class TemplateAnalysisModule(BaseAnalysisModule):
             **kwargs: Additional parameters specific to this analysis type
             
         Returns:
-            str: Formatted analysis result
+            AnalysisResult: Formatted analysis result; set is_error=True on failure
         """
         self.log_info(f"Starting analysis for {symbol}")
         
@@ -90,12 +90,14 @@ class TemplateAnalysisModule(BaseAnalysisModule):
             # Fetch market data
             ticker_data = await self.binance_client.client.get_ticker(symbol=symbol)
             if not ticker_data:
-                return f"❌ Could not retrieve market data for {symbol}"
+                return AnalysisResult(symbol, self.name, f"❌ Could not retrieve market data for {symbol}", is_error=True)
             
             # Fetch klines (candlestick) data
             klines = await self.binance_client.get_klines(symbol, timeframe, limit=300) # 300 candles required for reliable technical indicator calculations (especially SMA200)
             if not klines or len(klines) < 50:
-                return f"❌ Insufficient historical data for {symbol} on {timeframe} timeframe"
+                return AnalysisResult(symbol, self.name,
+                                      f"❌ Insufficient historical data for {symbol} on {timeframe} timeframe",
+                                      is_error=True)
             
             # Process data
             df = preprocess_klines_df(klines)
@@ -115,7 +117,7 @@ class TemplateAnalysisModule(BaseAnalysisModule):
             )
             
             # Get analysis result - either from LLM or your custom logic
-            analysis_text = self.llm_client.generate_text(prompt)
+            analysis_text = await self.llm_client.agenerate_text(prompt)
             
             # Format the result
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -126,12 +128,12 @@ class TemplateAnalysisModule(BaseAnalysisModule):
             result += analysis_text
             
             self.log_info(f"Completed analysis for {symbol}")
-            return result
+            return AnalysisResult(symbol, self.name, result)
             
         except Exception as e:
             error_message = f"Error analyzing {symbol}: {str(e)}"
             self.log_error(error_message, exc_info=e)
-            return f"❌ Analysis failed: {error_message}"
+            return AnalysisResult(symbol, self.name, f"❌ Analysis failed: {error_message}", is_error=True)
     
     async def get_analysis_parameters(self) -> Dict[str, Any]:
         """
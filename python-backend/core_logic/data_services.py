@@ -37,12 +37,12 @@ def get_all_usdt_tickers_data(binance_cli):
         logging.exception("Tüm USDT ticker verileri alınırken bir istisna oluştu:")
         return None
 
-def fetch_and_format_cmc_top_coins(cmc_cli, num_coins):
+async def fetch_and_format_cmc_top_coins(cmc_cli, num_coins):
     """Fetches and formats top N coins by market cap from CoinMarketCap."""
-    if not cmc_cli or not cmc_cli.cmc:
+    if not cmc_cli:
         logging.warning("CoinMarketCap istemcisi mevcut değil, piyasa değeri listesi atlanıyor.")
         return []
-    cmc_top_coins_data = cmc_cli.get_listings_by_market_cap(limit=num_coins)
+    cmc_top_coins_data = await cmc_cli.get_listings_by_market_cap(limit=num_coins)
     if not cmc_top_coins_data:
         logging.warning("CoinMarketCap'ten piyasa değeri verisi alınamadı.")
         return []
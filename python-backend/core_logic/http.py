@@ -0,0 +1,60 @@
+"""
+Shared aiohttp sessions for the REST clients.
+
+All aiohttp-based clients running on the same event loop draw from one
+connection pool instead of keeping their own. Each event loop gets its own
+session (e.g. the threaded web API runs every request under its own
+``asyncio.run``), so concurrent loops never share or close each other's pool.
+"""
+import asyncio
+import logging
+import sys
+from typing import Dict
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Event loop -> session opened on that loop
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Returns the keep-alive session of the running event loop, creating it on first use.
+
+    Must be called from within a running event loop.
+
+    Returns:
+        aiohttp.ClientSession: The running loop's shared session
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        # Loops that finished without closing their session can no longer use it
+        for stale_loop in [l for l in list(_sessions) if l.is_closed()]:
+            _sessions.pop(stale_loop, None)
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=200, limit_per_host=50, ttl_dns_cache=300, enable_cleanup_closed=True)
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_shared_session() -> None:
+    """Closes the running event loop's shared session; call this when the loop shuts down."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+        logger.info("Paylaşılan HTTP oturumu kapatıldı.")
+
+
+def install_event_loop_policy() -> None:
+    """Makes new event loops use uvloop when it is installed (not supported on Windows)."""
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
@@ -0,0 +1,85 @@
+"""
+Retry helpers for the REST clients.
+
+Transient failures (HTTP 429 and 5xx) are retried with exponential backoff and
+jitter. When the server sends a ``Retry-After`` header it is honoured instead
+of the computed delay.
+"""
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Optional, Tuple, Type
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_EXCEPTIONS: Tuple[Type[BaseException], ...] = (aiohttp.ClientResponseError,)
+
+try:
+    from binance.exceptions import BinanceAPIException
+    _RETRYABLE_EXCEPTIONS += (BinanceAPIException,)
+except ImportError:  # binance bazı giriş noktalarında kurulu olmayabilir
+    pass
+
+
+def _status_of(exc: BaseException) -> Optional[int]:
+    """Returns the HTTP status code carried by a client exception, if any."""
+    status = getattr(exc, 'status_code', None) or getattr(exc, 'status', None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Reads the Retry-After header (in seconds) from the exception, if present."""
+    headers = getattr(exc, 'headers', None)
+    if headers is None:
+        response = getattr(exc, 'response', None)
+        headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    value = headers.get('Retry-After')
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    status = _status_of(exc)
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+def _backoff_delay(exc: BaseException, attempt: int, base: float, cap: float) -> float:
+    retry_after = _retry_after(exc)
+    if retry_after is not None:
+        return min(cap, retry_after)
+    return min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+async def with_retry(coro_factory: Callable[[], Awaitable[Any]], *,
+                     max_attempts: int = 6, base: float = 0.5, cap: float = 30.0) -> Any:
+    """
+    Awaits ``coro_factory()`` and retries it on 429/5xx responses.
+
+    Args:
+        coro_factory: Zero-argument callable returning a fresh awaitable on each call
+        max_attempts: Total number of attempts before the last error is re-raised
+        base: Base delay in seconds for the exponential backoff
+        cap: Upper bound for a single delay in seconds
+
+    Returns:
+        The result of the awaitable.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await coro_factory()
+        except _RETRYABLE_EXCEPTIONS as e:
+            attempt += 1
+            if attempt >= max_attempts or not _is_retryable(e):
+                raise
+            delay = _backoff_delay(e, attempt - 1, base, cap)
+            logger.warning(f"Geçici API hatası ({_status_of(e)}), {delay:.2f}s sonra yeniden denenecek "
+                           f"(deneme {attempt}/{max_attempts}): {e}")
+            await asyncio.sleep(delay)
+
@@ -9,12 +9,14 @@ import json
 from datetime import datetime
 import sys
 
+import config
 from config import EXCHANGE_API_KEY, EXCHANGE_API_SECRET, LLM_API_KEY, DEFAULT_KLINE_LIMIT, CRYPTOPANIC_API_KEY
 # Updated imports from new directory structure
 from clients.exchange_client import BinanceClient
 from clients.llm_client import GeminiClient
 from clients.market_data_client import CoinMarketCapClient
 from clients.market_sentiment_client import MarketSentimentClient
+from core_logic.http import close_shared_session, install_event_loop_policy
 from fundamental_analysis.cryptopanic_client import CryptoPanicClient
 # from binance.client import Client # No longer directly used in main.py after refactor
 # import pandas_ta as ta # No longer directly used in main.py after refactor
@@ -39,7 +41,7 @@ from utils.general_utils import (
 ) # format_indicator_value, preprocess_klines_df etc. are used by analysis_logic now
 from core_logic.data_services import get_all_usdt_tickers_data, fetch_and_format_cmc_top_coins
 from core_logic.analysis_logic import (
-    get_bitcoin_trend_summary, format_price_data_for_llm
+    get_bitcoin_trend_summary, format_price_data_for_llm, close_clients
 )
 from handlers.console_handlers import display_coin_selection_lists, get_and_validate_user_coin_choice
 
@@ -74,6 +76,9 @@ logger = logging.getLogger(__name__)
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 1000)
 
+# Paylaşılan piyasa duyarlılık istemcisi (TTL önbelleği analizler arasında korunur)
+market_sentiment_client = MarketSentimentClient()
+
 # TARGET_SYMBOLS = ["BTCUSDT", "ETHUSDT", "BNBUSDT"] # Analiz edilecek coinler - ARTIK DİNAMİK OLACAK
 # KLINE_INTERVAL = Client.KLINE_INTERVAL_1HOUR # Moved to constants.py
 # KLINE_HISTORY_PERIOD = "72 hour ago UTC" # Moved to constants.py
@@ -273,17 +278,19 @@ async def analyze_coin(binance_cli: BinanceClient,
                        llm_cli: GeminiClient, 
                        fundamental_cli: Optional[CryptoPanicClient],
                        symbol: str, 
-                       btc_trend_summary: str):
+                       btc_trend_summary: str,
+                       raise_on_error: bool = False):
     """
     Analyzes a cryptocurrency using technical and fundamental data.
+
+    On failure an error message is returned, or the exception is re-raised when
+    raise_on_error is set so that callers can tell a failure from an analysis.
     """
     try:
-        # Initialize market sentiment client
-        market_sentiment_cli = MarketSentimentClient()
-        
+        market_sentiment_cli = market_sentiment_client
+
         # Fetch market sentiment data
-        fear_greed_data = await market_sentiment_cli.get_fear_greed_index()
-        market_trend_data = await market_sentiment_cli.get_market_trend()
+        fear_greed_data, market_trend_data = await market_sentiment_cli.get_all_sentiment()
         market_sentiment_str = market_sentiment_cli.format_market_sentiment_for_llm(fear_greed_data, market_trend_data)
 
         # 1. Load Historical Analysis Summaries
@@ -357,14 +364,15 @@ async def analyze_coin(binance_cli: BinanceClient,
         # 2. Fetch Current Market Data (Technical)
         klines_by_interval = {}
         all_klines_fetched_successfully = True
-        for interval_code in TARGET_KLINE_INTERVALS:
+        logging.info(f"Fetching {', '.join(KLINE_INTERVAL_MAP.get(i, i) for i in TARGET_KLINE_INTERVALS)} klines for {symbol}...")
+        klines_results = await binance_cli.get_klines_batch(
+            [(symbol, interval_code, DEFAULT_KLINE_LIMIT) for interval_code in TARGET_KLINE_INTERVALS]
+        )
+        for interval_code, klines in zip(TARGET_KLINE_INTERVALS, klines_results):
             interval_str = KLINE_INTERVAL_MAP.get(interval_code, interval_code) # Get human-readable string
-            logging.info(f"Fetching {interval_str} klines for {symbol}...")
-            klines = await binance_cli.get_klines(
-                symbol,
-                interval_code,
-                limit=DEFAULT_KLINE_LIMIT 
-            )
+            if isinstance(klines, Exception):
+                logging.error(f"{symbol} için {interval_str} mum verisi alınırken hata: {klines}")
+                klines = None
             if not klines or len(klines) < 50: 
                 logging.warning(f"{symbol} için {interval_str} zaman aralığında yeterli mum verisi (en az 50) alınamadı.")
                 klines_by_interval[interval_code] = [] 
@@ -383,7 +391,7 @@ async def analyze_coin(binance_cli: BinanceClient,
             logging.warning(f"{symbol} için 24 saatlik ticker verisi alınamadı. Fiyat bilgileri eksik olacak.")
             current_ticker_24hr_data = {} 
 
-        formatted_technical_data = format_price_data_for_llm(symbol, klines_by_interval, current_ticker_24hr_data)
+        formatted_technical_data = await format_price_data_for_llm(symbol, klines_by_interval, current_ticker_24hr_data)
 
         # 3. Fetch Fundamental Data
         fundamental_data_str = ""
@@ -433,7 +441,7 @@ async def analyze_coin(binance_cli: BinanceClient,
         prompt_to_llm = prompt_template.format(**prompt_to_llm_args)
         
         logging.info("LLM'e gönderiliyor...")
-        analysis_result_raw = llm_cli.generate_text(prompt_to_llm)
+        analysis_result_raw = await llm_cli.agenerate_text(prompt_to_llm)
 
         # 5. Extract New Summary and Main Analysis from LLM Response
         new_summary_for_memory = ""
@@ -498,6 +506,8 @@ async def analyze_coin(binance_cli: BinanceClient,
     except Exception as e:
         logging.error(f"Coin analizi sırasında hata: {e}")
         logging.exception("Coin analizi sırasında bir istisna oluştu:")
+        if raise_on_error:
+            raise
         return f"{symbol} analizi sırasında bir hata oluştu: {str(e)}"
 
 async def analyze_coin_at_date(
@@ -643,7 +653,7 @@ async def analyze_coin_at_date(
         historical_ticker_data = {} # No direct way to get 24hr ticker for a past arbitrary time.
                                    # format_price_data_for_llm will use the latest kline data.
 
-        formatted_technical_data = format_price_data_for_llm(
+        formatted_technical_data = await format_price_data_for_llm(
             symbol, 
             klines_by_interval, 
             historical_ticker_data, # Pass empty or None for historical
@@ -710,7 +720,7 @@ async def analyze_coin_at_date(
         prompt_to_llm = prompt_template.format(**prompt_to_llm_args)
         
         logging.info(f"LLM'e gönderiliyor ({symbol} @ {analysis_target_date_iso})...")
-        analysis_result_raw = llm_cli.generate_text(prompt_to_llm)
+        analysis_result_raw = await llm_cli.agenerate_text(prompt_to_llm)
 
         new_summary_for_memory = ""
         main_analysis_content = analysis_result_raw
@@ -756,12 +766,12 @@ async def analyze_coin_at_date(
         logging.exception(f"{symbol} ({analysis_target_date_iso}) geçmiş analizi sırasında bir istisna oluştu:")
         return f"{symbol} ({analysis_target_date_iso}) geçmiş analiz edilirken genel bir hata oluştu: {e}"
 
-def _fetch_and_format_cmc_top_coins(cmc_cli, num_coins):
+async def _fetch_and_format_cmc_top_coins(cmc_cli, num_coins):
     """Fetches and formats top N coins by market cap from CoinMarketCap."""
-    if not cmc_cli or not cmc_cli.cmc:
+    if not cmc_cli:
         logging.warning("CoinMarketCap istemcisi mevcut değil, piyasa değeri listesi atlanıyor.")
         return []
-    cmc_top_coins_data = cmc_cli.get_listings_by_market_cap(limit=num_coins)
+    cmc_top_coins_data = await cmc_cli.get_listings_by_market_cap(limit=num_coins)
     if not cmc_top_coins_data:
         logging.warning("CoinMarketCap'ten piyasa değeri verisi alınamadı.")
         return []
@@ -947,18 +957,24 @@ async def get_and_validate_user_coin_choice(binance_client, all_binance_usdt_sym
             
             logging.warning(f"Geçersiz veya Binance'te bulunamayan sembol girdiniz: {selected_symbol_input}. Lütfen listelerden geçerli bir sembol girin veya 'q' ile çıkın.")
 
-async def main():
+async def main(refresh_symbols: bool = False):
     """
     Main function to run the coin scanner bot.
     Initializes clients, fetches market data, presents choices to the user,
     and triggers analysis for the selected coin.
+
+    Args:
+        refresh_symbols: Ignore the on-disk Binance symbol cache and refetch it
     """
 
+    # Eksik anahtarları istemciler oluşturulmadan önce tek seferde raporla
+    config.require("EXCHANGE_API_KEY", "EXCHANGE_API_SECRET", "LLM_API_KEY", "COINMARKETCAP_API_KEY")
+
     binance_client = None # Initialize to None for finally block
     analysis_system = None
     try:
         logging.info("Coin Tarayıcı Bot Başlatılıyor...")
-        binance_client = BinanceClient() 
+        binance_client = BinanceClient(refresh_symbols=refresh_symbols)
         gemini_client = GeminiClient()     
         cmc_client = CoinMarketCapClient() 
         
@@ -1006,7 +1022,7 @@ async def main():
                 await asyncio.sleep(60) # Wait a bit before retrying or exiting
                 continue # Or break, depending on desired behavior for critical data failure
 
-            top_market_cap_coins = fetch_and_format_cmc_top_coins(cmc_client, CMC_TOP_N_MARKET_CAP)
+            top_market_cap_coins = await fetch_and_format_cmc_top_coins(cmc_client, CMC_TOP_N_MARKET_CAP)
             
             top_volume_coins = get_top_n_by_volume(all_binance_usdt_tickers, DEFAULT_TOP_N)
             top_gainer_coins = get_top_n_gainers(all_binance_usdt_tickers, DEFAULT_TOP_N)
@@ -1089,7 +1105,7 @@ async def main():
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = os.path.join(output_dir, f"{selected_symbol_for_analysis}_{selected_module}_{timestamp}.txt")
             with open(output_file, "w", encoding="utf-8") as f:
-                f.write(analysis_result)
+                f.write(str(analysis_result))
             
             logging.info(f"{selected_symbol_for_analysis} analizi tamamlandı ve {output_file} dosyasına kaydedildi.")
 
@@ -1120,6 +1136,16 @@ async def main():
         if binance_client: # Ensure client exists before trying to close
             await binance_client.close()
             logging.info("Binance istemcisi ana program sonunda kapatıldı.")
+        # analysis_logic.get_clients() yedek istemcileri oluşturduysa onları da kapat
+        await close_clients()
+        # Duyarlılık ve CMC istemcilerinin kullandığı paylaşılan HTTP oturumu
+        await close_shared_session()
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    install_event_loop_policy()
+    import argparse
+    parser = argparse.ArgumentParser(description="Coin Tarayıcı Bot")
+    parser.add_argument("--refresh-symbols", action="store_true",
+                        help="Disk üzerindeki Binance sembol önbelleğini yok say ve yeniden oluştur")
+    args = parser.parse_args()
+    asyncio.run(main(refresh_symbols=args.refresh_symbols)) 
\ No newline at end of file
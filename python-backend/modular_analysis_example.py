@@ -63,7 +63,7 @@ async def run_modular_analysis_example():
         logger.info(f"Module '{module_name}' parameters: {params}")
         
         # Perform analysis with the module
-        result = await analysis_system.analyze(module_name, symbol)
+        result = (await analysis_system.analyze(module_name, symbol)).to_markdown()
         
         # Print a preview of the result (first 500 chars)
         preview = result[:500] + "..." if len(result) > 500 else result
@@ -37,7 +37,9 @@ try:
     from core_logic.analysis_facade import initialize_analysis_system, get_analysis_system
     
     # Import config for API keys
+    import config
     from config import EXCHANGE_API_KEY, EXCHANGE_API_SECRET, LLM_API_KEY, CRYPTOPANIC_API_KEY
+    config.require("EXCHANGE_API_KEY", "EXCHANGE_API_SECRET", "LLM_API_KEY")
     
     # Initialize clients
     _exchange_client = BinanceClient(EXCHANGE_API_KEY, EXCHANGE_API_SECRET)
@@ -48,8 +50,9 @@ try:
     if CRYPTOPANIC_API_KEY:
         _cryptopanic_client = CryptoPanicClient(CRYPTOPANIC_API_KEY)
     
-    # Initialize the analysis system
-    initialize_analysis_system(_exchange_client, _llm_client, _cryptopanic_client)
+    # Initialize the analysis system; the bot keeps one event loop alive, so futures order
+    # books can be served from WebSocket depth streams instead of REST
+    initialize_analysis_system(_exchange_client, _llm_client, _cryptopanic_client, depth_stream=True)
     
     _ANALYSIS_READY = True
     logging.getLogger(__name__).info("Successfully initialized the modular analysis system")
@@ -57,6 +60,9 @@ try:
 except ImportError as e:
     _import_error = f"Error importing required components: {str(e)}"
     logging.getLogger(__name__).error(f"Could not import required components: {e}")
+except RuntimeError as e:
+    _import_error = f"Missing configuration: {str(e)}"
+    logging.getLogger(__name__).error(f"Analysis system configuration is incomplete: {e}")
 
 if not _ANALYSIS_READY:
     # Define a placeholder if analysis system couldn't be initialized
@@ -411,9 +417,16 @@ def smart_split_message(text: str, max_length: int = 4000) -> list:
     
     return chunks
 
+async def _close_analysis_system(application: Application) -> None:
+    '''Stops the analysis system's depth streams when the bot shuts down.'''
+    if _ANALYSIS_READY and get_analysis_system():
+        await get_analysis_system().close()
+
 def run_bot(telegram_token: str):
     '''Starts the Telegram bot.'''
-    application = Application.builder().token(telegram_token).build()
+    from core_logic.http import install_event_loop_policy
+    install_event_loop_policy()
+    application = Application.builder().token(telegram_token).post_shutdown(_close_analysis_system).build()
 
     # on different commands - answer in Telegram
     application.add_handler(CommandHandler("start", start))
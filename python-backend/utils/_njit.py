@@ -0,0 +1,23 @@
+"""
+Optional Numba JIT decorator.
+
+``njit`` compiles the function with Numba when it is installed and returns it
+unchanged otherwise, so callers keep working on a plain NumPy/Python path.
+Check ``NUMBA_AVAILABLE`` before dispatching to a loop that is only fast when
+compiled.
+"""
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba isteğe bağlı bir bağımlılık
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """Drop-in for ``numba.njit`` that degrades to a no-op without Numba."""
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
 import logging
+from dataclasses import dataclass, fields
+from typing import Any, Optional
 # Constants will be imported from core_logic.constants after it's moved
 # from constants import KLINES_COLUMNS, NUMERIC_KLINES_COLUMNS
 from core_logic.constants import (
@@ -9,6 +12,7 @@ from core_logic.constants import (
     SMA_SHORT_PERIOD, SMA_LONG_PERIOD, EMA_SHORT_PERIOD, EMA_LONG_PERIOD, ATR_PERIOD,
     RECENT_SR_CANDLE_COUNT, BBANDS_LENGTH, BBANDS_STD, FIB_LOOKBACK_PERIOD
 )
+from utils._njit import njit, NUMBA_AVAILABLE
 # Import volume analysis functions
 from utils.volume_analysis import (
     calculate_volume_trend,
@@ -244,11 +248,64 @@ def preprocess_klines_df(klines):
     """Converts klines data to a DataFrame and handles numeric conversions."""
     df = pd.DataFrame(klines, columns=KLINES_COLUMNS)
     for col in NUMERIC_KLINES_COLUMNS:
-        df[col] = pd.to_numeric(df[col])
+        # Always float64: integer-looking strings would otherwise parse as int64 and force
+        # a conversion (or an object fallback) in every indicator and VWAP pass downstream
+        df[col] = pd.to_numeric(df[col]).astype(np.float64, copy=False)
     return df
 
-def calculate_technical_indicators(df):
-    """Calculates various technical indicators and adds them to the DataFrame."""
+# Below this many rows the NumPy cumsum is already faster than a JIT dispatch
+_VWAP_JIT_MIN_ROWS = 2000
+
+@njit(cache=True, fastmath=True)
+def _vwap_loop(high, low, close, volume):
+    """Single-pass cumulative VWAP over typical price; compiled when numba is available."""
+    out = np.empty(high.shape[0])
+    cum_tpv = 0.0
+    cum_v = 0.0
+    for i in range(high.shape[0]):
+        cum_tpv += (high[i] + low[i] + close[i]) / 3 * volume[i]
+        cum_v += volume[i]
+        out[i] = cum_tpv / cum_v
+    return out
+
+def calculate_vwap(df):
+    """
+    Calculates the cumulative VWAP (Volume Weighted Average Price) over the typical price.
+
+    Args:
+        df: DataFrame with 'high', 'low', 'close' and 'volume' columns
+
+    Returns:
+        np.ndarray: VWAP per row, all NaN if the volume column is missing or the calculation fails
+    """
+    if 'volume' not in df.columns:
+        logger.error("Volume data not found in DataFrame, cannot calculate VWAP")
+        return np.full(len(df), np.nan)
+    try:
+        # Columns are float64 after preprocess_klines_df, so these are views rather than copies
+        high = df['high'].to_numpy(dtype=np.float64, copy=False)
+        low = df['low'].to_numpy(dtype=np.float64, copy=False)
+        close = df['close'].to_numpy(dtype=np.float64, copy=False)
+        volume = df['volume'].to_numpy(dtype=np.float64, copy=False)
+        if NUMBA_AVAILABLE and len(df) >= _VWAP_JIT_MIN_ROWS:
+            return _vwap_loop(high, low, close, volume)
+        typical_price = (high + low + close) / 3
+        return np.cumsum(typical_price * volume) / np.cumsum(volume)
+    except Exception as e:
+        logger.error(f"Error calculating VWAP: {e}")
+        return np.full(len(df), np.nan)
+
+def calculate_technical_indicators(df, vwap=False):
+    """
+    Calculates various technical indicators and adds them to the DataFrame.
+
+    Args:
+        df: Preprocessed klines DataFrame
+        vwap: Also add a cumulative 'vwap' column (computed even when there are too few rows for the other indicators)
+    """
+    if vwap and not df.empty:
+        df['vwap'] = calculate_vwap(df)
+
     min_len_for_indicators = max(RSI_PERIOD, MACD_SLOW_PERIOD, SMA_LONG_PERIOD, EMA_LONG_PERIOD, ATR_PERIOD, BBANDS_LENGTH, 1)
     if df.empty or len(df) < min_len_for_indicators:
         logger.warning(f"DataFrame does not have enough data to calculate all indicators. Required: {min_len_for_indicators}, Got: {len(df)}")
@@ -527,6 +584,86 @@ def extract_latest_indicators(df_with_indicators):
     }
     return result
 
+@dataclass(frozen=True, slots=True)
+class LatestIndicators:
+    """Fixed-schema view of the dict returned by extract_latest_indicators.
+
+    Period-suffixed keys (e.g. 'sma_100') map to period-free fields (sma_short); every
+    field is None when the indicator is missing.
+    """
+    rsi: Optional[float] = None
+    macd: Optional[float] = None
+    macd_signal: Optional[float] = None
+    macd_hist: Optional[float] = None
+    sma_short: Optional[float] = None
+    sma_long: Optional[float] = None
+    ema_short: Optional[float] = None
+    ema_long: Optional[float] = None
+    atr: Optional[float] = None
+    bb_lower: Optional[float] = None
+    bb_middle: Optional[float] = None
+    bb_upper: Optional[float] = None
+    volume: Optional[float] = None
+    pivot_p: Optional[float] = None
+    pivot_s1: Optional[float] = None
+    pivot_s2: Optional[float] = None
+    pivot_s3: Optional[float] = None
+    pivot_r1: Optional[float] = None
+    pivot_r2: Optional[float] = None
+    pivot_r3: Optional[float] = None
+    rsi_divergence: Optional[str] = None
+    fib_levels: Optional[Any] = None
+    fib_high: Optional[float] = None
+    fib_low: Optional[float] = None
+    volume_trend: Optional[str] = None
+    volume_trend_pct_change: Optional[float] = None
+    volume_ma_20: Optional[float] = None
+    volume_ma_50: Optional[float] = None
+    volume_ma_100: Optional[float] = None
+    volume_vs_ma_20: Optional[float] = None
+    volume_vs_ma_50: Optional[float] = None
+    volume_vs_ma_100: Optional[float] = None
+    pv_correlation: Optional[float] = None
+    pv_interpretation: Optional[str] = None
+    pv_strength: Optional[str] = None
+    pv_is_confirming: Optional[bool] = None
+    volume_anomaly_detected: Optional[bool] = None
+    volume_anomaly_type: Optional[str] = None
+    volume_anomaly_z_score: Optional[float] = None
+    volume_anomaly_deviation_pct: Optional[float] = None
+    # Optional prompt sections with data: 'pivots', 'fib', 'volume_anomaly'
+    present_groups: frozenset = frozenset()
+
+    @classmethod
+    def from_dict(cls, indicators):
+        """Builds the struct from an extract_latest_indicators dict; unknown keys are ignored."""
+        get = indicators.get
+        values = {name: get(key) for name, key in _LATEST_INDICATOR_FIELD_KEYS}
+        return cls(**values, present_groups=_present_groups(values))
+
+_PERIOD_KEYED_FIELDS = {
+    'sma_short': f'sma_{SMA_SHORT_PERIOD}',
+    'sma_long': f'sma_{SMA_LONG_PERIOD}',
+    'ema_short': f'ema_{EMA_SHORT_PERIOD}',
+    'ema_long': f'ema_{EMA_LONG_PERIOD}',
+    'atr': f'atr_{ATR_PERIOD}',
+}
+# (field name, source dict key) pairs, resolved once
+_LATEST_INDICATOR_FIELD_KEYS = tuple((f.name, _PERIOD_KEYED_FIELDS.get(f.name, f.name))
+                                     for f in fields(LatestIndicators) if f.name != 'present_groups')
+_PIVOT_FIELDS = ('pivot_p', 'pivot_r1', 'pivot_r2', 'pivot_r3', 'pivot_s1', 'pivot_s2', 'pivot_s3')
+
+def _present_groups(values):
+    """Returns the optional indicator groups that carry data, computed once per extraction."""
+    groups = []
+    if any(values[name] is not None for name in _PIVOT_FIELDS):
+        groups.append('pivots')
+    if values['fib_high'] is not None and values['fib_low'] is not None:
+        groups.append('fib')
+    if values['volume_anomaly_detected'] is not None and values['volume_anomaly_detected'] is not False:
+        groups.append('volume_anomaly')
+    return frozenset(groups)
+
 def extract_price_summary_data(df, current_ticker_details):
     """Extracts key price summary data from the DataFrame and ticker details."""
     
@@ -14,11 +14,14 @@ if project_root not in sys.path:
 
 # Artık ana projedeki modülleri import edebiliriz
 from config import EXCHANGE_API_KEY, EXCHANGE_API_SECRET, LLM_API_KEY, CRYPTOPANIC_API_KEY # config.py'dan import
+import config
+config.require("EXCHANGE_API_KEY", "EXCHANGE_API_SECRET", "LLM_API_KEY")
 from clients.exchange_client import BinanceClient
 from clients.llm_client import GeminiClient
 from fundamental_analysis.cryptopanic_client import CryptoPanicClient
-from core_logic.analysis_logic import get_bitcoin_trend_summary # BTC özeti için
+from core_logic.analysis_logic import get_bitcoin_trend_summary, close_clients # BTC özeti için
 from main import analyze_coin, analyze_coin_at_date # analyze_coin_at_date eklendi
+from core_logic.http import close_shared_session, install_event_loop_policy
 
 # Import modular analysis system
 from core_logic.analysis_facade import initialize_analysis_system, get_analysis_system
@@ -28,6 +31,9 @@ from core_logic.analysis_modules import (
     FuturesTradingAnalysisModule
 )
 
+# Her istekteki asyncio.run çağrısı mümkünse libuv tabanlı event loop kullanır
+install_event_loop_policy()
+
 app = Flask(__name__)
 # CORS yapılandırması - geliştirme sırasında '*' kullanılabilir, 
 # production'da spesifik origin belirtilmelidir
@@ -79,7 +85,7 @@ async def run_analysis(symbol: str, module_name: str = "crypto_analysis"):
         # Modular analysis with selected module
         if module_name in ["spot_trading_analysis", "futures_trading_analysis"]:
             # For modular system, use the facade
-            result_markdown = await analysis_system.analyze(module_name, symbol)
+            result_markdown = (await analysis_system.analyze(module_name, symbol)).to_markdown()
         else:
             # Legacy analysis (crypto_analysis)
             result_markdown = await analyze_coin(binance_client, gemini_client, cryptopanic_client, symbol, btc_summary)
@@ -102,6 +108,9 @@ async def run_analysis(symbol: str, module_name: str = "crypto_analysis"):
     finally:
         if binance_client:
             await binance_client.close()
+        # Her istek kendi event loop'unda çalıştığı için yedek istemcileri ve paylaşılan oturumu da kapat
+        await close_clients()
+        await close_shared_session()
 
 async def run_historical_analysis(symbol: str, target_date_iso: str):
     """